@@ -9,8 +9,14 @@ https://docs.djangoproject.com/en/4.0/howto/deployment/asgi/
 
 import os
 
-from django.core.asgi import get_asgi_application
+import django
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'app.settings')
 
-application = get_asgi_application()
+# Set up the way django.core.asgi.get_asgi_application does, with a handler
+# iterating streamed responses off the event loop.
+django.setup(set_prefix=False)
+
+from core.asgi import AsyncRouter, StreamingASGIHandler  # noqa: E402
+
+application = AsyncRouter(StreamingASGIHandler())
@@ -0,0 +1,11 @@
+"""Async URL Configuration
+
+Routes served natively by the lean ASGI handler, see core.asgi. Every
+other route is served by the regular handler and ROOT_URLCONF.
+"""
+from django.urls import path, include
+
+urlpatterns = [
+    path('api/users/', include('users.async_urls')),
+    path('api/recipe/', include('recipe.async_urls')),
+]
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.0/ref/settings/
 """
 import os
+import tempfile
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -42,20 +43,39 @@ INSTALLED_APPS = [
     'core',
     'users',
     'recipe',
+    'benchmarks',
 ]
 
 MIDDLEWARE = [
+    'core.middleware.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
+    'core.middleware.PathDispatchMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.QueryInstrumentationMiddleware',
+    'core.middleware.ProfilingMiddleware',
+]
+
+# Browser middleware run by PathDispatchMiddleware, skipped for the token
+# authenticated API and internal routes.
+PATH_DISPATCH_MIDDLEWARE = [
+    'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
-    'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+PATH_DISPATCH_SKIP_PREFIXES = ['/api/', '/internal/']
+
+# Admin middleware checks only look at MIDDLEWARE, core.checks verifies
+# PATH_DISPATCH_MIDDLEWARE instead.
+SILENCED_SYSTEM_CHECKS = ['admin.E408', 'admin.E409', 'admin.E410']
+
 ROOT_URLCONF = 'app.urls'
 
+# Routes served by async views under ASGI, see core.asgi.AsyncRouter.
+ASYNC_URLCONF = 'app.async_urls'
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
@@ -85,6 +105,54 @@ DATABASES = {
         'NAME': os.environ.get('DB_NAME'),
         'USER': os.environ.get('DB_USER'),
         'PASSWORD': os.environ.get('DB_PASS'),
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 60)),
+    }
+}
+
+# Persistent connections idle for longer than the interval are checked with
+# a round trip when a request starts, and reopened if they went away.
+
+DB_CONN_HEALTH_CHECKS = os.environ.get(
+    'DB_CONN_HEALTH_CHECKS', 'true').lower() == 'true'
+DB_CONN_HEALTH_CHECK_INTERVAL = float(
+    os.environ.get('DB_CONN_HEALTH_CHECK_INTERVAL', 10))
+
+# Read replicas, comma separated hosts sharing primary credentials.
+# Safe method API requests read from a replica unless their user wrote
+# within DB_READ_YOUR_WRITES_WINDOW seconds.
+
+DATABASE_REPLICAS = []
+for index, host in enumerate(
+        filter(None, os.environ.get('DB_REPLICA_HOSTS', '').split(',')), 1):
+    alias = f'replica{index}'
+    DATABASES[alias] = {
+        **DATABASES['default'],
+        'HOST': host.strip(),
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['core.db_router.PrimaryReplicaRouter']
+
+# Users are pinned to primary in DB_READ_YOUR_WRITES_CACHE_ALIAS, which must
+# be shared between processes for pins to hold across workers.
+DB_READ_YOUR_WRITES_WINDOW = int(
+    os.environ.get('DB_READ_YOUR_WRITES_WINDOW', 5))
+DB_READ_YOUR_WRITES_CACHE_ALIAS = os.environ.get(
+    'DB_READ_YOUR_WRITES_CACHE_ALIAS', 'default')
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.0/topics/cache/
+# Response and token caches must be shared between processes in production,
+# e.g. CACHE_BACKEND=django.core.cache.backends.redis.RedisCache.
+
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get(
+            'CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', ''),
     }
 }
 
@@ -108,6 +176,111 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Password hashing
+# Hashing runs on a bounded pool, requests beyond workers plus queue get 503
+# with Retry-After instead of stalling other requests. The queue absorbs
+# login bursts, by default twice as deep as the pool. The pool is per
+# process, so shedding needs more request threads per process than workers
+# plus queue (threaded or ASGI servers). Under one request per process
+# servers the process count already bounds concurrent hashing.
+
+PASSWORD_HASHERS = [
+    'core.hashers.TunablePBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
+PASSWORD_PBKDF2_ITERATIONS = int(
+    os.environ.get('PASSWORD_PBKDF2_ITERATIONS', 320000))
+PASSWORD_HASHING_MAX_WORKERS = int(
+    os.environ.get('PASSWORD_HASHING_MAX_WORKERS', os.cpu_count() or 1))
+PASSWORD_HASHING_MAX_QUEUE = int(
+    os.environ.get('PASSWORD_HASHING_MAX_QUEUE',
+                   2 * PASSWORD_HASHING_MAX_WORKERS))
+PASSWORD_HASHING_TIMEOUT = float(
+    os.environ.get('PASSWORD_HASHING_TIMEOUT', 5))
+PASSWORD_HASHING_RETRY_AFTER = int(
+    os.environ.get('PASSWORD_HASHING_RETRY_AFTER', 1))
+
+
+# Logging
+# https://docs.djangoproject.com/en/4.0/topics/logging/
+# core.queries logs every request at INFO and requests exceeding the query
+# budget of their view at WARNING.
+
+QUERY_SERVER_TIMING = os.environ.get(
+    'QUERY_SERVER_TIMING', 'true').lower() == 'true'
+
+# Slow query log
+# Opt-in, statements above the threshold are logged on core.slow_queries
+# along with a plan captured on a background worker (EXPLAIN ANALYZE runs
+# the SELECT a second time).
+
+SLOW_QUERY_LOG = os.environ.get('SLOW_QUERY_LOG', 'false').lower() == 'true'
+SLOW_QUERY_THRESHOLD_MS = float(
+    os.environ.get('SLOW_QUERY_THRESHOLD_MS', 200))
+SLOW_QUERY_SAMPLE_RATE = float(os.environ.get('SLOW_QUERY_SAMPLE_RATE', 1))
+SLOW_QUERY_EXPLAIN = os.environ.get(
+    'SLOW_QUERY_EXPLAIN', 'true').lower() == 'true'
+SLOW_QUERY_MAX_PENDING = int(os.environ.get('SLOW_QUERY_MAX_PENDING', 100))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'json': {'()': 'core.logs.JSONFormatter'},
+    },
+    'handlers': {
+        'json_console': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'json',
+        },
+    },
+    'loggers': {
+        'core': {
+            'handlers': ['json_console'],
+            'level': os.environ.get('CORE_LOG_LEVEL', 'WARNING'),
+            'propagate': False,
+        },
+    },
+}
+
+
+# Metrics
+# Prometheus text exposition served at /internal/metrics/, denied unless
+# METRICS_TOKEN or METRICS_ALLOWED_IPS is set. Scrapers send the token as
+# "Authorization: Bearer <token>". Addresses are matched against
+# REMOTE_ADDR, which behind a reverse proxy on the same host is the proxy
+# itself, so use the token there or keep the path off the proxy. Metrics
+# are kept per process, a scrape of a multi worker server sees only the
+# worker that answered it.
+
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() == 'true'
+
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+
+METRICS_ALLOWED_IPS = [
+    ip.strip() for ip in
+    os.environ.get('METRICS_ALLOWED_IPS', '').split(',')
+    if ip.strip()
+]
+
+
+# Profiling
+# Staff requests carrying the X-Profile header and PROFILING_SAMPLE_RATE of
+# all requests are run under cProfile, see the profiles command. Profiles
+# are kept outside the source tree, set PROFILING_DIR to keep them elsewhere.
+
+PROFILING_ENABLED = os.environ.get(
+    'PROFILING_ENABLED', 'false').lower() == 'true'
+PROFILING_DIR = os.environ.get(
+    'PROFILING_DIR', os.path.join(tempfile.gettempdir(), 'recipe-profiles'))
+PROFILING_SAMPLE_RATE = float(os.environ.get('PROFILING_SAMPLE_RATE', 0))
+PROFILING_MAX_FILES = int(os.environ.get('PROFILING_MAX_FILES', 500))
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/4.0/topics/i18n/
 
@@ -131,3 +304,90 @@ STATIC_URL = 'static/'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 AUTH_USER_MODEL = 'core.User'
+
+
+# Django REST framework
+# https://www.django-rest-framework.org/api-guide/settings/
+
+REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.FastJSONRenderer',
+        'core.renderers.MessagePackRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'core.parsers.FastJSONParser',
+        'core.parsers.MessagePackParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    'EXCEPTION_HANDLER': 'core.exceptions.exception_handler',
+}
+
+
+# Token authentication cache
+# Process local TTL cache in front of expiring token lookups, optionally
+# backed by a shared Django cache alias (see CACHES). Entries never outlive
+# the expiry of their token and hold only user identity, changes made by
+# other processes are seen by local caches after TIMEOUT at most.
+# Entries are dropped by save() and delete() signals of users and tokens.
+# Bulk QuerySet.update(), e.g. deactivating users, sends no signals, so
+# call core.authentication.invalidate_user for each changed user, or such
+# users stay authenticated for up to SHARED_TIMEOUT plus TIMEOUT.
+
+TOKEN_AUTH_CACHE = {
+    'TIMEOUT': int(os.environ.get('TOKEN_AUTH_CACHE_TIMEOUT', 60)),
+    'MAX_SIZE': int(os.environ.get('TOKEN_AUTH_CACHE_MAX_SIZE', 10000)),
+    'SHARED_CACHE_ALIAS': os.environ.get('TOKEN_AUTH_SHARED_CACHE') or None,
+    'SHARED_TIMEOUT': int(os.environ.get('TOKEN_AUTH_SHARED_TIMEOUT', 300)),
+}
+
+
+# Recipe attributes API
+
+RECIPE_ATTR_PAGE_SIZE = int(os.environ.get('RECIPE_ATTR_PAGE_SIZE', 100))
+RECIPE_ATTR_MAX_PAGE_SIZE = int(
+    os.environ.get('RECIPE_ATTR_MAX_PAGE_SIZE', 1000))
+
+RECIPE_BULK_MAX_BATCH_SIZE = int(
+    os.environ.get('RECIPE_BULK_MAX_BATCH_SIZE', 1000))
+
+# List versions expire with cached responses, which bounds stale entity tags
+# of processes not sharing the alias (see check core.W001).
+RECIPE_LIST_CACHE_ALIAS = os.environ.get('RECIPE_LIST_CACHE_ALIAS', 'default')
+RECIPE_LIST_CACHE_TIMEOUT = int(
+    os.environ.get('RECIPE_LIST_CACHE_TIMEOUT', 300))
+
+RECIPE_STREAM_CHUNK_SIZE = int(os.environ.get('RECIPE_STREAM_CHUNK_SIZE', 2000))
+
+RECIPE_AUTOCOMPLETE_MAX_RESULTS = int(
+    os.environ.get('RECIPE_AUTOCOMPLETE_MAX_RESULTS', 50))
+
+# Delta sync resumes clients RECIPE_SYNC_SAFETY_LAG seconds behind the
+# newest change so that late committing transactions are not skipped, it
+# must exceed replica lag. Tombstones are purged after the retention period.
+RECIPE_SYNC_PAGE_SIZE = int(os.environ.get('RECIPE_SYNC_PAGE_SIZE', 1000))
+RECIPE_SYNC_SAFETY_LAG = int(os.environ.get('RECIPE_SYNC_SAFETY_LAG', 5))
+RECIPE_SYNC_TOMBSTONE_RETENTION_DAYS = int(
+    os.environ.get('RECIPE_SYNC_TOMBSTONE_RETENTION_DAYS', 30))
+
+# Batch endpoint runs consecutive GET sub-requests concurrently on a pool
+# of BATCH_MAX_WORKERS threads, each holding its own database connection.
+BATCH_MAX_REQUESTS = int(os.environ.get('BATCH_MAX_REQUESTS', 20))
+BATCH_MAX_WORKERS = int(os.environ.get('BATCH_MAX_WORKERS', 4))
+BATCH_PATH_PREFIXES = ['/api/']
+
+# Tokens expire TOKEN_TTL seconds after their last renewal. Tokens in use
+# are renewed at most once per TOKEN_RENEW_INTERVAL seconds, expired ones
+# are removed by the purge_expired_tokens command.
+TOKEN_TTL = int(os.environ.get('TOKEN_TTL', 7 * 24 * 3600))
+TOKEN_RENEW_INTERVAL = int(os.environ.get('TOKEN_RENEW_INTERVAL', 3600))
+
+# Signed access tokens
+# When enabled, token issuance also returns short lived HMAC signed access
+# tokens, sent as "Authorization: Bearer <token>" and verified without a
+# database read. The expiring token refreshes them at users/token/refresh/.
+# Bumping User.token_version revokes every access token of the user.
+ACCESS_TOKENS_ENABLED = os.environ.get(
+    'ACCESS_TOKENS_ENABLED', 'false').lower() == 'true'
+ACCESS_TOKEN_TTL = int(os.environ.get('ACCESS_TOKEN_TTL', 300))
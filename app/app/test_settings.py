@@ -0,0 +1,15 @@
+"""
+Django settings for running the test suite of app project.
+
+Run tests with python manage.py test --settings=app.test_settings.
+"""
+from app.settings import *  # noqa: F401,F403
+from app.settings import DATABASES
+
+
+# A replica mirroring the test database, so that routing runs real queries
+# on a second alias. Tests opt in by overriding DATABASE_REPLICAS.
+DATABASES.setdefault('replica1', {
+    **DATABASES['default'],
+    'TEST': {'MIRROR': 'default'},
+})
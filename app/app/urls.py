@@ -16,8 +16,12 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 
+from core import views as core_views
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/users/', include('users.urls')),
     path('api/recipe/', include('recipe.urls')),
+    path('api/batch/', core_views.BatchView.as_view(), name='batch'),
+    path('internal/metrics/', core_views.metrics, name='metrics'),
 ]
@@ -0,0 +1,149 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
+from django.db import connections
+from django.test import Client
+
+from benchmarks.load import percentile
+
+
+class ThreadSampler:
+    """Samples the highest number of live threads while running"""
+
+    def __init__(self, interval=0.01):
+        self.interval = interval
+        self.peak = threading.active_count()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, threading.active_count())
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+
+def summarize(latencies, statuses, elapsed, threads):
+    """Returns statistics of a concurrent run."""
+
+    latencies = sorted(latencies)
+    return {
+        'connections': len(latencies),
+        'errors': sum(1 for status in statuses if status >= 400),
+        'seconds': round(elapsed, 3),
+        'requests_per_second': round(len(latencies) / elapsed, 2),
+        'latency_ms': {
+            f'p{percent}': round(percentile(latencies, percent) * 1000, 3)
+            for percent in (50, 95, 99)
+        },
+        'peak_threads': threads,
+    }
+
+
+def run_wsgi(scenario, credentials, count, threads, client_delay):
+    """
+    Serves count simultaneous connections on a pool of threads, the way a
+    threaded WSGI server does. A slow client keeps its worker busy for
+    client_delay seconds before the request can be handled.
+    """
+
+    local = threading.local()
+
+    def connection(index, accepted):
+        credential = credentials[index % len(credentials)]
+        if not hasattr(local, 'client'):
+            local.client = Client()
+
+        method, path, data = scenario(credential)
+        time.sleep(client_delay)
+        try:
+            response = getattr(local.client, method)(
+                path, data, HTTP_AUTHORIZATION=f'Token {credential[2]}')
+        finally:
+            if index >= count - threads:
+                connections.close_all()
+
+        return response.status_code, time.perf_counter() - accepted
+
+    started = time.perf_counter()
+    with ThreadSampler() as sampler, \
+            ThreadPoolExecutor(max_workers=threads) as pool:
+        futures = [pool.submit(connection, i, started) for i in range(count)]
+        results = [future.result() for future in futures]
+    elapsed = time.perf_counter() - started
+
+    return summarize([seconds for _, seconds in results],
+                     [status for status, _ in results], elapsed,
+                     sampler.peak)
+
+
+async def asgi_connection(application, scope, client_delay, started):
+    """Returns status and latency of a request served by application."""
+
+    async def receive():
+        await asyncio.sleep(client_delay)
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    status = None
+
+    async def send(message):
+        nonlocal status
+        if message['type'] == 'http.response.start':
+            status = message['status']
+
+    await application(scope, receive, send)
+    return status, time.perf_counter() - started
+
+
+def make_scope(method, path, data, key):
+    """Returns ASGI scope of a request."""
+
+    return {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': method.upper(),
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': urlencode(data or {}).encode(),
+        'root_path': '',
+        'headers': [(b'host', b'testserver'),
+                    (b'authorization', f'Token {key}'.encode())],
+        'client': ('127.0.0.1', 0),
+        'server': ('testserver', 80),
+    }
+
+
+def run_asgi(application, scenario, credentials, count, client_delay):
+    """
+    Serves count simultaneous connections on a single event loop. A slow
+    client delays its request body by client_delay seconds.
+    """
+
+    async def run():
+        started = time.perf_counter()
+        tasks = []
+        for i in range(count):
+            credential = credentials[i % len(credentials)]
+            method, path, data = scenario(credential)
+            scope = make_scope(method, path, data, credential[2])
+            tasks.append(asgi_connection(application, scope, client_delay,
+                                         started))
+        return await asyncio.gather(*tasks), time.perf_counter() - started
+
+    with ThreadSampler() as sampler:
+        results, elapsed = asyncio.run(run())
+
+    return summarize([seconds for _, seconds in results],
+                     [status for status, _ in results], elapsed,
+                     sampler.peak)
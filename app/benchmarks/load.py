@@ -0,0 +1,121 @@
+import math
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+
+from django.db import connections
+from django.test import Client
+
+
+class QueryCounter:
+    """Counts queries run through wrapped connections"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def percentile(values, percent):
+    """Returns nearest rank percentile of sorted values."""
+
+    if not values:
+        return 0.0
+
+    rank = math.ceil(percent / 100 * len(values))
+    return values[max(rank, 1) - 1]
+
+
+def timed_request(client, method, path, data):
+    """Returns status, seconds and query count of a single request."""
+
+    counter = QueryCounter()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(counter))
+
+        started = time.perf_counter()
+        response = getattr(client, method)(path, data)
+        elapsed = time.perf_counter() - started
+
+    return response.status_code, elapsed, counter.count
+
+
+def run_worker(scenario, credentials, count, offset):
+    """Runs count requests of scenario on the calling thread."""
+
+    clients = [Client(HTTP_AUTHORIZATION=f'Token {key}')
+               for _, _, key in credentials]
+    results = []
+
+    try:
+        for i in range(count):
+            index = (offset + i) % len(credentials)
+            method, path, data = scenario(credentials[index])
+            results.append(timed_request(clients[index], method, path, data))
+    finally:
+        connections.close_all()
+
+    return results
+
+
+def run_scenario(scenario, credentials, requests, concurrency):
+    """Drives scenario concurrently and returns its statistics."""
+
+    shares = [requests // concurrency + (i < requests % concurrency)
+              for i in range(concurrency)]
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [pool.submit(run_worker, scenario, credentials, share, i)
+                   for i, share in enumerate(shares) if share]
+        results = [result for future in futures
+                   for result in future.result()]
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(seconds for _, seconds, _ in results)
+    return {
+        'requests': len(results),
+        'errors': sum(1 for status, _, _ in results if status >= 400),
+        'requests_per_second': round(len(results) / elapsed, 2),
+        'latency_ms': {
+            f'p{percent}': round(percentile(latencies, percent) * 1000, 3)
+            for percent in (50, 95, 99)
+        },
+        'queries_per_request': round(
+            sum(queries for _, _, queries in results) / len(results), 2),
+    }
+
+
+def measure_allocations(scenario, credentials, requests):
+    """
+    Returns mean peak of memory allocated while serving a request, in KiB.
+    Requests run one at a time so that peaks are not mixed between them.
+    """
+
+    clients = [Client(HTTP_AUTHORIZATION=f'Token {key}')
+               for _, _, key in credentials]
+    peaks = []
+
+    tracemalloc.start()
+    try:
+        for i in range(requests + 1):
+            index = i % len(credentials)
+            method, path, data = scenario(credentials[index])
+
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            getattr(clients[index], method)(path, data)
+            peak = tracemalloc.get_traced_memory()[1] - before
+
+            # First request warms up middleware chain and lazy imports.
+            if i:
+                peaks.append(peak)
+    finally:
+        tracemalloc.stop()
+        connections.close_all()
+
+    return round(sum(peaks) / len(peaks) / 1024, 2)
@@ -0,0 +1,175 @@
+import json
+import platform
+from datetime import datetime, timezone
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import (override_settings, setup_databases,
+                               setup_test_environment, teardown_databases,
+                               teardown_test_environment)
+
+from benchmarks.load import measure_allocations, run_scenario
+from benchmarks.scenarios import SCENARIOS
+from benchmarks.seed import seed
+
+
+class Command(BaseCommand):
+    """Benchmark API command"""
+
+    help = ('Seeds a throwaway test database and drives the API routes '
+            'concurrently, reporting throughput, latency percentiles and '
+            'queries per request.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10)
+        parser.add_argument('--tags', type=int, default=100,
+                            help='Tags per user.')
+        parser.add_argument('--ingredients', type=int, default=1000,
+                            help='Ingredients per user.')
+        parser.add_argument('--requests', type=int, default=200,
+                            help='Requests per scenario.')
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS,
+                            default=list(SCENARIOS))
+        parser.add_argument('--output', help='Writes JSON results to path.')
+        parser.add_argument('--compare',
+                            help='Prints change against JSON results file.')
+        parser.add_argument('--keepdb', action='store_true',
+                            help='Keeps test database between runs.')
+        parser.add_argument('--middleware', choices=('configured', 'full'),
+                            default='configured',
+                            help='full runs the path dispatched middleware '
+                                 'on every route.')
+        parser.add_argument('--memory', type=int, default=0,
+                            metavar='REQUESTS',
+                            help='Also measures allocations of this many '
+                                 'sequential requests per scenario.')
+
+    def handle(self, *args, **options):
+        """Handles benchmark api command."""
+
+        if options['users'] < 1:
+            raise CommandError('At least one user is required.')
+
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False,
+                                     keepdb=options['keepdb'])
+        try:
+            with override_settings(
+                    MIDDLEWARE=get_middleware(options['middleware'])):
+                results = self.run(options)
+        finally:
+            teardown_databases(old_config, verbosity=0,
+                               keepdb=options['keepdb'])
+            teardown_test_environment()
+
+        self.report(results)
+
+        if options['compare']:
+            with open(options['compare']) as baseline:
+                self.compare(json.load(baseline), results)
+
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(results, output, indent=2, sort_keys=True)
+                output.write('\n')
+
+    def run(self, options):
+        """Seeds database and returns results of every scenario."""
+
+        self.stdout.write('Seeding database ...')
+        credentials = seed(options['users'], options['tags'],
+                           options['ingredients'])
+
+        scenarios = {}
+        for name in options['scenarios']:
+            self.stdout.write(f'Running {name} ...')
+            scenarios[name] = run_scenario(SCENARIOS[name], credentials,
+                                           options['requests'],
+                                           options['concurrency'])
+            if options['memory']:
+                scenarios[name]['alloc_peak_kib'] = measure_allocations(
+                    SCENARIOS[name], credentials, options['memory'])
+
+        return {
+            'meta': {
+                'created_at': datetime.now(timezone.utc).isoformat(),
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'users': options['users'],
+                'tags': options['tags'],
+                'ingredients': options['ingredients'],
+                'requests': options['requests'],
+                'concurrency': options['concurrency'],
+                'middleware': options['middleware'],
+            },
+            'scenarios': scenarios,
+        }
+
+    def report(self, results):
+        """Writes results table."""
+
+        self.stdout.write(f'{"scenario":<12} {"req/s":>9} {"p50 ms":>9} '
+                          f'{"p95 ms":>9} {"p99 ms":>9} {"queries":>8} '
+                          f'{"errors":>7} {"alloc KiB":>10}')
+        for name, stats in results['scenarios'].items():
+            latency = stats['latency_ms']
+            self.stdout.write(
+                f'{name:<12} {stats["requests_per_second"]:>9} '
+                f'{latency["p50"]:>9} {latency["p95"]:>9} '
+                f'{latency["p99"]:>9} {stats["queries_per_request"]:>8} '
+                f'{stats["errors"]:>7} '
+                f'{stats.get("alloc_peak_kib", "-"):>10}')
+
+    def compare(self, baseline, results):
+        """Writes relative change of results against baseline."""
+
+        self.stdout.write('Change against baseline:')
+        for name, stats in results['scenarios'].items():
+            before = baseline.get('scenarios', {}).get(name)
+            if not before:
+                continue
+
+            changes = {
+                'req/s': (before['requests_per_second'],
+                          stats['requests_per_second']),
+                'p50 ms': (before['latency_ms']['p50'],
+                           stats['latency_ms']['p50']),
+                'p99 ms': (before['latency_ms']['p99'],
+                           stats['latency_ms']['p99']),
+                'queries': (before['queries_per_request'],
+                            stats['queries_per_request']),
+            }
+            if 'alloc_peak_kib' in before and 'alloc_peak_kib' in stats:
+                changes['alloc KiB'] = (before['alloc_peak_kib'],
+                                        stats['alloc_peak_kib'])
+            line = ', '.join(
+                f'{label} {old} -> {new} ({percent_change(old, new)})'
+                for label, (old, new) in changes.items())
+            self.stdout.write(f'{name:<12} {line}')
+
+
+def get_middleware(mode):
+    """
+    Returns MIDDLEWARE to benchmark, full puts the path dispatched
+    middleware back in place of the dispatcher.
+    """
+
+    dispatcher = 'core.middleware.PathDispatchMiddleware'
+    if mode != 'full' or dispatcher not in settings.MIDDLEWARE:
+        return settings.MIDDLEWARE
+
+    index = settings.MIDDLEWARE.index(dispatcher)
+    return [*settings.MIDDLEWARE[:index],
+            *settings.PATH_DISPATCH_MIDDLEWARE,
+            *settings.MIDDLEWARE[index + 1:]]
+
+
+def percent_change(old, new):
+    """Returns signed relative change as text."""
+
+    if not old:
+        return 'n/a'
+
+    return f'{(new - old) / old * 100:+.1f}%'
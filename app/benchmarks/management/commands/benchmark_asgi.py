@@ -0,0 +1,78 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import (setup_databases, setup_test_environment,
+                               teardown_databases, teardown_test_environment)
+
+from benchmarks.concurrency import run_asgi, run_wsgi
+from benchmarks.scenarios import SCENARIOS
+from benchmarks.seed import seed
+
+
+READ_SCENARIOS = ('me', 'tags', 'ingredients')
+
+
+class Command(BaseCommand):
+    """Benchmark ASGI command"""
+
+    help = ('Seeds a throwaway test database and serves many simultaneous '
+            'slow client connections by a threaded WSGI pool and by the '
+            'ASGI application, reporting latency and threads used.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10)
+        parser.add_argument('--tags', type=int, default=20)
+        parser.add_argument('--ingredients', type=int, default=100)
+        parser.add_argument('--connections', type=int, default=1000)
+        parser.add_argument('--threads', type=int, default=32,
+                            help='WSGI worker threads.')
+        parser.add_argument('--client-delay', type=float, default=0.05,
+                            help='Seconds each client takes to send its '
+                                 'request.')
+        parser.add_argument('--scenarios', nargs='+', choices=READ_SCENARIOS,
+                            default=list(READ_SCENARIOS))
+        parser.add_argument('--keepdb', action='store_true')
+
+    def handle(self, *args, **options):
+        """Handles benchmark asgi command."""
+
+        if options['users'] < 1 or options['connections'] < 1:
+            raise CommandError('At least one user and connection required.')
+
+        from app.asgi import application
+
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False,
+                                     keepdb=options['keepdb'])
+        try:
+            credentials = seed(options['users'], options['tags'],
+                               options['ingredients'])
+
+            self.stdout.write(f'{"scenario":<12} {"server":<5} {"seconds":>8} '
+                              f'{"req/s":>9} {"p50 ms":>9} {"p99 ms":>9} '
+                              f'{"threads":>8} {"errors":>7}')
+            for name in options['scenarios']:
+                scenario = SCENARIOS[name]
+                results = {
+                    'wsgi': run_wsgi(scenario, credentials,
+                                     options['connections'],
+                                     options['threads'],
+                                     options['client_delay']),
+                    'asgi': run_asgi(application, scenario, credentials,
+                                     options['connections'],
+                                     options['client_delay']),
+                }
+                for server, stats in results.items():
+                    self.report(name, server, stats)
+        finally:
+            teardown_databases(old_config, verbosity=0,
+                               keepdb=options['keepdb'])
+            teardown_test_environment()
+
+    def report(self, name, server, stats):
+        """Writes a result row."""
+
+        latency = stats['latency_ms']
+        self.stdout.write(
+            f'{name:<12} {server:<5} {stats["seconds"]:>8} '
+            f'{stats["requests_per_second"]:>9} {latency["p50"]:>9} '
+            f'{latency["p99"]:>9} {stats["peak_threads"]:>8} '
+            f'{stats["errors"]:>7}')
@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from benchmarks.timing import measure_cpu
+from core.models import Tag, Ingredient
+from recipe.serializers import TagSerializer, IngredientSerializer
+
+
+MODELS = {
+    'tag': (Tag, TagSerializer),
+    'ingredient': (Ingredient, IngredientSerializer),
+}
+
+
+class Command(BaseCommand):
+    """Benchmark list serialization command"""
+
+    help = ('Compares per item CPU cost of serializer based and fast '
+            'values based list building.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, nargs='+',
+                            default=[1000, 10000, 100000])
+        parser.add_argument('--model', choices=MODELS, default='ingredient')
+        parser.add_argument('--repeat', type=int, default=3)
+
+    def handle(self, *args, **options):
+        """Handles benchmark list serialization command."""
+
+        model, serializer_class = MODELS[options['model']]
+        columns = ['id', 'name', 'user_id']
+        fields = ('id', 'name')
+        renderer = JSONRenderer()
+
+        self.stdout.write(f'{"rows":>8} {"serializer us/item":>20} '
+                          f'{"fast us/item":>14} {"speedup":>8}')
+
+        for count in options['rows']:
+            # Rows as the database adapter hands them over, so both paths
+            # pay their own materialization cost on top of identical input.
+            rows = [(i, f'{options["model"]} {i}', 1) for i in range(count)]
+
+            def serializer_path():
+                instances = [model.from_db('default', columns, row)
+                             for row in rows]
+                return serializer_class(instances, many=True).data
+
+            def fast_path():
+                return [dict(zip(fields, row)) for row in rows]
+
+            if renderer.render(serializer_path()) != \
+                    renderer.render(fast_path()):
+                raise CommandError('Fast path output differs')
+
+            slow = measure_cpu(serializer_path, options['repeat'])
+            fast = measure_cpu(fast_path, options['repeat'])
+
+            self.stdout.write(
+                f'{count:>8} {slow / count * 1e6:>20.3f} '
+                f'{fast / count * 1e6:>14.3f} {slow / fast:>7.1f}x')
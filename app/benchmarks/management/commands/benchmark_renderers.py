@@ -0,0 +1,68 @@
+from io import BytesIO
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from benchmarks.timing import measure_cpu
+from core.parsers import FastJSONParser
+from core.renderers import FastJSONRenderer
+
+
+PAYLOADS = {
+    'tag': lambda i: {'id': i, 'name': f'tag {i}'},
+    'ingredient': lambda i: {'id': i, 'name': f'ingrédient {i} – frais'},
+}
+
+
+class Command(BaseCommand):
+    """Benchmark renderers command"""
+
+    help = ('Compares CPU cost of DRF JSON renderer and parser with the '
+            'project wide fast ones on tag and ingredient list payloads.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, nargs='+',
+                            default=[100, 1000, 10000])
+        parser.add_argument('--model', choices=PAYLOADS, nargs='+',
+                            default=list(PAYLOADS))
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        """Handles benchmark renderers command."""
+
+        pairs = (
+            ('render', JSONRenderer(), FastJSONRenderer()),
+            ('parse', JSONParser(), FastJSONParser()),
+        )
+
+        self.stdout.write(f'{"model":<11} {"op":<7} {"rows":>7} '
+                          f'{"drf us/item":>12} {"fast us/item":>13} '
+                          f'{"speedup":>8}')
+
+        for model in options['model']:
+            for count in options['rows']:
+                data = [PAYLOADS[model](i) for i in range(count)]
+                body = JSONRenderer().render(data)
+
+                for op, slow, fast in pairs:
+                    if op == 'render':
+                        def run(worker):
+                            return worker.render(data)
+                    else:
+                        def run(worker):
+                            return worker.parse(BytesIO(body))
+
+                    if run(slow) != run(fast):
+                        raise CommandError(f'{op} output differs')
+
+                    slow_time = measure_cpu(lambda: run(slow),
+                                            options['repeat'])
+                    fast_time = measure_cpu(lambda: run(fast),
+                                            options['repeat'])
+
+                    self.stdout.write(
+                        f'{model:<11} {op:<7} {count:>7} '
+                        f'{slow_time / count * 1e6:>12.3f} '
+                        f'{fast_time / count * 1e6:>13.3f} '
+                        f'{slow_time / fast_time:>7.1f}x')
@@ -0,0 +1,37 @@
+from django.urls import reverse
+
+
+def token(credentials):
+    """Returns token issuance request of given user."""
+
+    email, password, _ = credentials
+    return 'post', reverse('users:token'), {
+        'email': email,
+        'password': password,
+    }
+
+
+def me(credentials):
+    """Returns self user retrieval request."""
+
+    return 'get', reverse('users:me'), None
+
+
+def tags(credentials):
+    """Returns tag list request."""
+
+    return 'get', reverse('recipe:tag-list'), None
+
+
+def ingredients(credentials):
+    """Returns ingredient list request."""
+
+    return 'get', reverse('recipe:ingredient-list'), None
+
+
+SCENARIOS = {
+    'token': token,
+    'me': me,
+    'tags': tags,
+    'ingredients': ingredients,
+}
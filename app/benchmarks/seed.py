@@ -0,0 +1,18 @@
+from core.datagen import SyntheticDataGenerator
+
+
+PASSWORD = 'benchmark-password'
+
+
+def seed(users, tags, ingredients):
+    """
+    Creates users owning given number of tags and ingredients each and
+    returns their (email, password, token key) credentials.
+    """
+
+    generator = SyntheticDataGenerator(users, tags, ingredients,
+                                       password=PASSWORD,
+                                       email_prefix='bench')
+
+    return [(user.email, PASSWORD, token.key)
+            for user, token in generator.generate()]
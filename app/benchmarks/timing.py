@@ -0,0 +1,14 @@
+import time
+
+
+def measure_cpu(function, repeat=3):
+    """Returns best CPU seconds of running function repeatedly."""
+
+    best = None
+    for _ in range(repeat):
+        started = time.process_time()
+        function()
+        elapsed = time.process_time() - started
+        best = elapsed if best is None else min(best, elapsed)
+
+    return best
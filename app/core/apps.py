@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        """Connects core signal receivers and system checks."""
+
+        import core.checks  # noqa: F401
+        import core.db  # noqa: F401
+        import core.slow_queries  # noqa: F401
+        import core.signals  # noqa: F401
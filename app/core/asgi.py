@@ -0,0 +1,228 @@
+import time
+from urllib.parse import parse_qsl
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import RequestAborted
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.exception import convert_exception_to_response
+from django.http.request import parse_accept_header
+from django.urls import Resolver404, resolve, set_script_prefix
+from django.utils.module_loading import import_string
+
+from core.instrumentation import capture_queries, current_view
+from core.middleware import record_metrics, report_queries
+
+
+# Middleware of MIDDLEWARE whose request and response hooks the lean
+# handler runs on the event loop, metrics and query instrumentation are
+# recorded by the handler itself.
+HOOK_MIDDLEWARE = (
+    'django.middleware.security.SecurityMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+)
+
+
+class StreamingASGIHandler(ASGIHandler):
+    """
+    ASGI handler reading streaming response content on the thread the view
+    ran on, one hop per chunk, since streamed lists read database rows
+    while their content is iterated.
+    """
+
+    async def send_response(self, response, send):
+        if not response.streaming:
+            await super().send_response(response, send)
+            return
+
+        await send({
+            'type': 'http.response.start',
+            'status': response.status_code,
+            'headers': self.get_response_headers(response),
+        })
+
+        parts = await sync_to_async(iter, thread_sensitive=True)(response)
+        while True:
+            part = await sync_to_async(next, thread_sensitive=True)(
+                parts, None)
+            if part is None:
+                break
+            for chunk, _ in self.chunk_bytes(part):
+                await send({
+                    'type': 'http.response.body',
+                    'body': chunk,
+                    'more_body': True,
+                })
+        await send({'type': 'http.response.body'})
+
+        await sync_to_async(response.close, thread_sensitive=True)()
+
+    @staticmethod
+    def get_response_headers(response):
+        """Returns ASGI headers of response including its cookies."""
+
+        headers = [
+            (header.encode('ascii'), value.encode('latin1'))
+            for header, value in response.items()
+        ]
+        headers.extend(
+            (b'Set-Cookie', cookie.output(header='').encode('ascii').strip())
+            for cookie in response.cookies.values())
+        return headers
+
+
+class LeanASGIHandler(StreamingASGIHandler):
+    """
+    ASGI handler serving async views of a separate urlconf without the
+    middleware stack or request_started signal, so that a request never
+    leaves the event loop unless its view hands blocking work to a thread.
+    Metrics, query instrumentation and security headers are added the way
+    MIDDLEWARE adds them. Views served here close stale database
+    connections themselves.
+    """
+
+    def __init__(self, urlconf):
+        self.urlconf = urlconf
+        super().__init__()
+
+    def load_middleware(self, is_async=False):
+        self._view_middleware = []
+        self._template_response_middleware = []
+        self._exception_middleware = []
+        self._view_response = convert_exception_to_response(
+            self._get_response_async)
+        self.hook_middleware = [
+            import_string(path)(self._view_response)
+            for path in settings.MIDDLEWARE if path in HOOK_MIDDLEWARE
+        ]
+        self._middleware_chain = self.get_instrumented_response
+
+    async def get_instrumented_response(self, request):
+        """Returns response of request with metrics and headers added."""
+
+        started = time.perf_counter()
+        token = current_view.set(None)
+        try:
+            # Views run queries on worker threads, which join the stats.
+            with capture_queries(local=False) as stats:
+                response = await self.get_hooked_response(request)
+        finally:
+            current_view.reset(token)
+
+        response = report_queries(request, response, stats)
+        for middleware in reversed(self.hook_middleware):
+            response = middleware.process_response(request, response)
+
+        return record_metrics(request, response,
+                              time.perf_counter() - started)
+
+    async def get_hooked_response(self, request):
+        """Returns response of request view or of a request hook."""
+
+        for middleware in self.hook_middleware:
+            if hasattr(middleware, 'process_request'):
+                response = middleware.process_request(request)
+                if response is not None:
+                    return response
+
+        return await self._view_response(request)
+
+    def resolve_request(self, request):
+        resolver_match = super().resolve_request(request)
+        current_view.set(resolver_match.view_name)
+        return resolver_match
+
+    async def __call__(self, scope, receive, send):
+        # No thread sensitive context, nothing served here runs on it.
+        await self.handle(scope, receive, send)
+
+    async def handle(self, scope, receive, send):
+        try:
+            body_file = await self.read_body(receive)
+        except RequestAborted:
+            return
+
+        set_script_prefix(self.get_script_prefix(scope))
+        request, error_response = self.create_request(scope, body_file)
+        if request is None:
+            await self.send_response(error_response, send)
+            return
+
+        request.urlconf = self.urlconf
+        response = await self.get_response_async(request)
+        response._handler_class = self.__class__
+        # Length of the body a GET would get, as CommonMiddleware sets it.
+        if not response.streaming and \
+                not response.has_header('Content-Length'):
+            response['Content-Length'] = str(len(response.content))
+        if request.method == 'HEAD':
+            response.content = b''
+        await self.send_response(response, send)
+
+    async def send_response(self, response, send):
+        """Sends a non streaming response, closing it on the event loop."""
+
+        await send({
+            'type': 'http.response.start',
+            'status': response.status_code,
+            'headers': self.get_response_headers(response),
+        })
+        for chunk, last in self.chunk_bytes(response.content):
+            await send({
+                'type': 'http.response.body',
+                'body': chunk,
+                'more_body': not last,
+            })
+
+        response.close()
+
+
+class AsyncRouter:
+    """
+    ASGI application sending GET and HEAD requests for routes of
+    ASYNC_URLCONF to the lean handler and everything else, including
+    streamed, NDJSON and browsable API requests, to the regular one.
+    """
+
+    methods = ('GET', 'HEAD')
+    sync_media_types = ('application/x-ndjson', 'text/html')
+    sync_query_params = frozenset(('stream', 'format'))
+
+    def __init__(self, application, urlconf=None):
+        self.application = application
+        self.urlconf = urlconf or settings.ASYNC_URLCONF
+        self.lean_application = LeanASGIHandler(self.urlconf)
+
+    async def __call__(self, scope, receive, send):
+        application = self.lean_application if self.is_async_route(scope) \
+            else self.application
+        await application(scope, receive, send)
+
+    def is_async_route(self, scope):
+        """Returns whether the lean handler serves the request."""
+
+        if scope['type'] != 'http' or scope['method'] not in self.methods:
+            return False
+
+        query = parse_qsl(scope.get('query_string', b'').decode('latin-1'))
+        if any(name in self.sync_query_params for name, _ in query):
+            return False
+
+        accept = dict(scope.get('headers', ())).get(b'accept', b'')
+        if accept and any(
+                media_type.main_type + '/' + media_type.sub_type
+                in self.sync_media_types
+                for media_type in parse_accept_header(accept.decode())):
+            return False
+
+        path = scope['path']
+        root_path = scope.get('root_path', '')
+        if root_path and path.startswith(root_path):
+            path = path[len(root_path):]
+
+        try:
+            resolve(path, self.urlconf)
+        except Resolver404:
+            return False
+
+        return True
@@ -0,0 +1,125 @@
+import functools
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+from django.utils.cache import patch_vary_headers
+from rest_framework.exceptions import (
+    APIException, AuthenticationFailed, MethodNotAllowed, NotAuthenticated,
+)
+from rest_framework.negotiation import DefaultContentNegotiation
+from rest_framework.request import Request
+from rest_framework.views import exception_handler
+
+from core import db_router
+from core.instrumentation import attach_queries
+from core.authentication import (
+    AccessTokenAuthentication, AsyncCachedTokenAuthentication,
+)
+from core.renderers import FastJSONRenderer, MessagePackRenderer
+
+
+class AsyncAPIView:
+    """
+    Minimal async counterpart of DRF APIView for read only endpoints,
+    authenticating, negotiating and rendering on the event loop. Blocking
+    work is passed to run_in_thread.
+    """
+
+    authentication_classes = (AsyncCachedTokenAuthentication,
+                              AccessTokenAuthentication)
+    renderer_classes = (FastJSONRenderer, MessagePackRenderer)
+    http_method_names = ('get', 'head')
+
+    @classmethod
+    def as_view(cls):
+        """Returns async view function serving cls."""
+
+        async def view(request, *args, **kwargs):
+            return await cls().dispatch(request, *args, **kwargs)
+
+        view.view_class = cls
+        view.csrf_exempt = True
+        functools.update_wrapper(view, cls, updated=())
+        return view
+
+    async def dispatch(self, request, *args, **kwargs):
+        """Handles request and returns rendered response."""
+
+        request = Request(request)
+        method = request.method.lower()
+        handler = getattr(self, 'get' if method == 'head' else method, None)
+
+        try:
+            self.negotiate(request)
+            if method not in self.http_method_names or handler is None:
+                raise MethodNotAllowed(request.method)
+            await self.authenticate(request)
+            response = await handler(request, *args, **kwargs)
+        except APIException as exc:
+            response = self.handle_exception(request, exc)
+
+        return self.finalize_response(request, response)
+
+    def negotiate(self, request):
+        """Selects renderer of the response."""
+
+        renderer, media_type = DefaultContentNegotiation().select_renderer(
+            request, [renderer() for renderer in self.renderer_classes])
+        request.accepted_renderer = renderer
+        request.accepted_media_type = media_type
+
+    async def authenticate(self, request):
+        """Authenticates request user, raising if credentials are absent."""
+
+        for authentication_class in self.authentication_classes:
+            result = await authentication_class().authenticate_async(request)
+            if result is not None:
+                request.user, request.auth = result
+                return
+
+        raise NotAuthenticated()
+
+    def handle_exception(self, request, exc):
+        """Returns error response the way DRF views do."""
+
+        if isinstance(exc, (NotAuthenticated, AuthenticationFailed)):
+            exc.auth_header = self.authentication_classes[0]() \
+                .authenticate_header(request)
+
+        if getattr(request, 'accepted_renderer', None) is None:
+            request.accepted_renderer = self.renderer_classes[0]()
+            request.accepted_media_type = \
+                request.accepted_renderer.media_type
+
+        return exception_handler(exc, {'view': self, 'request': request})
+
+    def finalize_response(self, request, response):
+        """Renders response by the negotiated renderer."""
+
+        response.accepted_renderer = request.accepted_renderer
+        response.accepted_media_type = request.accepted_media_type
+        response.renderer_context = {'view': self, 'request': request,
+                                     'response': response}
+        response['Allow'] = ', '.join(
+            method.upper() for method in self.http_method_names)
+        patch_vary_headers(response, ('Accept',))
+        return response.render()
+
+    @staticmethod
+    async def run_in_thread(function, request, *args):
+        """
+        Returns result of blocking function run on a worker thread with
+        database reads routed the way ReplicaRoutingMixin does and queries
+        recorded in the request stats.
+        """
+
+        def run():
+            close_old_connections()
+            try:
+                alias = db_router.choose_read_alias(request.user)
+                with db_router.read_from(alias), attach_queries():
+                    return function(request, *args)
+            finally:
+                close_old_connections()
+
+        return await sync_to_async(run, thread_sensitive=False)()
@@ -0,0 +1,386 @@
+import copy
+import hashlib
+from collections import namedtuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.db import DEFAULT_DB_ALIAS, close_old_connections
+from django.db.models import DEFERRED
+from django.dispatch import receiver
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework.authentication import (
+    BaseAuthentication, TokenAuthentication, get_authorization_header,
+)
+from rest_framework.exceptions import AuthenticationFailed
+
+from core.cache import TTLCache
+from core.instrumentation import attach_queries
+from core.models import ExpiringToken
+
+
+ACCESS_TOKEN_SALT = 'core.authentication.access-token'
+
+_token_cache = None
+
+
+# Fields of users kept in the token caches, which never hold whole rows.
+UserIdentity = namedtuple(
+    'UserIdentity',
+    ('id', 'is_active', 'is_staff', 'is_superuser', 'token_version'))
+
+
+def get_identity(user):
+    """Returns immutable identity of user to cache."""
+
+    return UserIdentity(*(getattr(user, field)
+                          for field in UserIdentity._fields))
+
+
+def get_identity_user(identity):
+    """
+    Returns user instance of identity. Other fields are deferred, so they
+    are read fresh from the database on access and never saved back.
+    """
+
+    model = get_user_model()
+    loaded = identity._asdict()
+    return model.from_db(DEFAULT_DB_ALIAS, list(loaded), [
+        loaded.get(field.attname, DEFERRED)
+        for field in model._meta.concrete_fields
+    ])
+
+
+def get_token_cache_settings():
+    """Returns token cache settings merged with defaults."""
+
+    return {
+        'TIMEOUT': 60,
+        'MAX_SIZE': 10000,
+        'SHARED_CACHE_ALIAS': None,
+        'SHARED_TIMEOUT': 300,
+        **getattr(settings, 'TOKEN_AUTH_CACHE', {}),
+    }
+
+
+def get_token_cache():
+    """Returns process local token cache."""
+
+    global _token_cache
+
+    if _token_cache is None:
+        options = get_token_cache_settings()
+        _token_cache = TTLCache(max_size=options['MAX_SIZE'],
+                                timeout=options['TIMEOUT'])
+
+    return _token_cache
+
+
+def get_shared_cache():
+    """Returns shared token cache or None if it is not configured."""
+
+    alias = get_token_cache_settings()['SHARED_CACHE_ALIAS']
+    return caches[alias] if alias else None
+
+
+def shared_cache_key(key):
+    """Returns shared cache key, raw token keys never leave the process."""
+
+    return 'auth-token:' + hashlib.sha256(key.encode()).hexdigest()
+
+
+def invalidate_token(key):
+    """Drops the given token key from all cache tiers."""
+
+    get_token_cache().delete(key)
+
+    shared_cache = get_shared_cache()
+    if shared_cache is not None:
+        shared_cache.delete(shared_cache_key(key))
+
+
+def invalidate_user(user):
+    """Drops all cached tokens of the given user from all cache tiers."""
+
+    keys = get_token_cache().delete_where(
+        lambda key, value: value[0].id == user.pk)
+
+    shared_cache = get_shared_cache()
+    if shared_cache is not None:
+        keys = set(keys)
+        keys.add(access_user_key(user.pk))
+        keys.update(CachedTokenAuthentication().get_model().objects.filter(
+            user_id=user.pk).values_list('key', flat=True))
+        shared_cache.delete_many([shared_cache_key(key) for key in keys])
+
+
+def access_user_key(user_id):
+    """Returns token cache key of user authenticated by access tokens."""
+
+    return f'access-user:{user_id}'
+
+
+def issue_access_token(user):
+    """Returns signed access token of user at its current token version."""
+
+    return signing.TimestampSigner(salt=ACCESS_TOKEN_SALT).sign(
+        f'{user.pk}.{user.token_version}')
+
+
+@receiver(setting_changed)
+def reset_token_cache(setting, **kwargs):
+    """Rebuilds token cache when its settings change."""
+
+    global _token_cache
+
+    if setting == 'TOKEN_AUTH_CACHE':
+        _token_cache = None
+
+
+class ExpiringTokenAuthentication(TokenAuthentication):
+    """
+    Token authentication by expiring tokens, sliding expiry of tokens in
+    use forward.
+    """
+
+    model = ExpiringToken
+
+    def authenticate_credentials(self, key):
+        """Authenticates token key, rejecting expired tokens."""
+
+        user, token = self.get_credentials(key)
+
+        if token.is_expired():
+            raise AuthenticationFailed(_('Token has expired.'))
+
+        if token.needs_renewal():
+            token = self.renew(key, user, token)
+
+        return user, token
+
+    def get_credentials(self, key):
+        """Returns (user, token) of key regardless of expiry."""
+
+        return super().authenticate_credentials(key)
+
+    def renew(self, key, user, token):
+        """Renews token and returns it."""
+
+        token.renew()
+        return token
+
+
+def get_cache_timeout(token, timeout):
+    """Returns timeout of cached token, never outliving its expiry."""
+
+    remaining = (token.expires_at - timezone.now()).total_seconds()
+    return max(0, min(timeout, remaining))
+
+
+class CachedTokenAuthentication(ExpiringTokenAuthentication):
+    """
+    Expiring token authentication which keeps token to user mapping in a
+    process local TTL cache, backed by an optional shared Django cache.
+    """
+
+    def get_credentials(self, key):
+        """
+        Returns credentials of key, hitting database on cache miss. Cache
+        entries hold user identity and the token without its user.
+        """
+
+        local_cache = get_token_cache()
+        entry = local_cache.get(key)
+
+        if entry is None:
+            shared_cache = get_shared_cache()
+            if shared_cache is not None:
+                entry = shared_cache.get(shared_cache_key(key))
+
+            if entry is None:
+                user, token = super().get_credentials(key)
+                token = copy.copy(token)
+                ExpiringToken.user.field.delete_cached_value(token)
+                entry = (get_identity(user), token)
+                if shared_cache is not None:
+                    self.set_shared(shared_cache, key, entry)
+
+            self.set_local(local_cache, key, entry)
+
+        identity, token = entry
+        return get_identity_user(identity), token
+
+    def renew(self, key, user, token):
+        """Renews a copy of cached token and caches it."""
+
+        token = super().renew(key, user, copy.copy(token))
+        entry = (get_identity(user), token)
+
+        self.set_local(get_token_cache(), key, entry)
+        shared_cache = get_shared_cache()
+        if shared_cache is not None:
+            self.set_shared(shared_cache, key, entry)
+
+        return token
+
+    @staticmethod
+    def set_local(local_cache, key, entry):
+        local_cache.set(key, entry, get_cache_timeout(
+            entry[1], get_token_cache_settings()['TIMEOUT']))
+
+    @staticmethod
+    def set_shared(shared_cache, key, entry):
+        shared_cache.set(shared_cache_key(key), entry, get_cache_timeout(
+            entry[1], get_token_cache_settings()['SHARED_TIMEOUT']))
+
+
+class AsyncCachedTokenAuthentication(CachedTokenAuthentication):
+    """
+    Cached token authentication for async views, which resolves tokens
+    found in the process local cache on the event loop and moves only
+    cache misses to a worker thread.
+    """
+
+    async def authenticate_async(self, request):
+        """Returns (user, token) of request, None if it has no token."""
+
+        auth = get_authorization_header(request).split()
+        if len(auth) == 2 and \
+                auth[0].lower() == self.keyword.lower().encode():
+            entry = get_token_cache().get(auth[1].decode(errors='replace'))
+            # Expired tokens and tokens due for renewal are left to the
+            # thread, which rejects or renews them.
+            if entry is not None and not entry[1].is_expired() and \
+                    not entry[1].needs_renewal():
+                identity, token = entry
+                return get_identity_user(identity), token
+
+        return await sync_to_async(self.authenticate_in_thread,
+                                   thread_sensitive=False)(request)
+
+    def authenticate_in_thread(self, request):
+        close_old_connections()
+        try:
+            with attach_queries():
+                return self.authenticate(request)
+        finally:
+            close_old_connections()
+
+
+class AccessTokenAuthentication(BaseAuthentication):
+    """
+    Authentication by short lived signed access tokens, verified by their
+    signature and the revocation counter of their user. Users are cached
+    like tokens are, so authentication needs no database read on hits.
+    """
+
+    keyword = 'Bearer'
+
+    def authenticate(self, request):
+        """Returns (user, None) of request, None if it has no token."""
+
+        value = self.get_token(request)
+        if value is None:
+            return None
+
+        user_id, version = self.verify(value)
+        return self.check_user(self.get_user_identity(user_id), version)
+
+    async def authenticate_async(self, request):
+        """Authenticates on the event loop unless user is not cached."""
+
+        value = self.get_token(request)
+        if value is None:
+            return None
+
+        user_id, version = self.verify(value)
+        entry = get_token_cache().get(access_user_key(user_id))
+        if entry is not None:
+            identity = entry[0]
+        else:
+            identity = await sync_to_async(self.get_user_identity_in_thread,
+                                           thread_sensitive=False)(user_id)
+
+        return self.check_user(identity, version)
+
+    def authenticate_header(self, request):
+        return self.keyword
+
+    def get_token(self, request):
+        """Returns access token of request or None."""
+
+        if not getattr(settings, 'ACCESS_TOKENS_ENABLED', False):
+            return None
+
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+
+        if len(auth) != 2:
+            raise AuthenticationFailed(_('Invalid access token header.'))
+
+        return auth[1].decode(errors='replace')
+
+    def verify(self, value):
+        """Returns (user id, token version) of a valid access token."""
+
+        try:
+            payload = signing.TimestampSigner(salt=ACCESS_TOKEN_SALT).unsign(
+                value, max_age=getattr(settings, 'ACCESS_TOKEN_TTL', 300))
+        except signing.SignatureExpired:
+            raise AuthenticationFailed(_('Access token has expired.'))
+        except signing.BadSignature:
+            raise AuthenticationFailed(_('Invalid access token.'))
+
+        user_id, version = payload.split('.')
+        return int(user_id), int(version)
+
+    def get_user_identity(self, user_id):
+        """Returns identity of user by id from the caches or database."""
+
+        key = access_user_key(user_id)
+        local_cache = get_token_cache()
+        entry = local_cache.get(key)
+
+        if entry is None:
+            shared_cache = get_shared_cache()
+            if shared_cache is not None:
+                entry = shared_cache.get(shared_cache_key(key))
+
+            if entry is None:
+                user = get_user_model().objects.filter(pk=user_id).first()
+                if user is None:
+                    raise AuthenticationFailed(_('Invalid access token.'))
+
+                entry = (get_identity(user), None)
+                if shared_cache is not None:
+                    shared_cache.set(
+                        shared_cache_key(key), entry,
+                        get_token_cache_settings()['SHARED_TIMEOUT'])
+
+            local_cache.set(key, entry)
+
+        return entry[0]
+
+    def get_user_identity_in_thread(self, user_id):
+        close_old_connections()
+        try:
+            with attach_queries():
+                return self.get_user_identity(user_id)
+        finally:
+            close_old_connections()
+
+    def check_user(self, identity, version):
+        """Returns credentials of user identity unless token was revoked."""
+
+        if not identity.is_active:
+            raise AuthenticationFailed(_('User inactive or deleted.'))
+
+        if identity.token_version != version:
+            raise AuthenticationFailed(_('Access token has been revoked.'))
+
+        return get_identity_user(identity), None
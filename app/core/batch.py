@@ -0,0 +1,188 @@
+import contextvars
+import io
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIRequest
+from django.core.signals import setting_changed
+from django.db import close_old_connections
+from django.dispatch import receiver
+from django.urls import Resolver404, resolve
+
+from core.authentication import get_identity, get_identity_user
+from core.instrumentation import attach_queries
+from core.renderers import FastJSONRenderer
+
+
+logger = logging.getLogger('core.batch')
+
+CONCURRENT_METHODS = ('GET', 'HEAD')
+
+# Request headers that describe the batch request itself, sub-requests
+# carry their own.
+SKIPPED_META = (
+    'CONTENT_TYPE', 'CONTENT_LENGTH', 'QUERY_STRING', 'PATH_INFO',
+    'SCRIPT_NAME', 'REQUEST_METHOD', 'HTTP_ACCEPT', 'HTTP_IF_NONE_MATCH',
+    'HTTP_IF_MATCH', 'HTTP_IF_MODIFIED_SINCE', 'wsgi.input',
+)
+
+_executor = None
+
+
+def get_executor():
+    """Returns thread pool running concurrent sub-requests."""
+
+    global _executor
+
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, 'BATCH_MAX_WORKERS', 4),
+            thread_name_prefix='batch')
+
+    return _executor
+
+
+@receiver(setting_changed)
+def reset_executor(setting, **kwargs):
+    """Rebuilds thread pool when its size changes."""
+
+    global _executor
+
+    if setting == 'BATCH_MAX_WORKERS' and _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
+
+
+def build_request(request, spec):
+    """Returns Django request of sub-request spec made by request user."""
+
+    url = urlsplit(spec['path'])
+    body = b''
+    if spec.get('body') is not None:
+        body = FastJSONRenderer().render(spec['body'])
+
+    meta = {key: value for key, value in request.META.items()
+            if key not in SKIPPED_META}
+    for name, value in spec.get('headers', {}).items():
+        meta['HTTP_' + name.upper().replace('-', '_')] = value
+
+    sub_request = WSGIRequest({
+        **meta,
+        'REQUEST_METHOD': spec['method'],
+        'PATH_INFO': url.path,
+        'SCRIPT_NAME': '',
+        'QUERY_STRING': url.query,
+        'HTTP_ACCEPT': 'application/json',
+        'CONTENT_TYPE': 'application/json',
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.url_scheme': request.scheme,
+    })
+
+    # Token is authenticated once by the batch view, DRF views of the
+    # sub-requests take user over from the forced credentials. Each gets
+    # its own identity only user, so user fields are read fresh and never
+    # saved back by sub-requests.
+    sub_request._force_auth_user = get_identity_user(
+        get_identity(request.user))
+    sub_request._force_auth_token = request.auth
+    return sub_request
+
+
+def error(status, detail):
+    """Returns sub-response of an error."""
+
+    return {'status': status, 'headers': {}, 'body': {'detail': detail}}
+
+
+def dispatch(request, spec):
+    """Returns sub-response of spec resolved by the URL resolver."""
+
+    path = urlsplit(spec['path']).path
+    prefixes = getattr(settings, 'BATCH_PATH_PREFIXES', ['/api/'])
+    if not path.startswith(tuple(prefixes)):
+        return error(400, 'Sub-request path can not be batched.')
+
+    try:
+        match = resolve(path)
+    except Resolver404:
+        return error(404, 'Not found.')
+
+    if not getattr(getattr(match.func, 'cls', None), 'batchable', True):
+        return error(400, 'Sub-request path can not be batched.')
+
+    try:
+        response = match.func(build_request(request, spec),
+                              *match.args, **match.kwargs)
+    except Exception:
+        logger.exception('Batched %s %s failed', spec['method'], path)
+        return error(500, 'Server error.')
+
+    if response.streaming:
+        return error(400, 'Streaming responses can not be batched.')
+
+    headers = {name: value for name, value in response.items()
+               if name != 'Content-Type'}
+    # Data of DRF responses is embedded as is and rendered only once,
+    # together with the batch response.
+    data = getattr(response, 'data', None)
+    if spec['method'] == 'HEAD':
+        data = None
+    elif data is None and response.status_code != 304:
+        if hasattr(response, 'render'):
+            response.render()
+        data = response.content.decode(response.charset) or None
+
+    return {'status': response.status_code, 'headers': headers,
+            'body': data}
+
+
+def dispatch_in_thread(request, spec):
+    """
+    Returns sub-response of spec dispatched on a pool thread, its queries
+    recorded in the stats of the batch request.
+    """
+
+    close_old_connections()
+    try:
+        with attach_queries():
+            return dispatch(request, spec)
+    finally:
+        close_old_connections()
+
+
+def run_batch(request, specs):
+    """
+    Returns sub-responses of specs in order. Consecutive GET and HEAD
+    sub-requests run concurrently, other methods run alone in order so
+    that later sub-requests see their writes.
+    """
+
+    responses = [None] * len(specs)
+    index = 0
+
+    while index < len(specs):
+        end = index
+        while end < len(specs) and \
+                specs[end]['method'] in CONCURRENT_METHODS:
+            end += 1
+
+        if end - index > 1:
+            # Each sub-request runs in a copy of the current context, so
+            # read routing and the calling view of the batch carry over,
+            # and pool threads attach their connections to its stats.
+            futures = [
+                get_executor().submit(contextvars.copy_context().run,
+                                      dispatch_in_thread, request, spec)
+                for spec in specs[index:end]
+            ]
+            for offset, future in enumerate(futures):
+                responses[index + offset] = future.result()
+            index = end
+        else:
+            responses[index] = dispatch(request, specs[index])
+            index += 1
+
+    return responses
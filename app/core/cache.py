@@ -0,0 +1,69 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """Thread safe, size bounded LRU cache with per entry expiry"""
+
+    def __init__(self, max_size, timeout):
+        """Initializes cache by its bounds."""
+
+        self.max_size = max_size
+        self.timeout = timeout
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        """Returns live value of the given key or default."""
+
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, timeout=None):
+        """Stores value and evicts least recently used entries."""
+
+        if timeout is None:
+            timeout = self.timeout
+
+        with self._lock:
+            self._data[key] = (time.monotonic() + timeout, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        """Removes the given key if exists."""
+
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_where(self, predicate):
+        """Removes entries for which predicate(key, value) holds."""
+
+        with self._lock:
+            keys = [key for key, (_, value) in self._data.items()
+                    if predicate(key, value)]
+            for key in keys:
+                del self._data[key]
+
+        return keys
+
+    def clear(self):
+        """Removes all entries."""
+
+        with self._lock:
+            self._data.clear()
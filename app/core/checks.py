@@ -0,0 +1,77 @@
+from django.conf import settings
+from django.core.checks import Error, Warning, register
+
+
+ADMIN_MIDDLEWARE = (
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+)
+
+PROCESS_LOCAL_CACHE_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+)
+
+
+@register()
+def check_path_dispatch_middleware(app_configs, **kwargs):
+    """Checks that admin middleware runs through the path dispatcher."""
+
+    if 'core.middleware.PathDispatchMiddleware' not in settings.MIDDLEWARE:
+        return []
+
+    dispatched = getattr(settings, 'PATH_DISPATCH_MIDDLEWARE', [])
+    return [
+        Error(f"'{path}' must be in MIDDLEWARE or PATH_DISPATCH_MIDDLEWARE "
+              f"in order to use the admin application.",
+              id='core.E001')
+        for path in ADMIN_MIDDLEWARE
+        if path not in dispatched and path not in settings.MIDDLEWARE
+    ]
+
+
+def is_process_local(alias):
+    """Returns whether cache alias is not shared between processes."""
+
+    backend = settings.CACHES.get(alias, {}).get('BACKEND')
+    return backend in PROCESS_LOCAL_CACHE_BACKENDS
+
+
+@register(deploy=True)
+def check_recipe_list_cache(app_configs, **kwargs):
+    """
+    Checks that recipe list versions are shared between processes. It runs
+    with check --deploy only, as the development default is process local.
+    """
+
+    alias = getattr(settings, 'RECIPE_LIST_CACHE_ALIAS', 'default')
+    if not is_process_local(alias):
+        return []
+
+    return [Warning(
+        f"RECIPE_LIST_CACHE_ALIAS '{alias}' is local to each process, "
+        f"list writes are not seen by other workers until their cached "
+        f"versions expire.",
+        hint='Use a shared cache backend, e.g. set CACHE_BACKEND to '
+             'django.core.cache.backends.redis.RedisCache.',
+        id='core.W001',
+    )]
+
+
+@register()
+def check_read_your_writes_cache(app_configs, **kwargs):
+    """Checks that primary pins of users are shared between processes."""
+
+    alias = getattr(settings, 'DB_READ_YOUR_WRITES_CACHE_ALIAS', 'default')
+    if not getattr(settings, 'DATABASE_REPLICAS', []) or \
+            not is_process_local(alias):
+        return []
+
+    return [Warning(
+        f"DB_READ_YOUR_WRITES_CACHE_ALIAS '{alias}' is local to each "
+        f"process, users may read stale replica data from other workers "
+        f"right after their writes.",
+        hint='Use a shared cache backend, e.g. set CACHE_BACKEND to '
+             'django.core.cache.backends.redis.RedisCache.',
+        id='core.W002',
+    )]
@@ -0,0 +1,188 @@
+import io
+import random
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import connections, transaction, DEFAULT_DB_ALIAS
+from django.utils import timezone
+
+from core.models import ExpiringToken, Tag, Ingredient
+
+
+TAG_WORDS = (
+    'vegan', 'vegetarian', 'keto', 'paleo', 'gluten free', 'dairy free',
+    'quick', 'breakfast', 'lunch', 'dinner', 'dessert', 'snack', 'spicy',
+    'comfort', 'healthy', 'budget', 'holiday', 'summer', 'winter', 'kids',
+)
+
+INGREDIENT_WORDS = (
+    'salt', 'pepper', 'garlic', 'onion', 'olive oil', 'butter', 'flour',
+    'sugar', 'egg', 'milk', 'tomato', 'basil', 'thyme', 'rosemary',
+    'chicken', 'beef', 'rice', 'pasta', 'lemon', 'lime', 'ginger', 'cumin',
+    'paprika', 'carrot', 'potato', 'spinach', 'kale', 'cheese', 'yogurt',
+    'honey', 'vinegar', 'soy sauce', 'chili', 'coriander', 'parsley',
+    'mushroom', 'bean', 'lentil', 'chickpea', 'cabbage', 'cucumber',
+)
+
+
+def skewed_counts(total, size, skew, rng):
+    """
+    Returns size counts summing up to total, drawn from a Zipf like
+    distribution where the weight of rank r is 1 / r ** skew. Ranks are
+    shuffled so heavy owners are spread over the id range.
+    """
+
+    if size == 0:
+        return []
+
+    weights = [1 / rank ** skew for rank in range(1, size + 1)]
+    rng.shuffle(weights)
+    scale = total / sum(weights)
+
+    shares = [weight * scale for weight in weights]
+    counts = [int(share) for share in shares]
+
+    # Largest remainders get the rows lost by rounding down.
+    remainders = sorted(range(size), key=lambda i: counts[i] - shares[i])
+    for i in remainders[:total - sum(counts)]:
+        counts[i] += 1
+
+    return counts
+
+
+def iter_names(words, count, offset):
+    """Yields count deterministic names built from words."""
+
+    for i in range(count):
+        yield f'{words[(offset + i) % len(words)]} {i // len(words)}'
+
+
+class SyntheticDataGenerator:
+    """
+    Generates users, tokens, tags and ingredients deterministically from
+    a seed, writing rows in large batches by COPY or bulk_create.
+    """
+
+    def __init__(self, users, tags, ingredients, skew=0.0, seed=0,
+                 batch_size=10000, method='auto', password='synthetic',
+                 email_prefix='synthetic', using=DEFAULT_DB_ALIAS,
+                 progress=None):
+        """Initializes generator by dataset shape."""
+
+        self.users = users
+        self.tags = tags
+        self.ingredients = ingredients
+        self.skew = skew
+        self.seed = seed
+        self.batch_size = batch_size
+        self.password = password
+        self.email_prefix = email_prefix
+        self.using = using
+        self.progress = progress or (lambda message: None)
+
+        vendor = connections[using].vendor
+        if method == 'auto':
+            method = 'copy' if vendor == 'postgresql' else 'bulk'
+        if method == 'copy' and vendor != 'postgresql':
+            raise ValueError('COPY is only supported on PostgreSQL.')
+        self.method = method
+
+    def generate(self):
+        """Writes the dataset and returns (user, token) pairs."""
+
+        # Prefix is mixed in so datasets of different prefixes never share
+        # token keys, while each one stays reproducible.
+        rng = random.Random(f'{self.email_prefix}:{self.seed}')
+
+        users = self.create_users()
+        tokens = self.create_tokens(users, rng)
+
+        for model, words, mean in ((Tag, TAG_WORDS, self.tags),
+                                   (Ingredient, INGREDIENT_WORDS,
+                                    self.ingredients)):
+            counts = skewed_counts(mean * len(users), len(users),
+                                   self.skew, rng)
+            self.create_rows(model, words, users, counts)
+
+        if self.method == 'copy':
+            with connections[self.using].cursor() as cursor:
+                for model in (get_user_model(), ExpiringToken, Tag,
+                              Ingredient):
+                    cursor.execute(f'ANALYZE {model._meta.db_table}')
+
+        return list(zip(users, tokens))
+
+    def create_users(self):
+        """Creates users sharing one password hash."""
+
+        user_model = get_user_model()
+        password = make_password(self.password)
+        users = []
+
+        for start in range(0, self.users, self.batch_size):
+            stop = min(start + self.batch_size, self.users)
+            users.extend(user_model.objects.using(self.using).bulk_create([
+                user_model(
+                    email=f'{self.email_prefix}-{self.seed}-{i}@example.com',
+                    name=f'{self.email_prefix} {i}',
+                    password=password,
+                )
+                for i in range(start, stop)
+            ]))
+            self.progress(f'users: {stop}/{self.users}')
+
+        return users
+
+    def create_tokens(self, users, rng):
+        """Creates one seeded token per user."""
+
+        tokens = [ExpiringToken(key=f'{rng.getrandbits(160):040x}', user=user)
+                  for user in users]
+        for start in range(0, len(tokens), self.batch_size):
+            ExpiringToken.objects.using(self.using).bulk_create(
+                tokens[start:start + self.batch_size])
+
+        self.progress(f'tokens: {len(tokens)}')
+        return tokens
+
+    def create_rows(self, model, words, users, counts):
+        """Creates counts[i] rows of model owned by users[i]."""
+
+        write = self.copy_batch if self.method == 'copy' else self.bulk_batch
+        label = model._meta.verbose_name_plural
+        total = sum(counts)
+        written = 0
+        batch = []
+
+        for index, (user, count) in enumerate(zip(users, counts)):
+            for name in iter_names(words, count, index):
+                batch.append((name, user.pk))
+                if len(batch) >= self.batch_size:
+                    written += write(model, batch)
+                    batch = []
+                    self.progress(f'{label}: {written}/{total}')
+
+        if batch:
+            written += write(model, batch)
+        self.progress(f'{label}: {written}/{total}')
+
+    def bulk_batch(self, model, rows):
+        """Inserts rows by a single bulk_create."""
+
+        model.objects.using(self.using).bulk_create(
+            [model(name=name, user_id=user_id) for name, user_id in rows])
+        return len(rows)
+
+    def copy_batch(self, model, rows):
+        """Streams rows into PostgreSQL with COPY."""
+
+        now = timezone.now().isoformat()
+        buffer = io.StringIO(''.join(f'{name}\t{user_id}\t{now}\t{now}\n'
+                                     for name, user_id in rows))
+        connection = connections[self.using]
+        with transaction.atomic(using=self.using):
+            with connection.cursor() as cursor:
+                cursor.copy_from(buffer, model._meta.db_table,
+                                 columns=('name', 'user_id', 'created_at',
+                                          'updated_at'))
+        return len(rows)
@@ -0,0 +1,31 @@
+import time
+
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import connections
+from django.dispatch import receiver
+
+
+@receiver(request_started, dispatch_uid='core.db.check_connections_health')
+def check_connections_health(**kwargs):
+    """
+    Closes persistent connections which went away while idle, so that the
+    request reconnects instead of failing on its first query.
+    """
+
+    if not getattr(settings, 'DB_CONN_HEALTH_CHECKS', False):
+        return
+
+    interval = getattr(settings, 'DB_CONN_HEALTH_CHECK_INTERVAL', 10)
+    now = time.monotonic()
+
+    for connection in connections.all():
+        if connection.connection is None or connection.in_atomic_block:
+            continue
+
+        if now - getattr(connection, 'health_checked_at', 0) < interval:
+            continue
+
+        connection.health_checked_at = now
+        if not connection.is_usable():
+            connection.close()
@@ -0,0 +1,95 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+
+
+_read_alias = ContextVar('read_alias', default=None)
+
+
+def get_replicas():
+    """Returns configured replica database aliases."""
+
+    return getattr(settings, 'DATABASE_REPLICAS', [])
+
+
+def get_pin_cache():
+    """Returns cache holding primary pins of users."""
+
+    return caches[getattr(settings, 'DB_READ_YOUR_WRITES_CACHE_ALIAS',
+                          'default')]
+
+
+def pin_key(user_id):
+    """Returns cache key marking user as pinned to primary."""
+
+    return f'db-router:pinned:{user_id}'
+
+
+def pin_to_primary(user):
+    """Sticks reads of the given user to primary for a while."""
+
+    window = getattr(settings, 'DB_READ_YOUR_WRITES_WINDOW', 5)
+    if window > 0:
+        get_pin_cache().set(pin_key(user.pk), True, window)
+
+
+def is_pinned(user):
+    """Returns whether reads of the given user must go to primary."""
+
+    return bool(get_pin_cache().get(pin_key(user.pk)))
+
+
+def choose_read_alias(user):
+    """Returns replica to serve reads of user or None for primary."""
+
+    replicas = get_replicas()
+    if not replicas or (user.is_authenticated and is_pinned(user)):
+        return None
+
+    return random.choice(replicas)
+
+
+def set_read_alias(alias):
+    """Routes reads of current context to alias, returns reset token."""
+
+    return _read_alias.set(alias)
+
+
+def reset_read_alias(token):
+    """Restores read routing changed by set_read_alias."""
+
+    _read_alias.reset(token)
+
+
+@contextmanager
+def read_from(alias):
+    """Routes reads within the block to the given alias."""
+
+    token = set_read_alias(alias)
+    try:
+        yield
+    finally:
+        reset_read_alias(token)
+
+
+class PrimaryReplicaRouter:
+    """
+    Sends writes to primary and reads to the replica chosen for current
+    request, reads outside of a routed request stay on primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return False if db in get_replicas() else None
@@ -0,0 +1,28 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.views import exception_handler as drf_exception_handler
+
+from core.hashing import HashingOverloaded
+
+
+class HashingUnavailable(APIException):
+    """Password hashing overload as an API error"""
+
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = _('Too many password checks in progress, '
+                       'try again later.')
+    default_code = 'hashing_overloaded'
+
+    def __init__(self, wait=None):
+        super().__init__()
+        self.wait = wait
+
+
+def exception_handler(exc, context):
+    """Returns DRF error response, answering hashing overload by 503."""
+
+    if isinstance(exc, HashingOverloaded):
+        exc = HashingUnavailable(exc.wait)
+
+    return drf_exception_handler(exc, context)
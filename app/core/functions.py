@@ -0,0 +1,29 @@
+from django.db.models import Func
+from django.db.models.functions import Upper
+
+
+# Greatest code point, appended to a prefix it bounds every string
+# starting with that prefix.
+MAX_CHAR = '\U0010FFFF'
+
+
+class BinaryCollate(Func):
+    """
+    Collates expression in code point order, by the "C" collation on
+    PostgreSQL and the default BINARY collation elsewhere. Strings sharing
+    a prefix then form a contiguous range, which a btree index can both
+    seek and return in order.
+    """
+
+    template = '%(expressions)s'
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return self.as_sql(compiler, connection,
+                           template='%(expressions)s COLLATE "C"',
+                           **extra_context)
+
+
+def search_key(expression):
+    """Returns case insensitive prefix search key of expression."""
+
+    return BinaryCollate(Upper(expression))
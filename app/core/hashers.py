@@ -0,0 +1,15 @@
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class TunablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2 hasher whose work factor comes from PASSWORD_PBKDF2_ITERATIONS.
+    Algorithm name is unchanged, so existing hashes keep verifying and get
+    rehashed on login whenever the configured cost changes.
+    """
+
+    @property
+    def iterations(self):
+        return getattr(settings, 'PASSWORD_PBKDF2_ITERATIONS',
+                       PBKDF2PasswordHasher.iterations)
@@ -0,0 +1,114 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+
+_executor = None
+
+
+class HashingOverloaded(Exception):
+    """
+    Raised when password hashing sheds load, wait is the number of seconds
+    after which a retry is advised.
+    """
+
+    def __init__(self, wait=None):
+        super().__init__('Password hashing overloaded.')
+        self.wait = wait
+
+
+class HashingExecutor:
+    """
+    Runs password hashing on a bounded worker pool, rejecting work once
+    the queue is full or a result takes too long instead of letting
+    hashing bursts tie up every request thread.
+
+    Calling threads wait for their result, so load is shed only between
+    request threads of one process, i.e. when the server runs more of them
+    than max_workers plus max_queue.
+    """
+
+    def __init__(self, max_workers, max_queue, timeout, retry_after):
+        """Initializes executor by its bounds."""
+
+        self.max_pending = max_workers + max_queue
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers,
+                                        thread_name_prefix='password-hashing')
+
+    @property
+    def pending(self):
+        """Returns number of queued and running calls."""
+
+        return self._pending
+
+    def run(self, function, *args, **kwargs):
+        """Returns result of function run on the pool."""
+
+        if getattr(self._local, 'in_worker', False):
+            return function(*args, **kwargs)
+
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise HashingOverloaded(self.retry_after)
+            self._pending += 1
+
+        future = self._pool.submit(self._call, function, args, kwargs)
+        future.add_done_callback(self._release)
+
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            future.cancel()
+            raise HashingOverloaded(self.retry_after)
+
+    def _call(self, function, args, kwargs):
+        self._local.in_worker = True
+        return function(*args, **kwargs)
+
+    def _release(self, future):
+        with self._lock:
+            self._pending -= 1
+
+    def shutdown(self):
+        """Stops worker threads once queued calls are done."""
+
+        self._pool.shutdown(wait=False)
+
+
+def get_hashing_executor():
+    """Returns process wide password hashing executor."""
+
+    global _executor
+
+    if _executor is None:
+        max_workers = getattr(settings, 'PASSWORD_HASHING_MAX_WORKERS',
+                              os.cpu_count() or 1)
+        _executor = HashingExecutor(
+            max_workers=max_workers,
+            max_queue=getattr(settings, 'PASSWORD_HASHING_MAX_QUEUE',
+                              2 * max_workers),
+            timeout=getattr(settings, 'PASSWORD_HASHING_TIMEOUT', 5),
+            retry_after=getattr(settings, 'PASSWORD_HASHING_RETRY_AFTER', 1),
+        )
+
+    return _executor
+
+
+@receiver(setting_changed)
+def reset_hashing_executor(setting, **kwargs):
+    """Rebuilds hashing executor when its settings change."""
+
+    global _executor
+
+    if setting.startswith('PASSWORD_HASHING_') and _executor is not None:
+        _executor.shutdown()
+        _executor = None
@@ -0,0 +1,103 @@
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.db import connections
+
+
+current_view = ContextVar('current_view', default=None)
+current_stats = ContextVar('current_stats', default=None)
+
+
+class QueryStats:
+    """Query count, time and slowest statement of a unit of work"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.slowest_sql = None
+        self.slowest_duration = 0.0
+        self._lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.record(sql, time.perf_counter() - started)
+
+    def record(self, sql, duration):
+        """Adds a statement which ran for duration seconds."""
+
+        with self._lock:
+            self.count += 1
+            self.duration += duration
+            if duration >= self.slowest_duration:
+                self.slowest_sql = sql
+                self.slowest_duration = duration
+
+    def server_timing(self):
+        """Returns stats as Server-Timing header value."""
+
+        return (f'db;dur={self.duration * 1000:.2f};'
+                f'desc="{self.count} queries", '
+                f'db-slowest;dur={self.slowest_duration * 1000:.2f}')
+
+
+@contextmanager
+def capture_queries(local=True):
+    """
+    Records queries of every database alias run within the block, and of
+    worker threads which join it by attach_queries. Event loop threads pass
+    local as False, since their connections are shared by every request.
+    """
+
+    stats = QueryStats()
+    token = current_stats.set(stats)
+    try:
+        if local:
+            with attach_queries(stats):
+                yield stats
+        else:
+            yield stats
+    finally:
+        current_stats.reset(token)
+
+
+@contextmanager
+def attach_queries(stats=None):
+    """
+    Records queries of this thread into stats, by default those of the
+    capture_queries block whose context the thread runs in.
+    """
+
+    if stats is None:
+        stats = current_stats.get()
+
+    with ExitStack() as stack:
+        if stats is not None:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(stats))
+        yield stats
+
+
+def get_query_budget(resolver_match, method):
+    """
+    Returns query budget the resolved view declares for the method, by
+    action name on viewsets and by handler name on other views.
+    """
+
+    if resolver_match is None:
+        return None
+
+    func = resolver_match.func
+    view_class = getattr(func, 'cls', None) or \
+        getattr(func, 'view_class', None)
+    budgets = getattr(view_class, 'query_budgets', None)
+    if not budgets:
+        return None
+
+    actions = getattr(func, 'actions', None)
+    name = actions.get(method.lower()) if actions else method.lower()
+    return budgets.get(name)
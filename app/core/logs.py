@@ -0,0 +1,24 @@
+import json
+import logging
+
+
+RESERVED_ATTRS = frozenset(vars(logging.makeLogRecord({}))) | {'message'}
+
+
+class JSONFormatter(logging.Formatter):
+    """Formats records as single line JSON including their extras"""
+
+    def format(self, record):
+        payload = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        payload.update((key, value) for key, value in vars(record).items()
+                       if key not in RESERVED_ATTRS)
+
+        if record.exc_info:
+            payload['exc_info'] = self.formatException(record.exc_info)
+
+        return json.dumps(payload, default=str)
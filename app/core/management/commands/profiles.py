@@ -0,0 +1,51 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.profiling import list_profiles, summarize_profile
+
+
+class Command(BaseCommand):
+    """Profiles command"""
+
+    help = ('Lists saved request profiles, or summarizes the given one. '
+            'Profiles are recorded by ProfilingMiddleware.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('name', nargs='?',
+                            help='Profile to summarize, "latest" for the '
+                                 'newest one.')
+        parser.add_argument('--view', help='Only list profiles of view.')
+        parser.add_argument('--limit', type=int, default=30,
+                            help='Profiles listed or functions summarized.')
+        parser.add_argument('--sort', default='cumulative',
+                            help='pstats sort key of the summary.')
+
+    def handle(self, *args, **options):
+        """Handles profiles command."""
+
+        profiles = list_profiles()
+        if options['view']:
+            profiles = [profile for profile in profiles
+                        if profile['view'] == options['view']]
+
+        name = options['name']
+        if name is None:
+            for profile in profiles[:options['limit']]:
+                started = datetime.fromtimestamp(profile['timestamp'])
+                self.stdout.write(
+                    f'{started:%Y-%m-%d %H:%M:%S} '
+                    f'{profile["duration_ms"]:>7}ms '
+                    f'{profile["view"]:<32} {profile["name"]}')
+            return
+
+        if name == 'latest':
+            if not profiles:
+                raise CommandError('No profiles saved.')
+            name = profiles[0]['name']
+
+        try:
+            self.stdout.write(summarize_profile(
+                name, options['sort'], options['limit']))
+        except (OSError, KeyError) as error:
+            raise CommandError(error)
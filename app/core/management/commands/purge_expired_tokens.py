@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.models import ExpiringToken
+
+
+class Command(BaseCommand):
+    """Purge expired tokens command"""
+
+    help = ('Deletes expired tokens in small batches, each in its own '
+            'transaction so that locks are held only briefly.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--pause', type=float, default=0.0,
+                            help='Seconds to sleep between batches.')
+
+    def handle(self, *args, **options):
+        """Handles purge expired tokens command."""
+
+        # Keys are picked by the expiry index and deleted by primary key,
+        # so a batch never scans or locks live tokens.
+        expired = ExpiringToken.objects.filter(
+            expires_at__lte=timezone.now()).order_by('expires_at')
+        purged = 0
+
+        while True:
+            keys = list(expired.values_list('key', flat=True)[
+                :options['batch_size']])
+            if not keys:
+                break
+
+            purged += ExpiringToken.objects.filter(key__in=keys).delete()[0]
+            if options['pause']:
+                time.sleep(options['pause'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Purged {purged} expired tokens'))
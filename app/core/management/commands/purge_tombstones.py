@@ -0,0 +1,38 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.models import Tombstone
+
+
+class Command(BaseCommand):
+    """Purge tombstones command"""
+
+    help = ('Deletes tombstones older than the delta sync retention, '
+            'clients syncing from before it get a full listing.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int,
+            default=getattr(settings, 'RECIPE_SYNC_TOMBSTONE_RETENTION_DAYS',
+                            30))
+        parser.add_argument('--batch-size', type=int, default=10000)
+
+    def handle(self, *args, **options):
+        """Handles purge tombstones command."""
+
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        expired = Tombstone.objects.filter(deleted_at__lt=cutoff)
+        purged = 0
+
+        while True:
+            ids = list(expired.values_list('id', flat=True)[
+                :options['batch_size']])
+            if not ids:
+                break
+            purged += Tombstone.objects.filter(id__in=ids).delete()[0]
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Purged {purged} tombstones older than {options["days"]} days'))
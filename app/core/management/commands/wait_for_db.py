@@ -1,24 +1,54 @@
 import time
 
-from django.db import connections
+from django.db import connections, DEFAULT_DB_ALIAS
 from django.db.utils import OperationalError
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 
 
 class Command(BaseCommand):
     """Wait for DB command"""
 
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS,
+                            help='Database alias to wait for.')
+        parser.add_argument('--timeout', type=float, default=60,
+                            help='Seconds to wait before giving up.')
+        parser.add_argument('--initial-delay', type=float, default=0.1,
+                            help='Seconds to wait after first failure.')
+        parser.add_argument('--max-delay', type=float, default=5,
+                            help='Upper bound of backoff delay.')
+
+    def check_database(self, alias):
+        """Runs a round trip query, raises OperationalError on failure."""
+
+        connection = connections[alias]
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+        except OperationalError:
+            connection.close()
+            raise
+
     def handle(self, *args, **options):
         """Handles wait for db command."""
 
         self.stdout.write('Waiting for database to come alive ...')
 
-        db_connection = None
-        while not db_connection:
+        deadline = time.monotonic() + options['timeout']
+        delay = options['initial_delay']
+
+        while True:
             try:
-                db_connection = connections['default']
+                self.check_database(options['database'])
+                break
             except OperationalError as error:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise CommandError(
+                        f'Database did not come alive: [{error}]')
+
                 self.stdout.write(f'Database not ready yet, here is some clue: [{error}]')
-                time.sleep(1)
+                time.sleep(min(delay, remaining))
+                delay = min(delay * 2, options['max_delay'])
 
         self.stdout.write(self.style.SUCCESS("Uh, finally it's coming to some good news about database: STARTED"))
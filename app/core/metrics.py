@@ -0,0 +1,267 @@
+import bisect
+import math
+import threading
+import weakref
+
+
+DURATION_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+SIZE_BUCKETS = (
+    256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304,
+)
+
+
+class Metric:
+    """Metric description, samples are kept by the registry shards"""
+
+    type = None
+
+    def __init__(self, registry, name, documentation, labelnames=()):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+
+class Counter(Metric):
+    """Monotonically increasing value"""
+
+    type = 'counter'
+
+    def inc(self, labels=(), amount=1):
+        """Increments sample of the given label values."""
+
+        samples = self.registry.shard().counters
+        key = (self.name, labels)
+        samples[key] = samples.get(key, 0) + amount
+
+
+class Histogram(Metric):
+    """Observations counted into cumulative buckets"""
+
+    type = 'histogram'
+
+    def __init__(self, registry, name, documentation, labelnames=(),
+                 buckets=DURATION_BUCKETS):
+        super().__init__(registry, name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, labels=()):
+        """Records value into sample of the given label values."""
+
+        samples = self.registry.shard().histograms
+        key = (self.name, labels)
+        sample = samples.get(key)
+        if sample is None:
+            # Per bucket counts, +Inf count, sum.
+            sample = samples[key] = [0] * (len(self.buckets) + 1) + [0.0]
+
+        sample[bisect.bisect_left(self.buckets, value)] += 1
+        sample[-1] += value
+
+
+class Shard:
+    """Samples written by a single thread"""
+
+    def __init__(self):
+        self.counters = {}
+        self.histograms = {}
+
+    def merge(self, other):
+        """Adds samples of other shard to this one."""
+
+        # Copying a dict or list is atomic, owning threads may keep
+        # writing while samples are merged.
+        for key, value in other.counters.copy().items():
+            self.counters[key] = self.counters.get(key, 0) + value
+        for key, sample in other.histograms.copy().items():
+            merged = self.histograms.get(key)
+            if merged is None:
+                self.histograms[key] = sample.copy()
+            else:
+                self.histograms[key] = [a + b for a, b in zip(merged, sample)]
+
+
+class Registry:
+    """
+    Metric registry keeping one shard of samples per thread, so that
+    recording never takes a lock or contends with other threads. Shards
+    are merged only when collected, those of finished threads are folded
+    into a retired shard then so that thread per request servers do not
+    grow the registry.
+    """
+
+    def __init__(self):
+        self.metrics = {}
+        self.shards = []
+        self.retired = Shard()
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+    def shard(self):
+        """Returns shard of the current thread."""
+
+        try:
+            return self.local.shard
+        except AttributeError:
+            shard = self.local.shard = Shard()
+            with self.lock:
+                self.shards.append(
+                    (weakref.ref(threading.current_thread()), shard))
+            return shard
+
+    def retire_shards(self):
+        """Folds shards of finished threads into the retired shard."""
+
+        live = []
+        for thread_ref, shard in self.shards:
+            thread = thread_ref()
+            if thread is None or not thread.is_alive():
+                self.retired.merge(shard)
+            else:
+                live.append((thread_ref, shard))
+        self.shards = live
+
+    def register(self, metric):
+        """Adds metric to the registry and returns it."""
+
+        with self.lock:
+            if metric.name in self.metrics:
+                raise ValueError(f'Metric {metric.name} already registered.')
+            self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        """Registers a counter."""
+
+        return self.register(Counter(self, name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(),
+                  buckets=DURATION_BUCKETS):
+        """Registers a histogram."""
+
+        return self.register(
+            Histogram(self, name, documentation, labelnames, buckets))
+
+    def collect(self):
+        """Returns counter and histogram samples merged over shards."""
+
+        total = Shard()
+        with self.lock:
+            self.retire_shards()
+            total.merge(self.retired)
+            shards = [shard for _, shard in self.shards]
+
+        for shard in shards:
+            total.merge(shard)
+
+        return total.counters, total.histograms
+
+    def clear(self):
+        """Drops every recorded sample."""
+
+        with self.lock:
+            self.retired = Shard()
+            for _, shard in self.shards:
+                shard.counters.clear()
+                shard.histograms.clear()
+
+    def render(self):
+        """Returns samples in Prometheus text exposition format."""
+
+        counters, histograms = self.collect()
+        lines = []
+
+        for metric in sorted(self.metrics.values(), key=lambda m: m.name):
+            lines.append(f'# HELP {metric.name} '
+                         f'{escape_help(metric.documentation)}')
+            lines.append(f'# TYPE {metric.name} {metric.type}')
+
+            if metric.type == 'counter':
+                for (name, labels), value in sorted(counters.items()):
+                    if name == metric.name:
+                        lines.append(format_sample(
+                            name, metric.labelnames, labels, value))
+                continue
+
+            for (name, labels), sample in sorted(histograms.items()):
+                if name != metric.name:
+                    continue
+
+                cumulative = 0
+                bounds = metric.buckets + (math.inf,)
+                for bound, count in zip(bounds, sample):
+                    cumulative += count
+                    lines.append(format_sample(
+                        f'{name}_bucket', metric.labelnames + ('le',),
+                        labels + (format_value(bound),), cumulative))
+                lines.append(format_sample(
+                    f'{name}_sum', metric.labelnames, labels, sample[-1]))
+                lines.append(format_sample(
+                    f'{name}_count', metric.labelnames, labels, cumulative))
+
+        return '\n'.join(lines) + '\n'
+
+
+def escape_help(value):
+    """Returns HELP text escaped for exposition."""
+
+    return value.replace('\\', r'\\').replace('\n', r'\n')
+
+
+def escape_label(value):
+    """Returns label value escaped for exposition."""
+
+    return str(value).replace('\\', r'\\').replace('\n', r'\n') \
+        .replace('"', r'\"')
+
+
+def format_value(value):
+    """Returns sample value as exposition number."""
+
+    if value == math.inf:
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return f'{value:.1f}'
+    return repr(value)
+
+
+def format_sample(name, labelnames, labels, value):
+    """Returns a single exposition sample line."""
+
+    if not labelnames:
+        return f'{name} {format_value(value)}'
+
+    pairs = ','.join(f'{labelname}="{escape_label(label)}"'
+                     for labelname, label in zip(labelnames, labels))
+    return f'{name}{{{pairs}}} {format_value(value)}'
+
+
+registry = Registry()
+
+REQUESTS = registry.counter(
+    'http_requests_total',
+    'Requests served by view, method and status.',
+    ('view', 'method', 'status'),
+)
+
+REQUEST_DURATION = registry.histogram(
+    'http_request_duration_seconds',
+    'Request latency by view and method.',
+    ('view', 'method'),
+)
+
+RESPONSE_SIZE = registry.histogram(
+    'http_response_size_bytes',
+    'Response body size by view and method, streamed bodies excluded.',
+    ('view', 'method'),
+    buckets=SIZE_BUCKETS,
+)
+
+DB_DURATION = registry.histogram(
+    'http_request_db_duration_seconds',
+    'Database time spent per request by view and method.',
+    ('view', 'method'),
+)
@@ -0,0 +1,239 @@
+import logging
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.handlers.exception import convert_exception_to_response
+from django.utils.module_loading import import_string
+
+from core import metrics, profiling
+from core.instrumentation import (
+    capture_queries, current_view, get_query_budget,
+)
+
+
+logger = logging.getLogger('core.queries')
+
+UNRESOLVED_VIEW = '<unresolved>'
+
+
+def report_queries(request, response, stats):
+    """
+    Reports query stats of request by Server-Timing header and structured
+    log, returning response.
+    """
+
+    request.query_stats = stats
+
+    if getattr(settings, 'QUERY_SERVER_TIMING', True):
+        timing = stats.server_timing()
+        if response.has_header('Server-Timing'):
+            timing = f'{response["Server-Timing"]}, {timing}'
+        response['Server-Timing'] = timing
+
+    resolver_match = request.resolver_match
+    budget = get_query_budget(resolver_match, request.method)
+    over_budget = budget is not None and stats.count > budget
+
+    logger.log(
+        logging.WARNING if over_budget else logging.INFO,
+        '%s %s %s queries in %.2fms',
+        request.method, request.path, stats.count, stats.duration * 1000,
+        extra={
+            'method': request.method,
+            'path': request.path,
+            'view': resolver_match.view_name if resolver_match else None,
+            'status': response.status_code,
+            'db_queries': stats.count,
+            'db_query_budget': budget,
+            'db_time_ms': round(stats.duration * 1000, 3),
+            'db_slowest_ms': round(stats.slowest_duration * 1000, 3),
+            'db_slowest_sql': stats.slowest_sql,
+        },
+    )
+
+    return response
+
+
+def record_metrics(request, response, duration):
+    """Records metrics of request answered in duration seconds."""
+
+    if not getattr(settings, 'METRICS_ENABLED', True):
+        return response
+
+    resolver_match = request.resolver_match
+    view = resolver_match.view_name if resolver_match else UNRESOLVED_VIEW
+    labels = (view, request.method)
+
+    metrics.REQUESTS.inc(labels + (str(response.status_code),))
+    metrics.REQUEST_DURATION.observe(duration, labels)
+    if not response.streaming:
+        metrics.RESPONSE_SIZE.observe(len(response.content), labels)
+
+    stats = getattr(request, 'query_stats', None)
+    if stats is not None:
+        metrics.DB_DURATION.observe(stats.duration, labels)
+
+    return response
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Records query count, database time and slowest statement of every
+    request, reporting them by Server-Timing header and structured logs.
+    Queries of streamed response bodies run after this middleware returns
+    and are not included.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = current_view.set(None)
+        try:
+            with capture_queries() as stats:
+                response = self.get_response(request)
+        finally:
+            current_view.reset(token)
+
+        return report_queries(request, response, stats)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        """Marks queries that follow as run by the resolved view."""
+
+        current_view.set(request.resolver_match.view_name)
+
+
+class MetricsMiddleware:
+    """
+    Records request count, latency, response size and database time of
+    every request labelled by the resolved URL name. Must be placed first
+    so the latency covers every other middleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        response = self.get_response(request)
+        duration = time.perf_counter() - started
+
+        return record_metrics(request, response, duration)
+
+
+class ProfilingMiddleware:
+    """
+    Runs the view under cProfile for staff requests carrying the profiling
+    header and for a random sample of requests, saving the profile named by
+    the resolved URL name and duration to PROFILING_DIR.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not profiling.should_profile(request):
+            return self.get_response(request)
+
+        started = time.perf_counter()
+        response, profiler = profiling.run_profiled(self.get_response,
+                                                    request)
+        duration = time.perf_counter() - started
+        if profiler is None:
+            return response
+
+        resolver_match = request.resolver_match
+        name = profiling.save_profile(
+            profiler, resolver_match.view_name if resolver_match else None,
+            duration)
+        # Profile names are only shown to those allowed to read profiles.
+        if settings.DEBUG or profiling.is_staff_request(request):
+            response['X-Profile'] = name
+
+        return response
+
+
+class PathDispatchMiddleware:
+    """
+    Runs PATH_DISPATCH_MIDDLEWARE, in place of listing them in MIDDLEWARE,
+    for every request except those under PATH_DISPATCH_SKIP_PREFIXES. The
+    token authenticated API skips session loading, CSRF checks and message
+    storage this way while the admin keeps them. View, exception and
+    template response hooks of the wrapped middleware are delegated the
+    way Django calls them.
+    """
+
+    sync_capable = True
+    async_capable = False
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.skip_prefixes = tuple(
+            getattr(settings, 'PATH_DISPATCH_SKIP_PREFIXES', ('/api/',)))
+        self.view_middleware = []
+        self.exception_middleware = []
+        self.template_response_middleware = []
+
+        handler = convert_exception_to_response(get_response)
+        for path in reversed(getattr(settings, 'PATH_DISPATCH_MIDDLEWARE',
+                                     [])):
+            try:
+                instance = import_string(path)(handler)
+            except MiddlewareNotUsed:
+                continue
+
+            if hasattr(instance, 'process_view'):
+                self.view_middleware.insert(0, instance.process_view)
+            if hasattr(instance, 'process_template_response'):
+                self.template_response_middleware.append(
+                    instance.process_template_response)
+            if hasattr(instance, 'process_exception'):
+                self.exception_middleware.append(instance.process_exception)
+
+            handler = convert_exception_to_response(instance)
+
+        self.dispatched = handler
+
+    def is_skipped(self, request):
+        """Returns whether request bypasses the wrapped middleware."""
+
+        return request.path_info.startswith(self.skip_prefixes)
+
+    def __call__(self, request):
+        if self.is_skipped(request):
+            return self.get_response(request)
+
+        return self.dispatched(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if self.is_skipped(request):
+            return None
+
+        for process_view in self.view_middleware:
+            response = process_view(request, view_func, view_args,
+                                    view_kwargs)
+            if response is not None:
+                return response
+
+        return None
+
+    def process_exception(self, request, exception):
+        if self.is_skipped(request):
+            return None
+
+        for process_exception in self.exception_middleware:
+            response = process_exception(request, exception)
+            if response is not None:
+                return response
+
+        return None
+
+    def process_template_response(self, request, response):
+        if self.is_skipped(request):
+            return response
+
+        for process_template_response in self.template_response_middleware:
+            response = process_template_response(request, response)
+
+        return response
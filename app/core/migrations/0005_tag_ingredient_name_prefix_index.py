@@ -0,0 +1,24 @@
+# Generated by Django 4.0.10 on 2026-10-18 17:11
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('core', '0004_tag_ingredient_user_name_index'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='ingredient',
+            index=models.Index(fields=['user', 'name'], name='core_ingredient_prefix_idx', opclasses=['int8_ops', 'varchar_pattern_ops']),
+        ),
+        AddIndexConcurrently(
+            model_name='tag',
+            index=models.Index(fields=['user', 'name'], name='core_tag_prefix_idx', opclasses=['int8_ops', 'varchar_pattern_ops']),
+        ),
+    ]
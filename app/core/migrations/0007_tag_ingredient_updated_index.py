@@ -0,0 +1,24 @@
+# Generated by Django 4.0.10 on 2026-10-18 17:35
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('core', '0006_tag_ingredient_timestamps_tombstone'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='ingredient',
+            index=models.Index(fields=['user', 'updated_at', 'id'], name='core_ingredient_updated_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='tag',
+            index=models.Index(fields=['user', 'updated_at', 'id'], name='core_tag_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.0.10 on 2026-10-18 17:41
+
+import core.models
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_tag_ingredient_updated_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExpiringToken',
+            fields=[
+                ('key', models.CharField(default=core.models.generate_token_key, max_length=40, primary_key=True, serialize=False)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('expires_at', models.DateTimeField(db_index=True, default=core.models.default_token_expiry)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='expiring_tokens', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
@@ -0,0 +1,46 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import migrations
+from django.utils import timezone
+
+
+BATCH_SIZE = 10000
+
+
+def copy_tokens(apps, schema_editor):
+    """Issues expiring tokens under keys of existing authtoken tokens"""
+
+    Token = apps.get_model('authtoken', 'Token')
+    ExpiringToken = apps.get_model('core', 'ExpiringToken')
+    using = schema_editor.connection.alias
+
+    # Clients keep their keys, which expire a full lifetime from now.
+    expires_at = timezone.now() + timedelta(
+        seconds=getattr(settings, 'TOKEN_TTL', 7 * 24 * 3600))
+    tokens = Token.objects.using(using).order_by('pk').values_list(
+        'key', 'user_id')
+
+    last = ''
+    while True:
+        batch = list(tokens.filter(key__gt=last)[:BATCH_SIZE])
+        if not batch:
+            break
+
+        ExpiringToken.objects.using(using).bulk_create([
+            ExpiringToken(key=key, user_id=user_id, expires_at=expires_at)
+            for key, user_id in batch
+        ], ignore_conflicts=True)
+        last = batch[-1][0]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authtoken', '0003_tokenproxy'),
+        ('core', '0008_expiringtoken'),
+    ]
+
+    operations = [
+        migrations.RunPython(copy_tokens, migrations.RunPython.noop),
+    ]
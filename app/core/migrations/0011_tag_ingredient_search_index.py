@@ -0,0 +1,27 @@
+# Generated by Django 4.0.10 on 2026-10-18 17:59
+
+import core.functions
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+import django.db.models.expressions
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('core', '0010_user_token_version'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='ingredient',
+            index=models.Index(django.db.models.expressions.F('user'), core.functions.BinaryCollate(django.db.models.functions.text.Upper('name')), django.db.models.expressions.F('id'), name='core_ingredient_search_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='tag',
+            index=models.Index(django.db.models.expressions.F('user'), core.functions.BinaryCollate(django.db.models.functions.text.Upper('name')), django.db.models.expressions.F('id'), name='core_tag_search_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.0.10 on 2026-10-18 17:59
+
+from django.contrib.postgres.operations import RemoveIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('core', '0011_tag_ingredient_search_index'),
+    ]
+
+    operations = [
+        RemoveIndexConcurrently(
+            model_name='ingredient',
+            name='core_ingredient_prefix_idx',
+        ),
+        RemoveIndexConcurrently(
+            model_name='tag',
+            name='core_tag_prefix_idx',
+        ),
+    ]
@@ -0,0 +1,34 @@
+from rest_framework.permissions import SAFE_METHODS
+
+from core import db_router
+
+
+class ReplicaRoutingMixin:
+    """
+    Serves safe method requests from a read replica, unless their user
+    has recently written and is pinned to primary for read-your-writes.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        """Chooses read database once request is authenticated."""
+
+        super().initial(request, *args, **kwargs)
+
+        if request.method in SAFE_METHODS:
+            alias = db_router.choose_read_alias(request.user)
+            self._read_alias_token = db_router.set_read_alias(alias)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        """Restores read routing and pins writers to primary."""
+
+        token = getattr(self, '_read_alias_token', None)
+        if token is not None:
+            db_router.reset_read_alias(token)
+            self._read_alias_token = None
+
+        if request.method not in SAFE_METHODS and \
+                response.status_code < 400 and \
+                request.user.is_authenticated:
+            db_router.pin_to_primary(request.user)
+
+        return super().finalize_response(request, response, *args, **kwargs)
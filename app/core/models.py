@@ -1,7 +1,16 @@
+import secrets
+from datetime import timedelta
+
 from django.db import models
+from django.contrib.auth import hashers
 from django.contrib.auth.models import AbstractBaseUser, \
     BaseUserManager, PermissionsMixin
 from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+from core.functions import search_key
+from core.hashing import get_hashing_executor
 
 
 class UserManager(BaseUserManager):
@@ -38,11 +47,35 @@ class User(AbstractBaseUser, PermissionsMixin):
     name = models.CharField(max_length=255)
     is_active = models.BooleanField(default=True)
     is_staff = models.BooleanField(default=False)
+    # Bumped to revoke every signed access token issued to the user.
+    token_version = models.PositiveIntegerField(default=0)
     
     objects = UserManager()
     
     USERNAME_FIELD = 'email'
 
+    def set_password(self, raw_password):
+        """Hashes password on the hashing executor"""
+
+        get_hashing_executor().run(super().set_password, raw_password)
+
+    def check_password(self, raw_password):
+        """Checks password on the hashing executor"""
+
+        upgrades = []
+        is_correct = get_hashing_executor().run(
+            hashers.check_password, raw_password, self.password,
+            upgrades.append)
+
+        if upgrades:
+            # Hash upgrades are saved from the calling thread, pool workers
+            # never touch the database.
+            self.set_password(raw_password)
+            self._password = None
+            self.save(update_fields=['password'])
+
+        return is_correct
+
 
 class Tag(models.Model):
     """Tag Model"""
@@ -50,6 +83,18 @@ class Tag(models.Model):
     name = models.CharField(max_length=255)
     user = models.ForeignKey(to=settings.AUTH_USER_MODEL,
                              on_delete=models.DO_NOTHING)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', '-name', 'id'],
+                         name='core_tag_user_name_idx'),
+            models.Index(fields=['user', 'updated_at', 'id'],
+                         name='core_tag_updated_idx'),
+            models.Index(F('user'), search_key('name'), F('id'),
+                         name='core_tag_search_idx'),
+        ]
 
     def __str__(self):
         return self.name
@@ -61,6 +106,114 @@ class Ingredient(models.Model):
     name = models.CharField(max_length=255)
     user = models.ForeignKey(to=settings.AUTH_USER_MODEL,
                              on_delete=models.DO_NOTHING)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', '-name', 'id'],
+                         name='core_ingredient_user_name_idx'),
+            models.Index(fields=['user', 'updated_at', 'id'],
+                         name='core_ingredient_updated_idx'),
+            models.Index(F('user'), search_key('name'), F('id'),
+                         name='core_ingredient_search_idx'),
+        ]
 
     def __str__(self):
         return self.name
+
+
+class Tombstone(models.Model):
+    """Tombstone Model, records deletions for delta sync"""
+
+    user = models.ForeignKey(to=settings.AUTH_USER_MODEL,
+                             on_delete=models.CASCADE)
+    model = models.CharField(max_length=100)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'model', 'deleted_at', 'id'],
+                         name='core_tombstone_sync_idx'),
+            models.Index(fields=['deleted_at'],
+                         name='core_tombstone_deleted_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.model} {self.object_id}'
+
+
+def generate_token_key():
+    """Returns a new random token key."""
+
+    return secrets.token_hex(20)
+
+
+def get_token_ttl():
+    """Returns lifetime of tokens."""
+
+    return timedelta(seconds=getattr(settings, 'TOKEN_TTL', 7 * 24 * 3600))
+
+
+def default_token_expiry():
+    """Returns expiry of a token issued now."""
+
+    return timezone.now() + get_token_ttl()
+
+
+class ExpiringTokenManager(models.Manager):
+    """Expiring Token Manager"""
+
+    def issue(self, user):
+        """Returns live token of user renewed, or a new one"""
+
+        token = self.filter(user=user, expires_at__gt=timezone.now()) \
+            .order_by('-expires_at').first()
+        if token is None:
+            return self.create(user=user)
+
+        if token.needs_renewal():
+            token.renew()
+
+        return token
+
+
+class ExpiringToken(models.Model):
+    """Expiring Token Model, authenticates users until its expiry"""
+
+    key = models.CharField(max_length=40, primary_key=True,
+                           default=generate_token_key)
+    user = models.ForeignKey(to=settings.AUTH_USER_MODEL,
+                             related_name='expiring_tokens',
+                             on_delete=models.CASCADE)
+    created = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(default=default_token_expiry,
+                                      db_index=True)
+
+    objects = ExpiringTokenManager()
+
+    def __str__(self):
+        return self.key
+
+    def is_expired(self):
+        """Returns whether token has expired"""
+
+        return self.expires_at <= timezone.now()
+
+    def needs_renewal(self):
+        """
+        Returns whether expiry is to slide forward, which happens at most
+        once per TOKEN_RENEW_INTERVAL to keep authentication read only.
+        """
+
+        interval = timedelta(
+            seconds=getattr(settings, 'TOKEN_RENEW_INTERVAL', 3600))
+        return self.expires_at - timezone.now() < get_token_ttl() - interval
+
+    def renew(self):
+        """Slides expiry a full lifetime forward from now"""
+
+        self.expires_at = default_token_expiry()
+        ExpiringToken.objects.filter(pk=self.pk).update(
+            expires_at=self.expires_at)
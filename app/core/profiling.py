@@ -0,0 +1,147 @@
+import cProfile
+import os
+import pstats
+import random
+import re
+import tempfile
+import time
+from io import StringIO
+
+from django.conf import settings
+from rest_framework.exceptions import APIException
+
+from core.authentication import (
+    AccessTokenAuthentication, CachedTokenAuthentication,
+)
+
+
+PROFILE_SUFFIX = '.prof'
+
+PROFILE_NAME = re.compile(
+    r'^(?P<timestamp>\d+)-(?P<view>.+)-(?P<duration>\d+)ms-(?P<id>\w+)\.prof$')
+
+
+def get_profiling_dir():
+    """Returns directory profiles are written to."""
+
+    return getattr(settings, 'PROFILING_DIR', os.path.join(
+        tempfile.gettempdir(), 'recipe-profiles'))
+
+
+def is_staff_request(request):
+    """
+    Returns whether request carries credentials of a staff user, checked by
+    session or by tokens since API views authenticate after middleware.
+    """
+
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return user.is_staff
+
+    for authentication_class in (CachedTokenAuthentication,
+                                 AccessTokenAuthentication):
+        try:
+            result = authentication_class().authenticate(request)
+        except APIException:
+            return False
+
+        if result is not None:
+            return result[0].is_staff
+
+    return False
+
+
+def should_profile(request):
+    """Returns whether request is to be profiled."""
+
+    if not getattr(settings, 'PROFILING_ENABLED', False):
+        return False
+
+    header = getattr(settings, 'PROFILING_HEADER', 'HTTP_X_PROFILE')
+    if request.META.get(header) and is_staff_request(request):
+        return True
+
+    return random.random() < getattr(settings, 'PROFILING_SAMPLE_RATE', 0)
+
+
+def profile_name(view, duration):
+    """Returns file name of a profile of the given view."""
+
+    view = re.sub(r'[^\w.-]+', '.', view or 'unresolved')
+    return (f'{int(time.time() * 1000)}-{view}-{int(duration * 1000)}ms-'
+            f'{os.urandom(3).hex()}{PROFILE_SUFFIX}')
+
+
+def save_profile(profiler, view, duration):
+    """Writes profile to the profiling directory, returns its name."""
+
+    directory = get_profiling_dir()
+    os.makedirs(directory, exist_ok=True)
+
+    name = profile_name(view, duration)
+    profiler.dump_stats(os.path.join(directory, name))
+    prune_profiles()
+
+    return name
+
+
+def list_profiles():
+    """Returns saved profiles parsed from their names, newest first."""
+
+    try:
+        names = os.listdir(get_profiling_dir())
+    except FileNotFoundError:
+        return []
+
+    profiles = []
+    for name in names:
+        match = PROFILE_NAME.match(name)
+        if match:
+            profiles.append({
+                'name': name,
+                'view': match['view'],
+                'timestamp': int(match['timestamp']) / 1000,
+                'duration_ms': int(match['duration']),
+            })
+
+    return sorted(profiles, key=lambda profile: profile['timestamp'],
+                  reverse=True)
+
+
+def prune_profiles():
+    """Drops oldest profiles beyond PROFILING_MAX_FILES."""
+
+    for profile in list_profiles()[getattr(settings, 'PROFILING_MAX_FILES',
+                                           500):]:
+        try:
+            os.remove(os.path.join(get_profiling_dir(), profile['name']))
+        except FileNotFoundError:
+            pass
+
+
+def summarize_profile(name, sort='cumulative', limit=30):
+    """Returns pstats report of the named profile."""
+
+    path = os.path.join(get_profiling_dir(), os.path.basename(name))
+    stream = StringIO()
+    stats = pstats.Stats(path, stream=stream)
+    stats.strip_dirs().sort_stats(sort).print_stats(limit)
+    return stream.getvalue()
+
+
+def run_profiled(function, *args):
+    """
+    Returns result of function and profiler it ran under, or None when
+    another profiler is already active in this thread.
+    """
+
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        return function(*args), None
+
+    try:
+        return function(*args), profiler
+    finally:
+        profiler.disable()
@@ -0,0 +1,66 @@
+import msgpack
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSON renderer producing JSON equivalent to DRF JSONRenderer through
+    orjson, falling back to it for indented or ASCII output, for data
+    orjson rejects and when orjson is not installed. Floats may be written
+    differently, e.g. 1e-7 rather than 1e-07, and unlike DRF, NaN and
+    infinite floats render as null rather than raising.
+    """
+
+    # Dates are handed to the DRF encoder, which trims microseconds and
+    # writes UTC as Z.
+    options = orjson and \
+        orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Renders data into compact JSON bytes."""
+
+        if orjson is None or data is None or self.ensure_ascii or \
+                not self.compact or \
+                self.get_indent(accepted_media_type,
+                                renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type,
+                                  renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default,
+                               option=self.options)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type,
+                                  renderer_context)
+
+        # Same escaping of line and paragraph separators as DRF.
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028') \
+            .replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    MessagePack renderer for bandwidth constrained clients. Values without
+    a MessagePack type are converted like the JSON renderer does, so both
+    formats carry the same data.
+    """
+
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Renders data into MessagePack bytes."""
+
+        if data is None:
+            return b''
+
+        return msgpack.packb(data, default=JSONEncoder().default,
+                             use_bin_type=True, datetime=False)
@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework import serializers
+
+
+class SubRequestSerializer(serializers.Serializer):
+    """Sub-request Serializer"""
+
+    method = serializers.ChoiceField(
+        choices=('GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE'),
+        default='GET')
+    path = serializers.RegexField(r'^/\S*$')
+    headers = serializers.DictField(child=serializers.CharField(),
+                                    required=False)
+    body = serializers.JSONField(required=False, allow_null=True)
+
+
+class BatchSerializer(serializers.Serializer):
+    """Batch Serializer"""
+
+    requests = SubRequestSerializer(many=True, allow_empty=False)
+
+    def validate_requests(self, value):
+        """Validates that batch is within the configured size"""
+
+        max_requests = getattr(settings, 'BATCH_MAX_REQUESTS', 20)
+        if len(value) > max_requests:
+            raise serializers.ValidationError(
+                _('Batch can not have more than %(max)d requests.')
+                % {'max': max_requests})
+
+        return value
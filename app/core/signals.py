@@ -0,0 +1,28 @@
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.authentication import invalidate_token, invalidate_user
+from core.models import ExpiringToken
+
+
+@receiver(post_delete, sender=ExpiringToken)
+def invalidate_deleted_token(sender, instance, **kwargs):
+    """Drops deleted token from authentication cache"""
+
+    invalidate_token(instance.key)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def invalidate_saved_user(sender, instance, created, **kwargs):
+    """Drops tokens of changed user from authentication cache"""
+
+    if not created:
+        invalidate_user(instance)
+
+
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def invalidate_deleted_user(sender, instance, **kwargs):
+    """Drops deleted user from authentication cache"""
+
+    invalidate_user(instance)
@@ -0,0 +1,215 @@
+import hashlib
+import logging
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import connections, transaction
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from core.instrumentation import current_view
+
+
+logger = logging.getLogger('core.slow_queries')
+
+_executor = None
+_executor_lock = threading.Lock()
+_pending = 0
+_local = threading.local()
+
+EXPLAIN_PREFIXES = {
+    'postgresql': 'EXPLAIN (ANALYZE, BUFFERS) ',
+    'sqlite': 'EXPLAIN QUERY PLAN ',
+}
+# Prefixes capturing plans without running the statement.
+PLAN_ONLY_PREFIXES = {
+    'postgresql': 'EXPLAIN ',
+    'sqlite': 'EXPLAIN QUERY PLAN ',
+}
+LOCKING_CLAUSE = re.compile(
+    r'\bFOR\s+(NO\s+KEY\s+UPDATE|UPDATE|KEY\s+SHARE|SHARE)\b', re.IGNORECASE)
+
+
+def get_executor():
+    """Returns single worker pool capturing query plans."""
+
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1,
+                                           thread_name_prefix='slow-query')
+        return _executor
+
+
+def fingerprint(params):
+    """Returns digest identifying params without logging their values."""
+
+    return hashlib.sha1(repr(params).encode()).hexdigest()[:12]
+
+
+def explain(alias, sql, params):
+    """
+    Returns plan of a statement run on a connection of the current thread,
+    closing it afterwards so that idle workers hold no connections.
+
+    Statements locking rows are only planned, as running them would wait
+    for the locks of the request that ran them. Others run in a read only
+    transaction that is rolled back, so functions they call can not write.
+    """
+
+    connection = connections[alias]
+    if LOCKING_CLAUSE.search(sql):
+        prefix = PLAN_ONLY_PREFIXES[connection.vendor]
+    else:
+        prefix = EXPLAIN_PREFIXES[connection.vendor]
+
+    _local.explaining = True
+    try:
+        with transaction.atomic(using=alias), connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute('SET TRANSACTION READ ONLY')
+            cursor.execute(prefix + sql, params)
+            rows = cursor.fetchall()
+            transaction.set_rollback(True, using=alias)
+    finally:
+        _local.explaining = False
+        connection.close()
+
+    return '\n'.join(' '.join(str(column) for column in row) for row in rows)
+
+
+def log_slow_query(record, alias=None, params=None):
+    """Logs slow query record, capturing its plan first if alias is set."""
+
+    if alias is not None:
+        try:
+            record['plan'] = explain(alias, record['sql'], params)
+        except Exception as error:
+            record['plan_error'] = repr(error)
+
+    logger.warning('Slow query took %.2fms in %s', record['duration_ms'],
+                   record['view'], extra=record)
+
+
+class SlowQueryLogger:
+    """
+    Execute wrapper logging statements slower than SLOW_QUERY_THRESHOLD_MS.
+    Plans of sampled SELECT statements are captured on a background worker
+    before the record is logged, other statements and those exceeding
+    SLOW_QUERY_MAX_PENDING queued captures are logged right away.
+    """
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            if not getattr(_local, 'explaining', False):
+                self.check(duration, sql, params, many, context)
+
+    def check(self, duration, sql, params, many, context):
+        """Logs statement if it ran slower than the threshold."""
+
+        threshold = getattr(settings, 'SLOW_QUERY_THRESHOLD_MS', 200)
+        if duration * 1000 < threshold:
+            return
+
+        if random.random() >= getattr(settings, 'SLOW_QUERY_SAMPLE_RATE', 1):
+            return
+
+        connection = context['connection']
+        record = {
+            'sql': sql,
+            'params_fingerprint': fingerprint(params),
+            'view': current_view.get(),
+            'db_alias': connection.alias,
+            'duration_ms': round(duration * 1000, 3),
+        }
+
+        if self.can_explain(connection, sql, many) and self.acquire():
+            future = get_executor().submit(log_slow_query, record,
+                                           connection.alias, params)
+            future.add_done_callback(self.release)
+        else:
+            log_slow_query(record)
+
+    def acquire(self):
+        """Reserves a plan capture slot, returns False once all taken."""
+
+        global _pending
+
+        with _executor_lock:
+            if _pending >= getattr(settings, 'SLOW_QUERY_MAX_PENDING', 100):
+                return False
+            _pending += 1
+            return True
+
+    def release(self, future):
+        global _pending
+
+        with _executor_lock:
+            _pending -= 1
+
+    def can_explain(self, connection, sql, many):
+        """Returns whether plan of statement can be captured."""
+
+        return getattr(settings, 'SLOW_QUERY_EXPLAIN', True) and \
+            not many and \
+            connection.vendor in EXPLAIN_PREFIXES and \
+            sql.lstrip()[:6].upper() == 'SELECT'
+
+
+def install(connection):
+    """
+    Adds slow query logger to the connection unless present. It goes to
+    the bottom of the wrapper stack, since connections opened within a
+    request already hold wrappers the request pops on its way out.
+    """
+
+    if not any(isinstance(wrapper, SlowQueryLogger)
+               for wrapper in connection.execute_wrappers):
+        connection.execute_wrappers.insert(0, SlowQueryLogger())
+
+
+def uninstall(connection):
+    """Removes slow query logger from the connection."""
+
+    connection.execute_wrappers[:] = [
+        wrapper for wrapper in connection.execute_wrappers
+        if not isinstance(wrapper, SlowQueryLogger)
+    ]
+
+
+@receiver(connection_created, dispatch_uid='core.slow_queries.connect')
+def connect(connection, **kwargs):
+    """Instruments new connections when the slow query log is on."""
+
+    if getattr(settings, 'SLOW_QUERY_LOG', False):
+        install(connection)
+
+
+@receiver(setting_changed, dispatch_uid='core.slow_queries.toggle')
+def toggle(setting, enter, **kwargs):
+    """Instruments open connections when the slow query log is toggled."""
+
+    if setting != 'SLOW_QUERY_LOG':
+        return
+
+    for connection in connections.all():
+        if getattr(settings, 'SLOW_QUERY_LOG', False):
+            install(connection)
+        else:
+            uninstall(connection)
+
+
+def flush():
+    """Waits for pending plan captures."""
+
+    get_executor().submit(lambda: None).result()
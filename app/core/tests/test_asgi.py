@@ -0,0 +1,235 @@
+import json
+import re
+
+import msgpack
+
+from asgiref.testing import ApplicationCommunicator
+from django.contrib.auth import get_user_model
+from django.test import TransactionTestCase, override_settings
+
+from app.asgi import application
+from core import metrics
+from core.asgi import LeanASGIHandler
+from core.authentication import get_token_cache, issue_access_token
+from core.models import ExpiringToken, Tag
+from core.tests.utils import ShortLivedConnectionsMixin
+
+
+def make_scope(path, method='GET', query_string=b'', headers=()):
+    """Returns ASGI HTTP scope of a request"""
+
+    return {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': method,
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': query_string,
+        'root_path': '',
+        'headers': [(b'host', b'testserver'), *headers],
+        'client': ('127.0.0.1', 50000),
+        'server': ('testserver', 80),
+    }
+
+
+async def asgi_request(scope, body=b''):
+    """Returns status, headers and body of request served by application"""
+
+    communicator = ApplicationCommunicator(application, scope)
+    await communicator.send_input({'type': 'http.request', 'body': body})
+
+    start = await communicator.receive_output(timeout=5)
+    content = b''
+    while True:
+        message = await communicator.receive_output(timeout=5)
+        content += message.get('body', b'')
+        if not message.get('more_body', False):
+            break
+    await communicator.wait()
+
+    headers = {name.lower(): value for name, value in start['headers']}
+    return start['status'], headers, content
+
+
+class AsyncRouterTests(ShortLivedConnectionsMixin, TransactionTestCase):
+    """Async Router and Views Tests"""
+
+    def setUp(self):
+        """Sets up"""
+
+        super().setUp()
+        get_token_cache().clear()
+        self.user = get_user_model().objects.create_user(
+            email='test@sample.com',
+            password='testpass123',
+            name='test',
+        )
+        self.token = ExpiringToken.objects.create(user=self.user)
+        self.auth = (b'authorization', f'Token {self.token}'.encode())
+        self.tags = [Tag.objects.create(user=self.user, name=name)
+                     for name in ('vegan', 'keto')]
+
+    def test_routes(self):
+        """Tests that only async routes reach the lean handler"""
+
+        router = application
+        cases = (
+            (make_scope('/api/recipe/tags/'), True),
+            (make_scope('/api/users/me/'), True),
+            (make_scope('/api/recipe/tags/', method='POST'), False),
+            (make_scope('/api/recipe/tags/', query_string=b'stream=json'),
+             False),
+            (make_scope('/api/recipe/tags/',
+                        headers=[(b'accept', b'application/x-ndjson')]),
+             False),
+            (make_scope('/api/users/token/'), False),
+            (make_scope('/admin/'), False),
+        )
+
+        self.assertIsInstance(router.lean_application, LeanASGIHandler)
+        for scope, expected in cases:
+            self.assertEqual(router.is_async_route(scope), expected,
+                             scope['path'])
+
+    async def test_tag_list(self):
+        """Tests that async tag list matches the sync response"""
+
+        status, headers, content = await asgi_request(
+            make_scope('/api/recipe/tags/', headers=[self.auth]))
+
+        self.assertEqual(status, 200)
+        self.assertEqual(headers[b'content-type'], b'application/json')
+        self.assertEqual(headers[b'content-length'],
+                         str(len(content)).encode())
+        self.assertIn(b'etag', headers)
+        self.assertEqual(
+            content,
+            b'{"next":null,"previous":null,"results":['
+            b'{"id":%d,"name":"vegan"},{"id":%d,"name":"keto"}]}' % (
+                self.tags[0].pk, self.tags[1].pk))
+
+    async def test_tag_list_not_modified(self):
+        """Tests that async list honours entity tags"""
+
+        _, headers, _ = await asgi_request(
+            make_scope('/api/recipe/tags/', headers=[self.auth]))
+        status, _, content = await asgi_request(make_scope(
+            '/api/recipe/tags/',
+            headers=[self.auth, (b'if-none-match', headers[b'etag'])]))
+
+        self.assertEqual(status, 304)
+        self.assertEqual(content, b'')
+
+    async def test_me_msgpack(self):
+        """Tests that async user retrieval negotiates msgpack"""
+
+        status, headers, content = await asgi_request(make_scope(
+            '/api/users/me/',
+            headers=[self.auth, (b'accept', b'application/msgpack')]))
+
+        self.assertEqual(status, 200)
+        self.assertEqual(headers[b'content-type'], b'application/msgpack')
+        self.assertEqual(msgpack.unpackb(content), {
+            'id': self.user.pk, 'email': 'test@sample.com', 'name': 'test'})
+
+    async def test_stream_json(self):
+        """Tests that streamed lists are read off the event loop"""
+
+        status, _, content = await asgi_request(make_scope(
+            '/api/recipe/tags/', query_string=b'stream=json',
+            headers=[self.auth]))
+
+        self.assertEqual(status, 200)
+        self.assertEqual([tag['name'] for tag in json.loads(content)],
+                         ['vegan', 'keto'])
+
+    async def test_stream_ndjson(self):
+        """Tests that NDJSON lists are streamed under ASGI"""
+
+        status, _, content = await asgi_request(make_scope(
+            '/api/recipe/tags/',
+            headers=[self.auth, (b'accept', b'application/x-ndjson')]))
+
+        self.assertEqual(status, 200)
+        self.assertEqual(
+            [json.loads(line)['name'] for line in content.splitlines()],
+            ['vegan', 'keto'])
+
+    async def test_tag_list_instrumented(self):
+        """Tests that lean responses are instrumented like regular ones"""
+
+        metrics.registry.clear()
+
+        with self.assertLogs('core.queries', 'INFO') as logs:
+            status, headers, _ = await asgi_request(
+                make_scope('/api/recipe/tags/', headers=[self.auth]))
+
+        self.assertEqual(status, 200)
+        self.assertEqual(headers[b'x-content-type-options'], b'nosniff')
+        self.assertEqual(headers[b'x-frame-options'], b'DENY')
+        queries = int(re.search(rb'desc="(\d+) queries"',
+                                headers[b'server-timing']).group(1))
+        self.assertGreater(queries, 0)
+
+        record = logs.records[0]
+        self.assertEqual(record.view, 'recipe:tag-list')
+        self.assertEqual(record.db_queries, queries)
+        self.assertEqual(record.db_query_budget, 2)
+
+        counters, _ = metrics.registry.collect()
+        self.assertEqual(counters[(
+            'http_requests_total', ('recipe:tag-list', 'GET', '200'))], 1)
+
+    async def test_head(self):
+        """Tests that lean HEAD responses have no body"""
+
+        status, headers, content = await asgi_request(make_scope(
+            '/api/recipe/tags/', method='HEAD', headers=[self.auth]))
+
+        self.assertEqual(status, 200)
+        self.assertIn(b'etag', headers)
+        self.assertEqual(content, b'')
+
+    async def test_unauthenticated(self):
+        """Tests that async views require a token"""
+
+        status, headers, content = await asgi_request(
+            make_scope('/api/users/me/'))
+
+        self.assertEqual(status, 401)
+        self.assertEqual(headers[b'www-authenticate'], b'Token')
+        self.assertIn(b'detail', content)
+
+    @override_settings(ACCESS_TOKENS_ENABLED=True)
+    async def test_access_token(self):
+        """Tests that async views accept signed access tokens"""
+
+        access = issue_access_token(self.user)
+        status, _, _ = await asgi_request(make_scope(
+            '/api/users/me/',
+            headers=[(b'authorization', f'Bearer {access}'.encode())]))
+
+        self.assertEqual(status, 200)
+
+    async def test_invalid_token(self):
+        """Tests that unknown tokens are rejected"""
+
+        status, _, _ = await asgi_request(make_scope(
+            '/api/users/me/',
+            headers=[(b'authorization', b'Token ' + b'0' * 40)]))
+
+        self.assertEqual(status, 401)
+
+    async def test_sync_route(self):
+        """Tests that other routes are served by regular handler"""
+
+        body = b'{"email": "test@sample.com", "password": "testpass123"}'
+        status, _, content = await asgi_request(make_scope(
+            '/api/users/token/', method='POST',
+            headers=[(b'content-type', b'application/json'),
+                     (b'content-length', str(len(body)).encode())]), body)
+
+        self.assertEqual(status, 200, content)
+        self.assertIn(self.token.key.encode(), content)
@@ -0,0 +1,339 @@
+import time
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIClient
+
+from core.authentication import (
+    AccessTokenAuthentication, CachedTokenAuthentication, UserIdentity,
+    access_user_key, get_token_cache, issue_access_token,
+)
+from core.cache import TTLCache
+from core.models import ExpiringToken
+
+
+TAGS_URL = reverse('recipe:tag-list')
+SELF_USER_URL = reverse('users:me')
+
+
+class TTLCacheTests(TestCase):
+    """TTL Cache Tests"""
+
+    def test_entries_expire(self):
+        """Tests that expired entries are not returned"""
+
+        cache = TTLCache(max_size=10, timeout=60)
+        cache.set('live', 1)
+        cache.set('dead', 2, timeout=-1)
+
+        self.assertEqual(cache.get('live'), 1)
+        self.assertIsNone(cache.get('dead'))
+
+    def test_size_bounded(self):
+        """Tests that least recently used entries are evicted"""
+
+        cache = TTLCache(max_size=2, timeout=60)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+
+
+class CachedTokenAuthenticationTests(TestCase):
+    """Cached Token Authentication Tests"""
+
+    def setUp(self):
+        """Sets up"""
+
+        get_token_cache().clear()
+        self.user = get_user_model().objects.create_user(
+            email='test@sample.com',
+            password='testpass123',
+        )
+        self.token = ExpiringToken.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.authentication = CachedTokenAuthentication()
+
+    def test_cache_hit_skips_database(self):
+        """Tests that cached token is authenticated without queries"""
+
+        self.authentication.authenticate_credentials(self.token.key)
+
+        with self.assertNumQueries(0):
+            user, token = self.authentication.authenticate_credentials(
+                self.token.key)
+
+        self.assertEqual(user, self.user)
+        self.assertEqual(token.key, self.token.key)
+
+    def test_token_deletion_invalidates(self):
+        """Tests that deleted token stops authenticating"""
+
+        key = self.token.key
+        self.authentication.authenticate_credentials(key)
+        self.token.delete()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authentication.authenticate_credentials(key)
+
+    def test_user_deactivation_invalidates(self):
+        """Tests that deactivated user stops authenticating"""
+
+        res = self.client.get(TAGS_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        self.user.is_active = False
+        self.user.save()
+
+        res = self.client.get(TAGS_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_password_update_invalidates(self):
+        """Tests that password update drops cached user"""
+
+        self.client.patch(SELF_USER_URL, {'password': 'newpassword123'})
+
+        self.assertIsNone(get_token_cache().get(self.token.key))
+
+    def test_profile_update_visible(self):
+        """Tests that updated profile is returned while token is cached"""
+
+        self.client.get(SELF_USER_URL)
+        self.client.patch(SELF_USER_URL, {'name': 'New'})
+
+        res = self.client.get(SELF_USER_URL)
+
+        self.assertEqual(res.data['name'], 'New')
+
+    def test_stale_user_not_saved_back(self):
+        """Tests that changes of other processes survive profile updates"""
+
+        self.client.get(SELF_USER_URL)
+        # Another process, whose invalidation never reaches this one.
+        get_user_model().objects.filter(pk=self.user.pk).update(
+            is_active=False, password='changed')
+
+        res = self.client.patch(SELF_USER_URL, {'name': 'New'})
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.is_active)
+        self.assertEqual(self.user.password, 'changed')
+        self.assertEqual(self.user.name, '')
+
+    def test_cache_holds_identity(self):
+        """Tests that cache entries never hold user rows"""
+
+        self.authentication.authenticate_credentials(self.token.key)
+
+        identity, token = get_token_cache().get(self.token.key)
+        self.assertIsInstance(identity, UserIdentity)
+        self.assertFalse(ExpiringToken.user.is_cached(token))
+
+    @override_settings(TOKEN_AUTH_CACHE={'SHARED_CACHE_ALIAS': 'default'})
+    def test_shared_cache_tier(self):
+        """Tests that shared cache tier serves other processes"""
+
+        self.authentication.authenticate_credentials(self.token.key)
+        get_token_cache().clear()
+
+        with self.assertNumQueries(0):
+            user, _ = self.authentication.authenticate_credentials(
+                self.token.key)
+
+        self.assertEqual(user, self.user)
+
+        key = self.token.key
+        self.token.delete()
+        with self.assertRaises(AuthenticationFailed):
+            self.authentication.authenticate_credentials(key)
+
+
+@override_settings(TOKEN_TTL=3600, TOKEN_RENEW_INTERVAL=60)
+class ExpiringTokenTests(TestCase):
+    """Expiring Token Tests"""
+
+    def setUp(self):
+        """Sets up"""
+
+        get_token_cache().clear()
+        self.user = get_user_model().objects.create_user(
+            email='test@sample.com',
+            password='testpass123',
+        )
+        self.token = ExpiringToken.objects.create(user=self.user)
+        self.authentication = CachedTokenAuthentication()
+
+    def age(self, seconds):
+        """Moves expiry of token as if it was issued seconds ago"""
+
+        ExpiringToken.objects.filter(pk=self.token.pk).update(
+            expires_at=self.token.expires_at - timedelta(seconds=seconds))
+        get_token_cache().clear()
+
+    def test_expired_token_rejected(self):
+        """Tests that expired token no longer authenticates"""
+
+        self.age(3600)
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authentication.authenticate_credentials(self.token.key)
+
+    def test_renewal_throttled(self):
+        """Tests that fresh tokens are authenticated without writes"""
+
+        self.age(30)
+
+        with self.assertNumQueries(1):
+            _, token = self.authentication.authenticate_credentials(
+                self.token.key)
+
+        self.assertLess(token.expires_at, self.token.expires_at)
+
+    def test_sliding_renewal(self):
+        """Tests that token in use slides its expiry forward"""
+
+        self.age(1800)
+
+        _, token = self.authentication.authenticate_credentials(
+            self.token.key)
+
+        self.token.refresh_from_db()
+        self.assertEqual(token.expires_at, self.token.expires_at)
+        self.assertGreater(self.token.expires_at,
+                           timezone.now() + timedelta(seconds=3500))
+
+        with self.assertNumQueries(0):
+            _, cached = self.authentication.authenticate_credentials(
+                self.token.key)
+        self.assertEqual(cached.expires_at, self.token.expires_at)
+
+    def test_cache_bounded_by_expiry(self):
+        """Tests that cached token does not outlive its expiry"""
+
+        self.age(3599)
+        self.authentication.get_credentials(self.token.key)
+
+        cache = get_token_cache()
+        self.assertLessEqual(cache._data[self.token.key][0] - time.monotonic(),
+                             1)
+
+    def test_purge_expired_tokens(self):
+        """Tests that only expired tokens are purged"""
+
+        expired = ExpiringToken.objects.create(
+            user=self.user, expires_at=timezone.now())
+
+        call_command('purge_expired_tokens', batch_size=1, stdout=StringIO())
+
+        self.assertFalse(ExpiringToken.objects.filter(pk=expired.pk).exists())
+        self.assertTrue(
+            ExpiringToken.objects.filter(pk=self.token.pk).exists())
+
+
+@override_settings(ACCESS_TOKENS_ENABLED=True)
+class AccessTokenAuthenticationTests(TestCase):
+    """Access Token Authentication Tests"""
+
+    def setUp(self):
+        """Sets up"""
+
+        get_token_cache().clear()
+        self.user = get_user_model().objects.create_user(
+            email='test@sample.com',
+            password='testpass123',
+        )
+        self.access = issue_access_token(self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.access}')
+        self.authentication = AccessTokenAuthentication()
+
+    def test_cache_hit_skips_database(self):
+        """Tests that access token is verified without queries"""
+
+        self.authentication.verify(self.access)
+        self.authentication.get_user_identity(self.user.pk)
+
+        with self.assertNumQueries(0):
+            user_id, version = self.authentication.verify(self.access)
+            user, _ = self.authentication.check_user(
+                self.authentication.get_user_identity(user_id), version)
+
+        self.assertEqual(user, self.user)
+
+    def test_cache_holds_identity(self):
+        """Tests that access token cache never holds user rows"""
+
+        self.client.get(TAGS_URL)
+
+        identity, _ = get_token_cache().get(access_user_key(self.user.pk))
+        self.assertIsInstance(identity, UserIdentity)
+
+    def test_api_access(self):
+        """Tests that API accepts access tokens"""
+
+        res = self.client.get(TAGS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_tampered_token_rejected(self):
+        """Tests that token with a forged payload is rejected"""
+
+        forged = f'{self.user.pk + 1}' + self.access[len(str(self.user.pk)):]
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authentication.verify(forged)
+
+    @override_settings(ACCESS_TOKEN_TTL=-1)
+    def test_expired_token_rejected(self):
+        """Tests that access token expires"""
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authentication.verify(self.access)
+
+    def test_revoked_token_rejected(self):
+        """Tests that password change invalidates issued access tokens"""
+
+        self.client.get(TAGS_URL)
+        res = self.client.patch(SELF_USER_URL,
+                                {'password': 'newpassword123'})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+
+        res = self.client.get(TAGS_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {issue_access_token(self.user)}')
+        res = self.client.get(TAGS_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_user_deactivation_rejected(self):
+        """Tests that deactivated user stops authenticating"""
+
+        self.client.get(TAGS_URL)
+        self.user.is_active = False
+        self.user.save()
+
+        res = self.client.get(TAGS_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(ACCESS_TOKENS_ENABLED=False)
+    def test_disabled(self):
+        """Tests that access tokens are ignored unless enabled"""
+
+        res = self.client.get(TAGS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,178 @@
+import re
+import threading
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APITransactionTestCase
+
+from core import batch
+from core.models import ExpiringToken, Tag, Ingredient
+from core.tests.utils import ShortLivedConnectionsMixin
+
+
+BATCH_URL = reverse('batch')
+SELF_USER_URL = reverse('users:me')
+TAGS_URL = reverse('recipe:tag-list')
+INGREDIENTS_URL = reverse('recipe:ingredient-list')
+
+
+class BatchApiTests(ShortLivedConnectionsMixin, APITransactionTestCase):
+    """Batch Api Tests"""
+
+    def setUp(self):
+        """Sets up"""
+
+        super().setUp()
+        self.user = get_user_model().objects.create_user(
+            email='test@sample.com',
+            password='testpass123',
+            name='test',
+        )
+        token = ExpiringToken.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+        Tag.objects.create(user=self.user, name='vegan')
+        Ingredient.objects.create(user=self.user, name='salt')
+
+    def batch(self, *requests):
+        """Returns sub-responses of a successful batch"""
+
+        res = self.client.post(BATCH_URL, {'requests': list(requests)},
+                               format='json')
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res.json()['responses']
+
+    def test_startup_calls(self):
+        """Tests that independent reads are answered in order"""
+
+        me, tags, ingredients = self.batch(
+            {'path': SELF_USER_URL},
+            {'path': f'{TAGS_URL}?paginate=false'},
+            {'path': f'{INGREDIENTS_URL}?paginate=false'},
+        )
+
+        self.assertEqual(me['status'], status.HTTP_200_OK)
+        self.assertEqual(me['body']['email'], self.user.email)
+        self.assertEqual([tag['name'] for tag in tags['body']], ['vegan'])
+        self.assertEqual(
+            [item['name'] for item in ingredients['body']], ['salt'])
+        self.assertIn('ETag', tags['headers'])
+
+    def test_reads_run_concurrently(self):
+        """Tests that consecutive reads are served on pool threads"""
+
+        threads = set()
+        dispatch = batch.dispatch
+
+        def record(request, spec):
+            threads.add(threading.get_ident())
+            return dispatch(request, spec)
+
+        with patch('core.batch.dispatch', side_effect=record):
+            self.batch({'path': SELF_USER_URL}, {'path': TAGS_URL})
+
+        self.assertNotIn(threading.get_ident(), threads)
+
+    def count_queries(self, *requests):
+        """Returns query count a batch reports by Server-Timing"""
+
+        res = self.client.post(BATCH_URL, {'requests': list(requests)},
+                               format='json')
+        return int(re.search(r'desc="(\d+) queries"',
+                             res['Server-Timing']).group(1))
+
+    def test_concurrent_reads_counted(self):
+        """Tests that queries of pool threads count towards the batch"""
+
+        self.count_queries({'path': SELF_USER_URL})
+        alone = self.count_queries({'path': SELF_USER_URL})
+        concurrent = self.count_queries({'path': SELF_USER_URL},
+                                        {'path': TAGS_URL})
+
+        self.assertGreater(concurrent, alone)
+
+    def test_stale_user_not_saved_back(self):
+        """Tests that batched profile updates do not write cached fields"""
+
+        self.batch({'path': SELF_USER_URL})
+        get_user_model().objects.filter(pk=self.user.pk).update(
+            name='renamed')
+
+        me, = self.batch({'method': 'PATCH', 'path': SELF_USER_URL,
+                          'body': {'email': 'new@sample.com'}})
+
+        self.assertEqual(me['status'], status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.name, 'renamed')
+        self.assertEqual(self.user.email, 'new@sample.com')
+
+    def test_token_authenticated_once(self):
+        """Tests that sub-requests reuse authentication of the batch"""
+
+        with patch('core.authentication.CachedTokenAuthentication'
+                   '.authenticate_credentials',
+                   return_value=(self.user, None)) as authenticate:
+            self.batch({'path': SELF_USER_URL}, {'path': TAGS_URL},
+                       {'path': INGREDIENTS_URL})
+
+        authenticate.assert_called_once()
+
+    def test_writes_are_ordered(self):
+        """Tests that reads after a write see its result"""
+
+        created, listed = self.batch(
+            {'method': 'POST', 'path': TAGS_URL, 'body': {'name': 'keto'}},
+            {'path': f'{TAGS_URL}?paginate=false'},
+        )
+
+        self.assertEqual(created['status'], status.HTTP_201_CREATED)
+        self.assertEqual(sorted(tag['name'] for tag in listed['body']),
+                         ['keto', 'vegan'])
+
+    def test_sub_request_errors(self):
+        """Tests that failing sub-requests do not fail the batch"""
+
+        invalid, missing, nested, internal = self.batch(
+            {'method': 'POST', 'path': TAGS_URL, 'body': {'name': ''}},
+            {'path': '/api/missing/'},
+            {'method': 'POST', 'path': BATCH_URL},
+            {'path': reverse('metrics')},
+        )
+
+        self.assertEqual(invalid['status'], status.HTTP_400_BAD_REQUEST)
+        self.assertIn('name', invalid['body'])
+        self.assertEqual(missing['status'], status.HTTP_404_NOT_FOUND)
+        self.assertEqual(nested['status'], status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(internal['status'], status.HTTP_400_BAD_REQUEST)
+
+    def test_sub_request_headers(self):
+        """Tests that conditional headers reach sub-requests"""
+
+        listed, = self.batch({'path': TAGS_URL})
+        cached, = self.batch({'path': TAGS_URL, 'headers': {
+            'If-None-Match': listed['headers']['ETag']}})
+
+        self.assertEqual(cached['status'], status.HTTP_304_NOT_MODIFIED)
+        self.assertIsNone(cached['body'])
+
+    @override_settings(BATCH_MAX_REQUESTS=2)
+    def test_batch_size_limited(self):
+        """Tests that oversized batches are rejected"""
+
+        res = self.client.post(BATCH_URL, {'requests': [
+            {'path': TAGS_URL}] * 3}, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_login_required(self):
+        """Tests that batch requires authentication"""
+
+        self.client.credentials()
+        res = self.client.post(BATCH_URL, {'requests': [
+            {'path': SELF_USER_URL}]}, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
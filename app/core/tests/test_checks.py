@@ -0,0 +1,64 @@
+from django.core.checks import run_checks
+from django.test import SimpleTestCase, override_settings
+
+from core.checks import (
+    check_read_your_writes_cache, check_recipe_list_cache,
+)
+
+
+LOCMEM = 'django.core.cache.backends.locmem.LocMemCache'
+REDIS = 'django.core.cache.backends.redis.RedisCache'
+
+
+class RecipeListCacheCheckTests(SimpleTestCase):
+    """Recipe List Cache Check Tests"""
+
+    @override_settings(CACHES={'default': {'BACKEND': LOCMEM}},
+                       RECIPE_LIST_CACHE_ALIAS='default')
+    def test_process_local_cache(self):
+        """Tests that process local list cache is warned about"""
+
+        messages = check_recipe_list_cache(None)
+
+        self.assertEqual([message.id for message in messages],
+                         ['core.W001'])
+
+    @override_settings(CACHES={'default': {'BACKEND': LOCMEM}},
+                       RECIPE_LIST_CACHE_ALIAS='default')
+    def test_deployment_only(self):
+        """Tests that process local list cache is warned about on deploy"""
+
+        self.assertNotIn('core.W001',
+                         [message.id for message in run_checks()])
+        self.assertIn('core.W001', [
+            message.id
+            for message in run_checks(include_deployment_checks=True)])
+
+    @override_settings(CACHES={'default': {'BACKEND': LOCMEM},
+                               'shared': {'BACKEND': REDIS}},
+                       RECIPE_LIST_CACHE_ALIAS='shared')
+    def test_shared_cache(self):
+        """Tests that shared list cache passes"""
+
+        self.assertEqual(check_recipe_list_cache(None), [])
+
+
+class ReadYourWritesCacheCheckTests(SimpleTestCase):
+    """Read Your Writes Cache Check Tests"""
+
+    @override_settings(CACHES={'default': {'BACKEND': LOCMEM}},
+                       DATABASE_REPLICAS=['replica1'])
+    def test_process_local_cache(self):
+        """Tests that process local pins are warned about with replicas"""
+
+        messages = check_read_your_writes_cache(None)
+
+        self.assertEqual([message.id for message in messages],
+                         ['core.W002'])
+
+    @override_settings(CACHES={'default': {'BACKEND': LOCMEM}},
+                       DATABASE_REPLICAS=[])
+    def test_no_replicas(self):
+        """Tests that pins do not matter without replicas"""
+
+        self.assertEqual(check_read_your_writes_cache(None), [])
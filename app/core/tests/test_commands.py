@@ -1,26 +1,58 @@
 from unittest.mock import patch
 
 from django.core.management import call_command
+from django.core.management.base import CommandError
 from django.db.utils import OperationalError
 from django.test import TestCase
 
 
+CHECK_DATABASE = 'core.management.commands.wait_for_db.Command.check_database'
+
+
 class CommandTests(TestCase):
     """Command Tests"""
 
     def test_wait_for_db_ready(self):
         """Test that db is ready"""
 
-        with patch('django.db.utils.ConnectionHandler.__getitem__') as gi:
-            gi.return_value = True
+        with patch(CHECK_DATABASE) as check:
             call_command('wait_for_db')
-            self.assertEqual(gi.call_count, 1)
+            check.assert_called_once_with('default')
 
     @patch('time.sleep', return_value=True)
     def test_wait_for_db(self, ts):
         """Test that db delays to start"""
 
-        with patch('django.db.utils.ConnectionHandler.__getitem__') as gi:
-            gi.side_effect = [OperationalError] * 5 + [True]
+        with patch(CHECK_DATABASE) as check:
+            check.side_effect = [OperationalError] * 5 + [None]
+            call_command('wait_for_db')
+            self.assertEqual(check.call_count, 6)
+
+        delays = [call.args[0] for call in ts.call_args_list]
+        self.assertEqual(delays, [0.1, 0.2, 0.4, 0.8, 1.6])
+
+    @patch('time.sleep', return_value=True)
+    def test_wait_for_db_backoff_capped(self, ts):
+        """Test that backoff delay does not grow past its cap"""
+
+        with patch(CHECK_DATABASE) as check:
+            check.side_effect = [OperationalError] * 4 + [None]
+            call_command('wait_for_db', initial_delay=1, max_delay=3)
+
+        delays = [call.args[0] for call in ts.call_args_list]
+        self.assertEqual(delays, [1, 2, 3, 3])
+
+    @patch('time.sleep', return_value=True)
+    def test_wait_for_db_timeout(self, ts):
+        """Test that waiting gives up after timeout"""
+
+        with patch(CHECK_DATABASE) as check:
+            check.side_effect = OperationalError
+            with self.assertRaises(CommandError):
+                call_command('wait_for_db', timeout=0)
+
+    def test_check_database_round_trip(self):
+        """Test that check actually queries the database"""
+
+        with self.assertNumQueries(1):
             call_command('wait_for_db')
-            self.assertEqual(gi.call_count, 6)
@@ -0,0 +1,92 @@
+import random
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db.models import Count
+from django.test import SimpleTestCase, TestCase
+
+from core.datagen import SyntheticDataGenerator, skewed_counts
+from core.models import ExpiringToken, Tag, Ingredient
+
+
+class SkewedCountsTests(SimpleTestCase):
+    """Skewed Counts Tests"""
+
+    def test_counts_sum_to_total(self):
+        """Tests that no row is lost by rounding"""
+
+        counts = skewed_counts(1001, 7, 1.2, random.Random(0))
+
+        self.assertEqual(sum(counts), 1001)
+        self.assertEqual(len(counts), 7)
+
+    def test_skew(self):
+        """Tests that few heavy owners hold most rows"""
+
+        counts = sorted(skewed_counts(100000, 100, 1.5, random.Random(0)))
+
+        self.assertGreater(sum(counts[-10:]), sum(counts[:-10]))
+
+    def test_uniform(self):
+        """Tests that zero skew spreads rows evenly"""
+
+        counts = skewed_counts(100, 4, 0, random.Random(0))
+
+        self.assertEqual(counts, [25] * 4)
+
+    def test_deterministic(self):
+        """Tests that same seed draws same counts"""
+
+        self.assertEqual(skewed_counts(500, 20, 1.1, random.Random(3)),
+                         skewed_counts(500, 20, 1.1, random.Random(3)))
+
+
+class SyntheticDataGeneratorTests(TestCase):
+    """Synthetic Data Generator Tests"""
+
+    def test_generate(self):
+        """Tests that generator writes the requested dataset"""
+
+        pairs = SyntheticDataGenerator(
+            users=5, tags=3, ingredients=10, skew=1.0, batch_size=7,
+        ).generate()
+
+        self.assertEqual(len(pairs), 5)
+        self.assertEqual(ExpiringToken.objects.count(), 5)
+        self.assertEqual(Tag.objects.count(), 15)
+        self.assertEqual(Ingredient.objects.count(), 50)
+        for user, token in pairs:
+            self.assertEqual(token.user, user)
+
+    def test_deterministic(self):
+        """Tests that same seed generates same dataset"""
+
+        def dataset():
+            pairs = SyntheticDataGenerator(
+                users=4, tags=2, ingredients=8, skew=1.0, seed=7,
+            ).generate()
+            snapshot = [
+                (user.email, token.key,
+                 list(Ingredient.objects.filter(user=user).order_by(
+                     'id').values_list('name', flat=True)))
+                for user, token in pairs
+            ]
+
+            Tag.objects.all().delete()
+            Ingredient.objects.all().delete()
+            get_user_model().objects.all().delete()
+            return snapshot
+
+        self.assertEqual(dataset(), dataset())
+
+    def test_command(self):
+        """Tests that command generates data"""
+
+        out = StringIO()
+        call_command('generate_data', users=3, tags=1, ingredients=4,
+                     stdout=out)
+
+        self.assertIn('Generated 3 users', out.getvalue())
+        counts = Ingredient.objects.values('user').annotate(n=Count('id'))
+        self.assertEqual(sum(row['n'] for row in counts), 12)
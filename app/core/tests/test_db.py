@@ -0,0 +1,69 @@
+from unittest.mock import Mock, patch
+
+from django.core.signals import request_started
+from django.test import SimpleTestCase, override_settings
+
+
+def mock_connection(usable=True, opened=True):
+    """Returns mocked persistent connection"""
+
+    connection = Mock(in_atomic_block=False, health_checked_at=0)
+    connection.connection = object() if opened else None
+    connection.is_usable.return_value = usable
+    return connection
+
+
+@override_settings(DB_CONN_HEALTH_CHECKS=True,
+                   DB_CONN_HEALTH_CHECK_INTERVAL=10)
+class ConnectionHealthCheckTests(SimpleTestCase):
+    """Connection Health Check Tests"""
+
+    def send_request_started(self, *connections):
+        """Sends request started signal over given connections"""
+
+        with patch('core.db.connections') as handler:
+            handler.all.return_value = connections
+            request_started.send(sender=self.__class__)
+
+    def test_broken_connection_closed(self):
+        """Tests that unusable idle connection is closed"""
+
+        connection = mock_connection(usable=False)
+        self.send_request_started(connection)
+
+        connection.close.assert_called_once()
+
+    def test_healthy_connection_kept(self):
+        """Tests that usable connection is kept open"""
+
+        connection = mock_connection()
+        self.send_request_started(connection)
+
+        connection.is_usable.assert_called_once()
+        connection.close.assert_not_called()
+
+    def test_check_interval(self):
+        """Tests that recently checked connection is not checked again"""
+
+        connection = mock_connection()
+        self.send_request_started(connection)
+        self.send_request_started(connection)
+
+        connection.is_usable.assert_called_once()
+
+    def test_closed_connection_skipped(self):
+        """Tests that connections not opened yet are not touched"""
+
+        connection = mock_connection(opened=False)
+        self.send_request_started(connection)
+
+        connection.is_usable.assert_not_called()
+
+    @override_settings(DB_CONN_HEALTH_CHECKS=False)
+    def test_disabled(self):
+        """Tests that health checks can be switched off"""
+
+        connection = mock_connection(usable=False)
+        self.send_request_started(connection)
+
+        connection.is_usable.assert_not_called()
@@ -0,0 +1,132 @@
+from unittest import skipUnless
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import connections
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITransactionTestCase
+
+from core import db_router
+from core.db_router import PrimaryReplicaRouter
+from core.models import Tag
+
+
+TAGS_URL = reverse('recipe:tag-list')
+SELF_USER_URL = reverse('users:me')
+LOCMEM = 'django.core.cache.backends.locmem.LocMemCache'
+
+
+class PrimaryReplicaRouterTests(TestCase):
+    """Primary Replica Router Tests"""
+
+    def setUp(self):
+        """Sets up"""
+
+        self.router = PrimaryReplicaRouter()
+
+    def test_reads_default_to_primary(self):
+        """Tests that reads outside routed context are not routed"""
+
+        self.assertIsNone(self.router.db_for_read(Tag))
+
+    def test_routed_reads(self):
+        """Tests that reads within routed context go to its alias"""
+
+        with db_router.read_from('replica1'):
+            self.assertEqual(self.router.db_for_read(Tag), 'replica1')
+            self.assertEqual(self.router.db_for_write(Tag), 'default')
+
+        self.assertIsNone(self.router.db_for_read(Tag))
+
+    @override_settings(DATABASE_REPLICAS=['replica1'])
+    def test_replicas_not_migrated(self):
+        """Tests that replicas are left to replication"""
+
+        self.assertFalse(self.router.allow_migrate('replica1', 'core'))
+        self.assertIsNone(self.router.allow_migrate('default', 'core'))
+
+
+@skipUnless('replica1' in settings.DATABASES,
+            'replica1 is configured by app.test_settings')
+@override_settings(DATABASE_REPLICAS=['replica1'],
+                   DB_READ_YOUR_WRITES_WINDOW=30)
+class ReplicaRoutingViewTests(APITransactionTestCase):
+    """Replica Routing View Tests, replica1 mirrors the test database"""
+
+    databases = {'default', 'replica1'}
+
+    def setUp(self):
+        """Sets up"""
+
+        db_router.get_pin_cache().clear()
+        self.user = get_user_model().objects.create_user(
+            email='test@sample.com',
+            password='testpass123',
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def get_tags(self):
+        """Returns tag list and queries run on each alias"""
+
+        with CaptureQueriesContext(connections['default']) as primary, \
+                CaptureQueriesContext(connections['replica1']) as replica:
+            res = self.client.get(TAGS_URL, {'paginate': 'false'})
+
+        return res, len(primary), len(replica)
+
+    def test_safe_requests_read_replica(self):
+        """Tests that list reads are served by replica"""
+
+        Tag.objects.create(user=self.user, name='vegan')
+
+        res, primary, replica = self.get_tags()
+
+        self.assertEqual([tag['name'] for tag in res.data], ['vegan'])
+        self.assertGreater(replica, 0)
+        self.assertEqual(primary, 0)
+
+    def test_write_pins_user_to_primary(self):
+        """Tests that user reads stick to primary after a write"""
+
+        self.client.post(TAGS_URL, {'name': 'vegan'})
+
+        res, primary, replica = self.get_tags()
+
+        self.assertEqual([tag['name'] for tag in res.data], ['vegan'])
+        self.assertGreater(primary, 0)
+        self.assertEqual(replica, 0)
+
+    def test_user_update_pins_user_to_primary(self):
+        """Tests that user updates pin user to primary"""
+
+        self.client.patch(SELF_USER_URL, {'name': 'new name'})
+
+        self.assertTrue(db_router.is_pinned(self.user))
+
+    def test_pin_is_per_user(self):
+        """Tests that pinning one user keeps others on replicas"""
+
+        other_user = get_user_model().objects.create_user(
+            email='other@sample.com',
+            password='testpass123',
+        )
+        db_router.pin_to_primary(other_user)
+
+        self.assertEqual(db_router.choose_read_alias(self.user), 'replica1')
+        self.assertIsNone(db_router.choose_read_alias(other_user))
+
+    @override_settings(
+        CACHES={'default': {'BACKEND': LOCMEM, 'LOCATION': 'default'},
+                'pins': {'BACKEND': LOCMEM, 'LOCATION': 'pins'}},
+        DB_READ_YOUR_WRITES_CACHE_ALIAS='pins')
+    def test_pin_cache_alias(self):
+        """Tests that pins are kept in the configured cache"""
+
+        db_router.pin_to_primary(self.user)
+
+        self.assertTrue(caches['pins'].get(db_router.pin_key(self.user.pk)))
+        self.assertIsNone(
+            caches['default'].get(db_router.pin_key(self.user.pk)))
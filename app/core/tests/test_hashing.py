@@ -0,0 +1,157 @@
+import threading
+import time
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.hashing import (
+    HashingExecutor, HashingOverloaded, get_hashing_executor,
+)
+
+
+TOKEN_URL = reverse('users:token')
+
+
+class HashingExecutorTests(SimpleTestCase):
+    """Hashing Executor Tests"""
+
+    def setUp(self):
+        """Sets up"""
+
+        self.executor = HashingExecutor(max_workers=1, max_queue=0,
+                                        timeout=5, retry_after=3)
+        self.addCleanup(self.executor.shutdown)
+
+    def block_worker(self, executor=None):
+        """Occupies the only worker until returned event is set"""
+
+        executor = executor or self.executor
+
+        started, release = threading.Event(), threading.Event()
+
+        def blocking():
+            started.set()
+            release.wait(5)
+
+        thread = threading.Thread(target=executor.run, args=(blocking,))
+        thread.start()
+        started.wait(5)
+        self.addCleanup(thread.join)
+        self.addCleanup(release.set)
+        return release
+
+    def test_runs_on_worker(self):
+        """Tests that function runs off the calling thread"""
+
+        name = self.executor.run(lambda: threading.current_thread().name)
+
+        self.assertTrue(name.startswith('password-hashing'))
+
+    def test_nested_run_inline(self):
+        """Tests that nested calls do not wait for another worker"""
+
+        result = self.executor.run(self.executor.run, lambda: 'nested')
+
+        self.assertEqual(result, 'nested')
+
+    def test_sheds_load_when_full(self):
+        """Tests that calls beyond workers and queue are rejected"""
+
+        self.block_worker()
+
+        with self.assertRaises(HashingOverloaded) as context:
+            self.executor.run(lambda: None)
+
+        self.assertEqual(context.exception.wait, 3)
+
+    def test_queued_when_busy(self):
+        """Tests that calls within the queue wait for a worker"""
+
+        executor = HashingExecutor(max_workers=1, max_queue=1,
+                                   timeout=5, retry_after=1)
+        self.addCleanup(executor.shutdown)
+        release = self.block_worker(executor)
+
+        results = []
+        thread = threading.Thread(
+            target=lambda: results.append(executor.run(lambda: 'queued')))
+        thread.start()
+        deadline = time.monotonic() + 5
+        while executor.pending < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(executor.pending, 2)
+
+        release.set()
+        thread.join(5)
+
+        self.assertEqual(results, ['queued'])
+
+    def test_timeout(self):
+        """Tests that slow results are given up on"""
+
+        executor = HashingExecutor(max_workers=1, max_queue=1,
+                                   timeout=0.01, retry_after=1)
+        self.addCleanup(executor.shutdown)
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        with self.assertRaises(HashingOverloaded):
+            executor.run(release.wait, 5)
+
+
+class PasswordHashingTests(TestCase):
+    """Password Hashing Tests"""
+
+    @override_settings(PASSWORD_PBKDF2_ITERATIONS=1000)
+    def test_configurable_cost(self):
+        """Tests that hasher cost comes from settings"""
+
+        self.assertIn('$1000$', make_password('password'))
+
+    def test_rehash_on_cost_change(self):
+        """Tests that login rehashes passwords of outdated cost"""
+
+        with override_settings(PASSWORD_PBKDF2_ITERATIONS=1000):
+            user = get_user_model().objects.create_user(
+                email='test@sample.com', password='testpass123')
+
+        with override_settings(PASSWORD_PBKDF2_ITERATIONS=2000):
+            self.assertTrue(user.check_password('testpass123'))
+            user.refresh_from_db()
+            self.assertIn('$2000$', user.password)
+
+    @override_settings(PASSWORD_HASHING_MAX_WORKERS=1,
+                       PASSWORD_HASHING_MAX_QUEUE=0,
+                       PASSWORD_HASHING_RETRY_AFTER=2)
+    def test_token_sheds_load(self):
+        """Tests that overloaded hashing answers 503 with Retry-After"""
+
+        get_user_model().objects.create_user(
+            email='test@sample.com', password='testpass123')
+
+        started, release = threading.Event(), threading.Event()
+
+        def blocking():
+            started.set()
+            release.wait(5)
+
+        executor = get_hashing_executor()
+        thread = threading.Thread(target=executor.run, args=(blocking,))
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(release.set)
+        started.wait(5)
+
+        res = APIClient().post(TOKEN_URL, {
+            'email': 'test@sample.com',
+            'password': 'testpass123',
+        })
+
+        self.assertEqual(res.status_code,
+                         status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(res['Retry-After'], '2')
+        self.assertEqual(res.data['detail'].code, 'hashing_overloaded')
@@ -0,0 +1,89 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import resolve, reverse
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.instrumentation import capture_queries, get_query_budget
+from core.models import Tag
+
+
+TAGS_URL = reverse('recipe:tag-list')
+ME_URL = reverse('users:me')
+
+
+class QueryInstrumentationTests(TestCase):
+    """Query Instrumentation Tests"""
+
+    def test_capture_queries(self):
+        """Tests that queries within the block are counted"""
+
+        with capture_queries() as stats:
+            list(Tag.objects.all())
+            list(Tag.objects.all())
+
+        self.assertEqual(stats.count, 2)
+        self.assertIn('core_tag', stats.slowest_sql)
+        self.assertGreaterEqual(stats.duration, stats.slowest_duration)
+
+    def test_viewset_budget_by_action(self):
+        """Tests that viewset budgets are looked up by action"""
+
+        match = resolve(TAGS_URL)
+
+        self.assertEqual(get_query_budget(match, 'GET'), 2)
+        self.assertEqual(get_query_budget(match, 'POST'), 2)
+
+    def test_view_budget_by_method(self):
+        """Tests that plain view budgets are looked up by handler"""
+
+        match = resolve(ME_URL)
+
+        self.assertEqual(get_query_budget(match, 'GET'), 2)
+        self.assertIsNone(get_query_budget(match, 'DELETE'))
+
+
+class QueryInstrumentationMiddlewareTests(APITestCase):
+    """Query Instrumentation Middleware Tests"""
+
+    def setUp(self):
+        """Sets up"""
+
+        self.user = get_user_model().objects.create_user(
+            email='test@sample.com',
+            password='testpass123',
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def test_server_timing_header(self):
+        """Tests that database time is reported by Server-Timing"""
+
+        res = self.client.get(TAGS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn('db;dur=', res['Server-Timing'])
+        self.assertIn(f'"{res.wsgi_request.query_stats.count} queries"',
+                      res['Server-Timing'])
+
+    @override_settings(QUERY_SERVER_TIMING=False)
+    def test_server_timing_disabled(self):
+        """Tests that Server-Timing header can be turned off"""
+
+        res = self.client.get(TAGS_URL)
+
+        self.assertFalse(res.has_header('Server-Timing'))
+
+    def test_over_budget_logged(self):
+        """Tests that requests exceeding their budget log a warning"""
+
+        with self.settings(RECIPE_LIST_CACHE_TIMEOUT=0), \
+                self.assertLogs('core.queries', 'WARNING') as logs, \
+                mock.patch.object(resolve(TAGS_URL).func.cls,
+                                  'query_budgets', {'list': 0}):
+            self.client.get(TAGS_URL)
+
+        self.assertEqual(logs.records[0].db_query_budget, 0)
+        self.assertGreater(logs.records[0].db_queries, 0)
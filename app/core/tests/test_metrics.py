@@ -0,0 +1,182 @@
+import threading
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core import metrics
+from core.metrics import Registry
+
+
+METRICS_URL = reverse('metrics')
+TAGS_URL = reverse('recipe:tag-list')
+
+
+class RegistryTests(SimpleTestCase):
+    """Metrics Registry Tests"""
+
+    def setUp(self):
+        """Sets up"""
+
+        self.registry = Registry()
+        self.requests = self.registry.counter(
+            'requests_total', 'Requests.', ('view',))
+        self.latency = self.registry.histogram(
+            'latency_seconds', 'Latency.', ('view',), buckets=(0.1, 1.0))
+
+    def test_counter_merged_over_threads(self):
+        """Tests that samples of every thread shard are summed"""
+
+        def work():
+            for _ in range(1000):
+                self.requests.inc(('a',))
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        counters, _ = self.registry.collect()
+
+        self.assertEqual(counters[('requests_total', ('a',))], 4000)
+
+    def test_finished_thread_shards_retired(self):
+        """Tests that shards of finished threads are folded on collect"""
+
+        def work():
+            self.requests.inc(('a',))
+            self.latency.observe(0.5, ('a',))
+
+        for _ in range(50):
+            thread = threading.Thread(target=work)
+            thread.start()
+            thread.join()
+        work()
+
+        counters, histograms = self.registry.collect()
+
+        self.assertEqual(len(self.registry.shards), 1)
+        self.assertEqual(counters[('requests_total', ('a',))], 51)
+        self.assertEqual(histograms[('latency_seconds', ('a',))][1], 51)
+
+        counters, _ = self.registry.collect()
+        self.assertEqual(counters[('requests_total', ('a',))], 51)
+
+    def test_render_histogram(self):
+        """Tests that histograms render cumulative buckets"""
+
+        for value in (0.05, 0.5, 0.5, 3):
+            self.latency.observe(value, ('a',))
+
+        text = self.registry.render()
+
+        self.assertIn('# TYPE latency_seconds histogram', text)
+        self.assertIn('latency_seconds_bucket{view="a",le="0.1"} 1', text)
+        self.assertIn('latency_seconds_bucket{view="a",le="1.0"} 3', text)
+        self.assertIn('latency_seconds_bucket{view="a",le="+Inf"} 4', text)
+        self.assertIn('latency_seconds_sum{view="a"} 4.05', text)
+        self.assertIn('latency_seconds_count{view="a"} 4', text)
+
+    def test_render_escapes_labels(self):
+        """Tests that label values are escaped"""
+
+        self.requests.inc(('say "hi"\n',))
+
+        self.assertIn(r'requests_total{view="say \"hi\"\n"} 1',
+                      self.registry.render())
+
+    def test_duplicate_metric(self):
+        """Tests that metric names are unique"""
+
+        with self.assertRaises(ValueError):
+            self.registry.counter('requests_total', 'Again.')
+
+
+class MetricsApiTests(APITestCase):
+    """Metrics Middleware and Endpoint Tests"""
+
+    def setUp(self):
+        """Sets up"""
+
+        metrics.registry.clear()
+        self.user = get_user_model().objects.create_user(
+            email='test@sample.com',
+            password='testpass123',
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def test_request_labelled_by_view_name(self):
+        """Tests that requests are recorded by resolved URL name"""
+
+        self.client.get(TAGS_URL)
+        self.client.get(TAGS_URL)
+
+        counters, histograms = metrics.registry.collect()
+        labels = ('recipe:tag-list', 'GET')
+
+        self.assertEqual(
+            counters[('http_requests_total', labels + ('200',))], 2)
+        latency = histograms[('http_request_duration_seconds', labels)]
+        self.assertEqual(sum(latency[:-1]), 2)
+        self.assertIn(('http_response_size_bytes', labels), histograms)
+        self.assertIn(('http_request_db_duration_seconds', labels),
+                      histograms)
+
+    def test_unresolved_requests(self):
+        """Tests that unknown paths share a single label"""
+
+        self.client.get('/no/such/path/')
+
+        counters, _ = metrics.registry.collect()
+
+        self.assertEqual(counters[(
+            'http_requests_total', ('<unresolved>', 'GET', '404'))], 1)
+
+    @override_settings(METRICS_ALLOWED_IPS=['127.0.0.1'])
+    def test_metrics_endpoint(self):
+        """Tests that metrics are exposed in Prometheus format"""
+
+        self.client.get(TAGS_URL)
+        res = self.client.get(METRICS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res['Content-Type'].startswith('text/plain'))
+        self.assertIn(
+            b'http_requests_total{view="recipe:tag-list",method="GET",'
+            b'status="200"} 1', res.content)
+
+    @override_settings(METRICS_ALLOWED_IPS=['10.0.0.0/8'])
+    def test_metrics_endpoint_allowlist(self):
+        """Tests that metrics are hidden from other addresses"""
+
+        res = self.client.get(METRICS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+        res = self.client.get(METRICS_URL, REMOTE_ADDR='10.1.2.3')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_metrics_endpoint_denied_by_default(self):
+        """Tests that metrics are hidden unless access is configured"""
+
+        res = self.client.get(METRICS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    @override_settings(METRICS_TOKEN='secret')
+    def test_metrics_endpoint_token(self):
+        """Tests that metrics are served to holders of the token"""
+
+        res = self.client.get(METRICS_URL, HTTP_AUTHORIZATION='Bearer wrong')
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+        res = self.client.get(METRICS_URL,
+                              HTTP_AUTHORIZATION='Bearer secret')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
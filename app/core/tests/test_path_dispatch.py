@@ -0,0 +1,63 @@
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from rest_framework import status
+
+
+CREATE_USERS_URL = reverse('users:create')
+ADMIN_URL = reverse('admin:index')
+ADMIN_LOGIN_URL = reverse('admin:login')
+
+
+class PathDispatchMiddlewareTests(TestCase):
+    """Path Dispatch Middleware Tests"""
+
+    def setUp(self):
+        """Sets up"""
+
+        self.client = Client(enforce_csrf_checks=True)
+
+    def test_api_skips_browser_middleware(self):
+        """Tests that API requests get no session, user or messages"""
+
+        res = self.client.get(CREATE_USERS_URL)
+
+        request = res.wsgi_request
+        self.assertFalse(hasattr(request, 'session'))
+        self.assertFalse(hasattr(request, '_messages'))
+        self.assertNotIn('sessionid', res.cookies)
+
+    def test_api_skips_csrf(self):
+        """Tests that API posts are not CSRF checked"""
+
+        res = self.client.post(CREATE_USERS_URL, {
+            'email': 'test@sample.com',
+            'password': 'testpass123',
+            'name': 'test',
+        })
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+    def test_admin_keeps_csrf(self):
+        """Tests that admin posts are still CSRF checked"""
+
+        res = self.client.post(ADMIN_LOGIN_URL, {
+            'username': 'admin@sample.com',
+            'password': 'testpass123',
+        })
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_admin_keeps_session(self):
+        """Tests that admin requests are session authenticated"""
+
+        user = get_user_model().objects.create_superuser(
+            'admin@sample.com', 'testpass123')
+        self.client.force_login(user)
+
+        res = self.client.get(ADMIN_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.wsgi_request.user, user)
+        self.assertTrue(hasattr(res.wsgi_request, '_messages'))
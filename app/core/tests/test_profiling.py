@@ -0,0 +1,107 @@
+import shutil
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models import ExpiringToken
+from core.profiling import list_profiles
+
+
+TAGS_URL = reverse('recipe:tag-list')
+
+
+class ProfilingTests(APITestCase):
+    """Profiling Middleware Tests"""
+
+    def setUp(self):
+        """Sets up"""
+
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        settings = override_settings(PROFILING_ENABLED=True,
+                                     PROFILING_DIR=self.directory)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+        self.staff = get_user_model().objects.create_user(
+            email='staff@sample.com',
+            password='testpass123',
+            is_staff=True,
+        )
+        self.user = get_user_model().objects.create_user(
+            email='test@sample.com',
+            password='testpass123',
+        )
+
+    def get_tags(self, user, **headers):
+        """Requests tags with token of the given user"""
+
+        token = ExpiringToken.objects.create(user=user)
+        return self.client.get(TAGS_URL, HTTP_AUTHORIZATION=f'Token {token}',
+                               **headers)
+
+    def test_staff_request_profiled(self):
+        """Tests that staff requests with profiling header are profiled"""
+
+        res = self.get_tags(self.staff, HTTP_X_PROFILE='1')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        profiles = list_profiles()
+        self.assertEqual(len(profiles), 1)
+        self.assertEqual(profiles[0]['name'], res['X-Profile'])
+        self.assertEqual(profiles[0]['view'], 'recipe.tag-list')
+
+    def test_non_staff_request_not_profiled(self):
+        """Tests that profiling header is ignored for other users"""
+
+        res = self.get_tags(self.user, HTTP_X_PROFILE='1')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertFalse(res.has_header('X-Profile'))
+        self.assertEqual(list_profiles(), [])
+
+    def test_sampled_request_profiled(self):
+        """Tests that sampled requests are profiled without header"""
+
+        with self.settings(PROFILING_SAMPLE_RATE=1):
+            res = self.get_tags(self.user)
+
+        self.assertEqual(len(list_profiles()), 1)
+        self.assertFalse(res.has_header('X-Profile'))
+
+    def test_sampled_staff_request_named(self):
+        """Tests that sampled staff requests are told their profile"""
+
+        with self.settings(PROFILING_SAMPLE_RATE=1):
+            res = self.get_tags(self.staff)
+
+        self.assertEqual(list_profiles()[0]['name'], res['X-Profile'])
+
+    def test_profiles_pruned(self):
+        """Tests that only the newest profiles are kept"""
+
+        with self.settings(PROFILING_SAMPLE_RATE=1, PROFILING_MAX_FILES=1):
+            self.get_tags(self.user)
+            self.client.get(TAGS_URL)
+
+        self.assertEqual(len(list_profiles()), 1)
+
+    def test_profiles_command(self):
+        """Tests that profiles are listed and summarized"""
+
+        name = self.get_tags(self.staff, HTTP_X_PROFILE='1')['X-Profile']
+
+        out = StringIO()
+        call_command('profiles', stdout=out)
+        self.assertIn(name, out.getvalue())
+
+        out = StringIO()
+        call_command('profiles', 'latest', stdout=out)
+        self.assertIn('function calls', out.getvalue())
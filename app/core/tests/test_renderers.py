@@ -0,0 +1,133 @@
+import datetime
+import json
+import uuid
+from decimal import Decimal
+from io import BytesIO
+
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ErrorDetail, ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from core.parsers import FastJSONParser, MessagePackParser
+from core.renderers import FastJSONRenderer, MessagePackRenderer
+
+
+SAMPLE = {
+    'id': 1,
+    'name': 'crème brûlée \u2028 line \u2029 paragraph "quoted" \\',
+    'created': datetime.datetime(2022, 3, 4, 5, 6, 7, 123456,
+                                 tzinfo=datetime.timezone.utc),
+    'date': datetime.date(2022, 3, 4),
+    'time': datetime.time(5, 6, 7, 890),
+    'duration': datetime.timedelta(seconds=90),
+    'price': Decimal('1.10'),
+    'uuid': uuid.UUID('12345678123456781234567812345678'),
+    'lazy': gettext_lazy('This field is required.'),
+    'errors': [ErrorDetail('Invalid', code='invalid')],
+    'nested': {1: [1.5, None, True, False], 'empty': {}},
+    'big': 2 ** 70,
+}
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    """Fast JSON Renderer Tests"""
+
+    def test_same_output(self):
+        """Tests that output of sample data matches DRF JSON renderer"""
+
+        self.assertEqual(FastJSONRenderer().render(SAMPLE),
+                         JSONRenderer().render(SAMPLE))
+
+    def test_same_list_output(self):
+        """Tests that list payloads match DRF JSON renderer"""
+
+        data = [{'id': i, 'name': f'tag {i}'} for i in range(100)]
+
+        self.assertEqual(FastJSONRenderer().render(data),
+                         JSONRenderer().render(data))
+
+    def test_equivalent_floats(self):
+        """Tests that floats written differently parse to the same value"""
+
+        data = {'small': 1e-07, 'large': 1e22, 'plain': 0.1}
+
+        self.assertEqual(json.loads(FastJSONRenderer().render(data)),
+                         json.loads(JSONRenderer().render(data)))
+
+    def test_indented_output(self):
+        """Tests that indented output is delegated to DRF"""
+
+        media_type = 'application/json; indent=4'
+
+        self.assertEqual(
+            FastJSONRenderer().render(SAMPLE, media_type),
+            JSONRenderer().render(SAMPLE, media_type))
+
+    def test_none(self):
+        """Tests that no data renders empty body"""
+
+        self.assertEqual(FastJSONRenderer().render(None), b'')
+
+
+class FastJSONParserTests(SimpleTestCase):
+    """Fast JSON Parser Tests"""
+
+    def test_same_data(self):
+        """Tests that parsed data matches DRF JSON parser"""
+
+        body = JSONRenderer().render(SAMPLE)
+
+        self.assertEqual(FastJSONParser().parse(BytesIO(body)),
+                         JSONParser().parse(BytesIO(body)))
+
+    def test_invalid_body(self):
+        """Tests that malformed body raises parse error"""
+
+        with self.assertRaises(ParseError):
+            FastJSONParser().parse(BytesIO(b'{"name": '))
+
+    def test_other_encoding(self):
+        """Tests that non UTF-8 bodies are decoded by DRF parser"""
+
+        body = '{"name": "crème"}'.encode('latin-1')
+
+        data = FastJSONParser().parse(BytesIO(body),
+                                      parser_context={'encoding': 'latin-1'})
+
+        self.assertEqual(data, {'name': 'crème'})
+
+
+class MessagePackTests(SimpleTestCase):
+    """MessagePack Renderer and Parser Tests"""
+
+    def test_round_trip(self):
+        """Tests that msgpack round trip yields the JSON data"""
+
+        # Integer keys and integers beyond 64 bits have no JSON equivalent
+        # in MessagePack.
+        sample = {key: value for key, value in SAMPLE.items()
+                  if key not in ('nested', 'big')}
+
+        body = MessagePackRenderer().render(sample)
+        data = MessagePackParser().parse(BytesIO(body))
+
+        expected = JSONParser().parse(BytesIO(JSONRenderer().render(sample)))
+        self.assertEqual(data, expected)
+
+    def test_smaller_than_json(self):
+        """Tests that msgpack list bodies are smaller than JSON"""
+
+        data = [{'id': i, 'name': f'ingredient {i}'} for i in range(1000)]
+
+        packed = MessagePackRenderer().render(data)
+        rendered = JSONRenderer().render(data)
+
+        self.assertLess(len(packed), len(rendered) * 0.9)
+
+    def test_invalid_body(self):
+        """Tests that malformed body raises parse error"""
+
+        with self.assertRaises(ParseError):
+            MessagePackParser().parse(BytesIO(b'\x81\xa4name'))
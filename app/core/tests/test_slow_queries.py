@@ -0,0 +1,153 @@
+import threading
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, skipUnlessDBFeature
+from django.urls import reverse
+
+from rest_framework.test import APITestCase, APITransactionTestCase
+
+from core import slow_queries
+from core.instrumentation import QueryStats
+from core.models import Tag
+
+
+TAGS_URL = reverse('recipe:tag-list')
+
+
+def is_instrumented():
+    """Returns whether default connection logs slow queries"""
+
+    return any(isinstance(wrapper, slow_queries.SlowQueryLogger)
+               for wrapper in connection.execute_wrappers)
+
+
+class SlowQueryLogTests(TestCase):
+    """Slow Query Log Tests"""
+
+    def enabled(self, **kwargs):
+        """Returns context logging every query"""
+
+        kwargs.setdefault('SLOW_QUERY_THRESHOLD_MS', 0)
+        return self.settings(SLOW_QUERY_LOG=True, **kwargs)
+
+    def test_toggled_by_setting(self):
+        """Tests that connections are instrumented only while enabled"""
+
+        self.assertFalse(is_instrumented())
+
+        with self.enabled():
+            self.assertTrue(is_instrumented())
+
+        self.assertFalse(is_instrumented())
+
+    def test_select_logged_with_plan(self):
+        """Tests that slow SELECT is logged along with its plan"""
+
+        with self.enabled(), \
+                self.assertLogs('core.slow_queries', 'WARNING') as logs:
+            list(Tag.objects.filter(name='vegan'))
+            slow_queries.flush()
+
+        record = logs.records[0]
+        self.assertIn('core_tag', record.sql)
+        self.assertEqual(record.params_fingerprint,
+                         slow_queries.fingerprint(('vegan',)))
+        self.assertTrue(record.plan)
+
+    @skipUnlessDBFeature('has_select_for_update')
+    def test_locking_select_not_run(self):
+        """Tests that plans of locking SELECT are captured without running"""
+
+        Tag.objects.create(
+            user=get_user_model().objects.create_user(
+                email='test@sample.com',
+                password='testpass123',
+            ),
+            name='vegan',
+        )
+
+        with self.enabled(), \
+                self.assertLogs('core.slow_queries', 'WARNING') as logs:
+            list(Tag.objects.select_for_update().filter(name='vegan'))
+            slow_queries.flush()
+
+        record, = [record for record in logs.records
+                   if 'FOR UPDATE' in record.sql]
+        self.assertTrue(record.plan)
+        self.assertNotIn('actual time', record.plan)
+
+    def test_explain_disabled(self):
+        """Tests that plans are not captured when disabled"""
+
+        with self.enabled(SLOW_QUERY_EXPLAIN=False), \
+                self.assertLogs('core.slow_queries', 'WARNING') as logs:
+            list(Tag.objects.all())
+
+        self.assertFalse(hasattr(logs.records[0], 'plan'))
+
+    def test_sampled_out(self):
+        """Tests that queries outside the sample are not logged"""
+
+        with self.enabled(SLOW_QUERY_SAMPLE_RATE=0), \
+                self.assertNoLogs('core.slow_queries', 'WARNING'):
+            list(Tag.objects.all())
+
+    def test_fast_queries_ignored(self):
+        """Tests that queries below threshold are not logged"""
+
+        with self.enabled(SLOW_QUERY_THRESHOLD_MS=60000), \
+                self.assertNoLogs('core.slow_queries', 'WARNING'):
+            list(Tag.objects.all())
+
+
+class SlowQueryViewTests(APITestCase):
+    """Slow Query Calling View Tests"""
+
+    def test_calling_view_logged(self):
+        """Tests that queries are attributed to the calling view"""
+
+        user = get_user_model().objects.create_user(
+            email='test@sample.com',
+            password='testpass123',
+        )
+        self.client.force_authenticate(user=user)
+
+        with self.settings(SLOW_QUERY_LOG=True, SLOW_QUERY_THRESHOLD_MS=0), \
+                self.assertLogs('core.slow_queries', 'WARNING') as logs:
+            self.client.get(TAGS_URL)
+            slow_queries.flush()
+
+        self.assertIn('recipe:tag-list',
+                      [record.view for record in logs.records])
+
+
+class SlowQueryConnectionTests(APITransactionTestCase):
+    """Slow Query Log Tests of connections opened within requests"""
+
+    def test_connection_opened_in_request(self):
+        """Tests that request instrumentation leaves the logger in place"""
+
+        user = get_user_model().objects.create_user(
+            email='test@sample.com',
+            password='testpass123',
+        )
+        self.client.force_authenticate(user=user)
+
+        wrappers = []
+
+        def request():
+            # Connection of a new thread opens within the request.
+            self.client.get(TAGS_URL)
+            wrappers.extend(connection.execute_wrappers)
+            connection.close()
+
+        with self.settings(SLOW_QUERY_LOG=True):
+            thread = threading.Thread(target=request)
+            thread.start()
+            thread.join()
+
+        self.assertTrue(any(isinstance(wrapper, slow_queries.SlowQueryLogger)
+                            for wrapper in wrappers))
+        self.assertFalse(any(isinstance(wrapper, QueryStats)
+                             for wrapper in wrappers))
@@ -0,0 +1,104 @@
+import re
+
+from django.db import connections
+
+from core.instrumentation import get_query_budget
+
+
+POSTGRES_INDEX_SCAN = re.compile(r'\b(Index Only Scan|Index Scan)\b')
+POSTGRES_FORBIDDEN = re.compile(r'\b(Seq Scan|Sort)\b(?! Key)')
+SQLITE_INDEX_SCAN = re.compile(r'\bUSING (COVERING )?INDEX\b')
+SQLITE_FORBIDDEN = re.compile(r'\b(SCAN \w+$|USE TEMP B-TREE)')
+POSTGRES_INDEX_COND = r'Index Cond: .*\b{column}\b'
+SQLITE_INDEX_COND = r'USING (COVERING )?INDEX \w+ \(.*\b{column}[<>=]'
+
+
+class QueryPlanAssertionsMixin:
+    """Query Plan Assertions for test cases"""
+
+    def explain(self, queryset):
+        """Returns plan of the given queryset on its database"""
+
+        connection = connections[queryset.db]
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                # Tiny test tables are cheaper to scan sequentially or to
+                # sort after a narrower index scan, and their statistics
+                # depend on what earlier tests inserted, so the planner is
+                # pinned to the plan it would pick at scale.
+                cursor.execute('SET LOCAL enable_seqscan = off')
+                cursor.execute('SET LOCAL enable_sort = off')
+
+        return queryset.explain()
+
+    def assertUsesIndex(self, queryset, index_name=None):
+        """Asserts that queryset is served by an index without sorting"""
+
+        vendor = connections[queryset.db].vendor
+        if vendor == 'postgresql':
+            expected, forbidden = POSTGRES_INDEX_SCAN, POSTGRES_FORBIDDEN
+        elif vendor == 'sqlite':
+            expected, forbidden = SQLITE_INDEX_SCAN, SQLITE_FORBIDDEN
+        else:
+            self.skipTest(f'No query plan rules for {vendor}')
+
+        plan = self.explain(queryset)
+        message = f'Unexpected plan:\n{plan}'
+
+        self.assertRegex(plan, expected, message)
+        for line in plan.splitlines():
+            self.assertNotRegex(line, forbidden, message)
+        if index_name:
+            self.assertIn(index_name, plan, message)
+
+    def assertSeeks(self, queryset, column):
+        """
+        Asserts that queryset seeks its index by column, rather than
+        filtering the rows it scans.
+        """
+
+        vendor = connections[queryset.db].vendor
+        if vendor == 'postgresql':
+            pattern = POSTGRES_INDEX_COND
+        elif vendor == 'sqlite':
+            pattern = SQLITE_INDEX_COND
+        else:
+            self.skipTest(f'No query plan rules for {vendor}')
+
+        plan = self.explain(queryset)
+        self.assertRegex(plan, pattern.format(column=re.escape(column)),
+                         f'Unexpected plan:\n{plan}')
+
+
+class QueryBudgetAssertionsMixin:
+    """Query Budget Assertions for API test cases"""
+
+    def assertWithinQueryBudget(self, response):
+        """Asserts that request stayed within its view query budget"""
+
+        request = response.wsgi_request
+        budget = get_query_budget(request.resolver_match, request.method)
+        self.assertIsNotNone(
+            budget, f'No query budget for {request.method} {request.path}')
+        self.assertLessEqual(
+            request.query_stats.count, budget,
+            f'{request.method} {request.path} ran '
+            f'{request.query_stats.count} queries, budget is {budget}')
+
+
+class ShortLivedConnectionsMixin:
+    """
+    Runs test case with CONN_MAX_AGE of 0, so that connections of worker
+    threads are closed once their work is done and do not outlive the test
+    database.
+    """
+
+    def setUp(self):
+        """Sets up"""
+
+        super().setUp()
+        for alias in connections:
+            settings_dict = connections.settings[alias]
+            self.addCleanup(settings_dict.__setitem__, 'CONN_MAX_AGE',
+                            settings_dict['CONN_MAX_AGE'])
+            settings_dict['CONN_MAX_AGE'] = 0
@@ -0,0 +1,84 @@
+import ipaddress
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.http import require_GET
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core import metrics as core_metrics
+from core.authentication import (
+    AccessTokenAuthentication, CachedTokenAuthentication,
+)
+from core.batch import run_batch
+from core.serializers import BatchSerializer
+
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def is_allowed_ip(address):
+    """Returns whether address may read internal endpoints."""
+
+    try:
+        address = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+
+    for allowed in getattr(settings, 'METRICS_ALLOWED_IPS', []):
+        try:
+            if address in ipaddress.ip_network(allowed, strict=False):
+                return True
+        except ValueError:
+            continue
+
+    return False
+
+
+def has_metrics_token(request):
+    """Returns whether request carries the configured metrics token."""
+
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if not token:
+        return False
+
+    header = request.META.get('HTTP_AUTHORIZATION', '')
+    return constant_time_compare(header, f'Bearer {token}')
+
+
+@require_GET
+def metrics(request):
+    """
+    Returns metrics of this process in Prometheus text format, to holders
+    of the metrics token or allowed addresses only.
+    """
+
+    if not has_metrics_token(request) and \
+            not is_allowed_ip(request.META.get('REMOTE_ADDR', '')):
+        raise Http404
+
+    return HttpResponse(core_metrics.registry.render(),
+                        content_type=PROMETHEUS_CONTENT_TYPE)
+
+
+class BatchView(APIView):
+    """
+    Batch View, dispatching many API sub-requests in process under a
+    token authenticated once for all of them.
+    """
+
+    authentication_classes = (CachedTokenAuthentication,
+                              AccessTokenAuthentication)
+    permission_classes = (IsAuthenticated, )
+    batchable = False
+
+    def post(self, request):
+        """Returns responses of the batched sub-requests in order"""
+
+        serializer = BatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        responses = run_batch(request, serializer.validated_data['requests'])
+        return Response({'responses': responses})
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class RecipeConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'recipe'
+
+    def ready(self):
+        """Connects recipe signal receivers."""
+
+        import recipe.signals  # noqa: F401
@@ -0,0 +1,12 @@
+from django.urls import path
+
+from recipe import async_views
+
+
+app_name = 'recipe'
+
+urlpatterns = [
+    path('tags/', async_views.TagListView.as_view(), name='tag-list'),
+    path('ingredients/', async_views.IngredientListView.as_view(),
+         name='ingredient-list'),
+]
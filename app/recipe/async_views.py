@@ -0,0 +1,34 @@
+from core.async_views import AsyncAPIView
+from recipe import views
+
+
+class BaseRecipeAttrListView(AsyncAPIView):
+    """
+    Async list of recipe attributes, answering exactly like the list action
+    of viewset_class while holding a worker thread only for its queries.
+    """
+
+    viewset_class = None
+    query_budgets = {'get': 2}
+
+    async def get(self, request):
+        return await self.run_in_thread(self.list, request)
+
+    def list(self, request):
+        """Returns list response built by the synchronous viewset."""
+
+        viewset = self.viewset_class(request=request, format_kwarg=None,
+                                     action='list', args=(), kwargs={})
+        return viewset.list(request)
+
+
+class TagListView(BaseRecipeAttrListView):
+    """Async Tag List View"""
+
+    viewset_class = views.TagViewSet
+
+
+class IngredientListView(BaseRecipeAttrListView):
+    """Async Ingredient List View"""
+
+    viewset_class = views.IngredientViewSet
@@ -0,0 +1,93 @@
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.http import parse_etags
+
+
+def get_cache():
+    """Returns cache backing recipe attribute list responses."""
+
+    return caches[getattr(settings, 'RECIPE_LIST_CACHE_ALIAS', 'default')]
+
+
+def get_version_timeout():
+    """
+    Returns lifetime of list versions. Versions expire with the responses
+    they tag, so a process which missed a bump on a cache not shared with
+    the bumping one stops issuing stale entity tags by then.
+    """
+
+    return getattr(settings, 'RECIPE_LIST_CACHE_TIMEOUT', 300)
+
+
+def version_key(model, user_id):
+    """Returns cache key holding list version of the given user."""
+
+    return f'recipe-list:{model._meta.label_lower}:{user_id}:version'
+
+
+def get_version(model, user_id):
+    """Returns current list version of the given user."""
+
+    cache = get_cache()
+    key = version_key(model, user_id)
+    version = cache.get(key)
+
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, get_version_timeout())
+        version = cache.get(key)
+
+    return version
+
+
+def bump_version(model, user_id):
+    """
+    Invalidates every cached list of the given user, versions are random
+    so an evicted version can never be reissued for stale responses.
+    """
+
+    get_cache().set(version_key(model, user_id), uuid.uuid4().hex,
+                    get_version_timeout())
+
+
+def get_list_etag(model, user_id, version, variant):
+    """Returns entity tag of a list response variant."""
+
+    digest = hashlib.sha1(
+        f'{model._meta.label_lower}:{user_id}:{version}:{variant}'.encode())
+    return f'"{digest.hexdigest()}"'
+
+
+def is_not_modified(etag, if_none_match):
+    """
+    Returns whether If-None-Match header matches etag. Comparison is weak,
+    as required for If-None-Match, so that etags weakened by caches and
+    proxies on the way still match.
+    """
+
+    etags = parse_etags(if_none_match)
+    if '*' in etags:
+        return True
+
+    return etag.removeprefix('W/') in (
+        value.removeprefix('W/') for value in etags)
+
+
+def response_key(etag):
+    """Returns cache key of the response tagged by the given etag."""
+
+    return 'recipe-list:response:' + etag.strip('"')
+
+
+def get_response_data(etag):
+    """Returns cached response data for the given etag or None."""
+
+    return get_cache().get(response_key(etag))
+
+
+def set_response_data(etag, data):
+    """Caches response data under the given etag."""
+
+    get_cache().set(response_key(etag), data, get_version_timeout())
@@ -0,0 +1,213 @@
+import binascii
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def is_valid_text(value):
+    """Returns whether text can be sent to the database as is."""
+
+    try:
+        value.encode()
+    except UnicodeEncodeError:
+        return False
+
+    return '\x00' not in value
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination keyed on every ordering field, so that fetching any
+    page is a single index range scan regardless of its depth.
+    """
+
+    ordering = ('-name', 'id')
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    unpaginated_query_param = 'paginate'
+    invalid_cursor_message = _('Invalid cursor')
+
+    def get_page_size(self, request):
+        """Returns requested page size bounded by settings."""
+
+        page_size = getattr(settings, 'RECIPE_ATTR_PAGE_SIZE', 100)
+        max_page_size = getattr(settings, 'RECIPE_ATTR_MAX_PAGE_SIZE', 1000)
+
+        try:
+            requested = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return page_size
+
+        return min(max(requested, 1), max_page_size)
+
+    def is_unpaginated(self, request):
+        """Returns whether client opted out of pagination."""
+
+        value = request.query_params.get(self.unpaginated_query_param, '')
+        return value.lower() in ('false', '0', 'no')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Returns requested page of queryset or None if unpaginated."""
+
+        if self.is_unpaginated(request):
+            return None
+
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+
+        position, reverse = self.decode_cursor(request, queryset.model)
+        ordering = self.ordering
+        if reverse:
+            ordering = tuple(self.invert(field) for field in ordering)
+
+        if position is not None:
+            queryset = queryset.filter(self.after(ordering, position))
+
+        page = list(queryset.order_by(*ordering)[:self.page_size + 1])
+        has_more = len(page) > self.page_size
+        page = page[:self.page_size]
+
+        if reverse:
+            page.reverse()
+            self.has_next = position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+
+        self.page = page
+        return page
+
+    def get_paginated_response(self, data):
+        """Returns page data along with its neighbour links."""
+
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True},
+                'previous': {'type': 'string', 'nullable': True},
+                'results': schema,
+            },
+        }
+
+    def get_next_link(self):
+        """Returns link to the page after the current one."""
+
+        if not self.has_next or not self.page:
+            return None
+
+        return self.encode_cursor(self.get_position(self.page[-1]), False)
+
+    def get_previous_link(self):
+        """Returns link to the page before the current one."""
+
+        if not self.has_previous:
+            return None
+
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+
+        return self.encode_cursor(self.get_position(self.page[0]), True)
+
+    def get_position(self, item):
+        """Returns ordering field values of the given item."""
+
+        fields = [field.lstrip('-') for field in self.ordering]
+        if isinstance(item, dict):
+            return [item[field] for field in fields]
+
+        return [getattr(item, field) for field in fields]
+
+    @staticmethod
+    def invert(field):
+        """Returns ordering field in opposite direction."""
+
+        return field[1:] if field.startswith('-') else f'-{field}'
+
+    @staticmethod
+    def after(ordering, position):
+        """Returns filter matching rows placed after given position."""
+
+        condition = Q()
+        equal = Q()
+        for field, value in zip(ordering, position):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition |= equal & Q(**{f'{name}__{lookup}': value})
+            equal &= Q(**{name: value})
+
+        # Redundant bound of the leading field, so the index seeks to the
+        # position instead of filtering every row before it.
+        field, value = ordering[0], position[0]
+        lookup = 'lte' if field.startswith('-') else 'gte'
+        return Q(**{f'{field.lstrip("-")}__{lookup}': value}) & condition
+
+    def encode_cursor(self, position, reverse):
+        """Returns url of the page starting after given position."""
+
+        payload = json.dumps({'p': position, 'r': int(reverse)},
+                             separators=(',', ':'))
+        cursor = urlsafe_b64encode(payload.encode()).decode()
+        return replace_query_param(self.base_url,
+                                   self.cursor_query_param,
+                                   cursor)
+
+    def decode_cursor(self, request, model):
+        """Returns position and direction of the requested cursor."""
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None, False
+
+        try:
+            payload = json.loads(urlsafe_b64decode(cursor.encode()))
+            position = payload['p']
+            reverse = payload['r']
+        except (TypeError, ValueError, KeyError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+
+        if type(reverse) is not int or reverse not in (0, 1) or \
+                not isinstance(position, list) or \
+                len(position) != len(self.ordering) or \
+                not all(self.is_valid_value(model, field, value)
+                        for field, value in zip(self.ordering, position)):
+            raise NotFound(self.invalid_cursor_message)
+
+        return position, bool(reverse)
+
+    @staticmethod
+    def is_valid_value(model, field, value):
+        """Returns whether value is a valid value of the ordering field."""
+
+        if isinstance(value, bool) or not isinstance(value, (str, int)):
+            return False
+
+        if isinstance(value, int) and not -2 ** 63 <= value < 2 ** 63:
+            return False
+
+        if isinstance(value, str) and not is_valid_text(value):
+            return False
+
+        model_field = model._meta.get_field(field.lstrip('-'))
+        try:
+            # Values of another type are converted, those were not issued.
+            return model_field.to_python(value) == value
+        except ValidationError:
+            return False
@@ -0,0 +1,35 @@
+from rest_framework.renderers import BaseRenderer
+
+from core.renderers import FastJSONRenderer
+
+
+class NDJSONRenderer(BaseRenderer):
+    """Newline delimited JSON renderer, one list item per line"""
+
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Renders list items or a single object as JSON lines"""
+
+        if data is None:
+            return b''
+
+        if not isinstance(data, list):
+            data = [data]
+
+        return render_lines(data)
+
+
+def render_lines(items):
+    """Returns items rendered as newline terminated JSON lines"""
+
+    renderer = FastJSONRenderer()
+    return b''.join(renderer.render(item) + b'\n' for item in items)
+
+
+def render_array_items(items):
+    """Returns items rendered as comma separated JSON array members"""
+
+    return FastJSONRenderer().render(items)[1:-1]
@@ -2,6 +2,17 @@ from rest_framework import serializers
 from core.models import Tag, Ingredient
 
 
+class BulkCreateListSerializer(serializers.ListSerializer):
+    """Bulk Create List Serializer"""
+
+    def create(self, validated_data):
+        """Creates all objects by a single bulk insert"""
+
+        model = self.child.Meta.model
+        return model.objects.bulk_create(
+            [model(**attrs) for attrs in validated_data])
+
+
 class TagSerializer(serializers.ModelSerializer):
     """Tag Serializer"""
 
@@ -9,6 +20,7 @@ class TagSerializer(serializers.ModelSerializer):
         model = Tag
         fields = ('id', 'name')
         read_only_fields = ('id',)
+        list_serializer_class = BulkCreateListSerializer
 
 
 class IngredientSerializer(serializers.ModelSerializer):
@@ -18,3 +30,4 @@ class IngredientSerializer(serializers.ModelSerializer):
         model = Ingredient
         fields = ('id', 'name')
         read_only_fields = ('id',)
+        list_serializer_class = BulkCreateListSerializer
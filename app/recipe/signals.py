@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.models import Tag, Ingredient, Tombstone
+from recipe import cache as list_cache
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_save, sender=Ingredient)
+@receiver(post_delete, sender=Tag)
+@receiver(post_delete, sender=Ingredient)
+def invalidate_user_list(sender, instance, **kwargs):
+    """Bumps list version of the changed object owner"""
+
+    list_cache.bump_version(sender, instance.user_id)
+
+
+@receiver(post_delete, sender=Tag)
+@receiver(post_delete, sender=Ingredient)
+def record_tombstone(sender, instance, **kwargs):
+    """Records deletion for delta sync clients"""
+
+    Tombstone.objects.create(user_id=instance.user_id,
+                             model=sender._meta.label_lower,
+                             object_id=instance.pk)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def reset_new_user_lists(sender, instance, created, **kwargs):
+    """Starts new users on fresh list versions, ids may be reused"""
+
+    if created:
+        for model in (Tag, Ingredient):
+            list_cache.bump_version(model, instance.pk)
@@ -0,0 +1,47 @@
+from itertools import islice
+
+from django.http import StreamingHttpResponse
+
+from recipe.renderers import render_array_items, render_lines
+
+
+def iter_chunks(iterable, chunk_size):
+    """Yields lists of at most chunk_size items"""
+
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_json_array(chunks):
+    """Yields JSON array bytes of the given chunks of items"""
+
+    yield b'['
+    separator = b''
+    for chunk in chunks:
+        yield separator + render_array_items(chunk)
+        separator = b','
+    yield b']'
+
+
+def iter_json_lines(chunks):
+    """Yields JSON lines bytes of the given chunks of items"""
+
+    for chunk in chunks:
+        yield render_lines(chunk)
+
+
+STREAM_FORMATS = {
+    'json': (iter_json_array, 'application/json'),
+    'ndjson': (iter_json_lines, 'application/x-ndjson'),
+}
+
+
+def streaming_response(chunks, stream_format):
+    """Returns streaming response writing chunks in the given format"""
+
+    iterate, content_type = STREAM_FORMATS[stream_format]
+    return StreamingHttpResponse(iterate(chunks), content_type=content_type)
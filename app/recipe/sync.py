@@ -0,0 +1,134 @@
+import binascii
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import ValidationError
+
+from core.models import Tombstone
+from recipe.pagination import KeysetPagination
+
+
+CHANGED_ORDERING = ('updated_at', 'id')
+DELETED_ORDERING = ('deleted_at', 'id')
+
+invalid_watermark_message = _('Invalid watermark')
+
+
+def encode_watermark(changed, deleted):
+    """Returns opaque watermark of both change stream positions."""
+
+    payload = json.dumps({
+        'c': [changed[0].isoformat(), changed[1]],
+        'd': [deleted[0].isoformat(), deleted[1]],
+    }, separators=(',', ':'))
+    return urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_watermark(watermark):
+    """Returns stream positions of the given watermark."""
+
+    try:
+        payload = json.loads(urlsafe_b64decode(watermark.encode()))
+        positions = tuple(
+            (datetime.fromisoformat(payload[key][0]), int(payload[key][1]))
+            for key in ('c', 'd')
+        )
+    except (TypeError, ValueError, KeyError, IndexError, binascii.Error):
+        raise ValidationError({'since': invalid_watermark_message})
+
+    # Watermarks are issued in aware time, naive ones are forged.
+    if any(position[0].tzinfo is None for position in positions):
+        raise ValidationError({'since': invalid_watermark_message})
+
+    return positions
+
+
+def order_stream(queryset, ordering, position):
+    """
+    Returns rows of queryset after position in stream order. The keyset
+    filter bounds its leading field, so each page is an index range scan.
+    """
+
+    if position is not None:
+        queryset = queryset.filter(KeysetPagination.after(ordering,
+                                                          position))
+
+    return queryset.order_by(*ordering)
+
+
+def read_stream(queryset, ordering, position, limit, horizon):
+    """
+    Returns up to limit rows after position and the position to resume
+    from. Rows of the last safety lag may still be joined by transactions
+    committing late, so a drained stream resumes at horizon instead of its
+    last row and such rows are sent again.
+    """
+
+    rows = list(order_stream(queryset, ordering, position)[:limit + 1])
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    fields = [field.lstrip('-') for field in ordering]
+    if has_more:
+        last = rows[-1]
+        return rows, (last[fields[0]], last[fields[1]]), True
+
+    start = position or (horizon, 0)
+    if rows:
+        last = (rows[-1][fields[0]], rows[-1][fields[1]])
+        start = max(start, min(last, (horizon, 0)))
+    else:
+        start = max(start, (horizon, 0))
+
+    return rows, start, False
+
+
+def get_changes(queryset, user, fields, since):
+    """
+    Returns sync payload of rows of queryset changed and deleted after the
+    since watermark, a full listing when since is None or has expired.
+    """
+
+    now = timezone.now()
+    lag = timedelta(seconds=getattr(settings, 'RECIPE_SYNC_SAFETY_LAG', 5))
+    retention = timedelta(
+        days=getattr(settings, 'RECIPE_SYNC_TOMBSTONE_RETENTION_DAYS', 30))
+    limit = getattr(settings, 'RECIPE_SYNC_PAGE_SIZE', 1000)
+    horizon = now - lag
+
+    changed_position = deleted_position = None
+    if since:
+        changed_position, deleted_position = decode_watermark(since)
+
+    # Tombstones older than retention are purged, clients that far behind
+    # start over from a full listing.
+    reset = changed_position is None or \
+        deleted_position[0] < now - retention
+
+    changed, changed_position, changed_more = read_stream(
+        queryset.values(*fields, *CHANGED_ORDERING), CHANGED_ORDERING,
+        None if reset else changed_position, limit, horizon)
+
+    if reset:
+        # A full listing has nothing to delete, deletions of the last
+        # safety lag are sent again on the next sync.
+        deleted, deleted_position, deleted_more = [], (horizon, 0), False
+    else:
+        tombstones = Tombstone.objects.filter(
+            user=user, model=queryset.model._meta.label_lower)
+        deleted, deleted_position, deleted_more = read_stream(
+            tombstones.values('object_id', *DELETED_ORDERING),
+            DELETED_ORDERING, deleted_position, limit, horizon)
+
+    return {
+        'reset': reset,
+        'changed': [{field: row[field] for field in fields}
+                    for row in changed],
+        'deleted': [row['object_id'] for row in deleted],
+        'watermark': encode_watermark(changed_position, deleted_position),
+        'more': changed_more or deleted_more,
+    }
@@ -0,0 +1,83 @@
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models import Tag, Ingredient
+from core.tests.utils import QueryBudgetAssertionsMixin
+
+
+TAGS_BULK_URL = reverse('recipe:tag-bulk')
+INGREDIENTS_BULK_URL = reverse('recipe:ingredient-bulk')
+
+
+class PublicBulkApiTests(APITestCase):
+    """Public Bulk Api Tests"""
+
+    def test_login_required(self):
+        """Tests that login is required to bulk create"""
+
+        res = self.client.post(TAGS_BULK_URL, [{'name': 'vegan'}],
+                               format='json')
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class PrivateBulkApiTests(QueryBudgetAssertionsMixin, APITestCase):
+    """Private Bulk Api Tests"""
+
+    def setUp(self):
+        """Sets up"""
+
+        self.user = get_user_model().objects.create_user(
+            email='test@sample.com',
+            password='testpass123',
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def test_bulk_create_single_insert(self):
+        """Tests that a batch is written by a single insert"""
+
+        payload = [{'name': f'ingredient {i}'} for i in range(50)]
+
+        with self.assertNumQueries(3):
+            res = self.client.post(INGREDIENTS_BULK_URL, payload,
+                                   format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(res.data), len(payload))
+        self.assertTrue(all(item['id'] for item in res.data))
+        self.assertWithinQueryBudget(res)
+        self.assertEqual(
+            Ingredient.objects.filter(user=self.user).count(), len(payload))
+
+    def test_bulk_create_reports_item_errors(self):
+        """Tests that invalid items are reported by their position"""
+
+        payload = [{'name': 'vegan'}, {'name': ''}, {'name': 'keto'}]
+        res = self.client.post(TAGS_BULK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data[0], {})
+        self.assertIn('name', res.data[1])
+        self.assertEqual(res.data[2], {})
+        self.assertFalse(Tag.objects.filter(user=self.user).exists())
+
+    @override_settings(RECIPE_BULK_MAX_BATCH_SIZE=2)
+    def test_bulk_create_batch_size_capped(self):
+        """Tests that oversized batches are rejected"""
+
+        payload = [{'name': 'a'}, {'name': 'b'}, {'name': 'c'}]
+        res = self.client.post(TAGS_BULK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Tag.objects.filter(user=self.user).exists())
+
+    def test_bulk_create_requires_list(self):
+        """Tests that non list payload is rejected"""
+
+        res = self.client.post(TAGS_BULK_URL, {'name': 'vegan'},
+                               format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
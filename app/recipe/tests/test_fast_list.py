@@ -0,0 +1,52 @@
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from rest_framework.test import APITestCase
+
+from core.models import Tag, Ingredient
+from recipe import cache as list_cache
+
+
+TAGS_URL = reverse('recipe:tag-list')
+INGREDIENT_URL = reverse('recipe:ingredient-list')
+
+
+class FastListTests(APITestCase):
+    """Fast List Tests"""
+
+    def setUp(self):
+        """Sets up"""
+
+        self.user = get_user_model().objects.create_user(
+            email='test@sample.com',
+            password='testpass123',
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def assertSameAsSerializer(self, url, model, params):
+        """Asserts that fast list renders the same bytes as serializer"""
+
+        for name in ('kale', 'Ünïcödé "quoted"', 'salt', 'salt'):
+            model.objects.create(user=self.user, name=name)
+
+        fast = self.client.get(url, params)
+
+        list_cache.bump_version(model, self.user.pk)
+        with patch('recipe.views.BaseRecipeAttrViewSet.is_fast_list',
+                   return_value=False):
+            slow = self.client.get(url, params)
+
+        self.assertEqual(fast.content, slow.content)
+
+    def test_tag_list_identical(self):
+        """Tests that fast tag pages equal serializer output"""
+
+        self.assertSameAsSerializer(TAGS_URL, Tag, {'page_size': 3})
+
+    def test_ingredient_list_identical(self):
+        """Tests that fast plain ingredient list equals serializer output"""
+
+        self.assertSameAsSerializer(INGREDIENT_URL, Ingredient,
+                                    {'paginate': 'false'})
@@ -5,6 +5,7 @@ from rest_framework import status
 from rest_framework.test import APITestCase
 
 from core.models import Ingredient
+from core.tests.utils import QueryBudgetAssertionsMixin
 from recipe.serializers import IngredientSerializer
 
 
@@ -24,7 +25,7 @@ class PublicIngredientsApiTests(APITestCase):
         self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
 
 
-class PrivateIngredientsApiTests(APITestCase):
+class PrivateIngredientsApiTests(QueryBudgetAssertionsMixin, APITestCase):
     """Test that available ingredients API for authorized users"""
 
     def setUp(self):
@@ -47,7 +48,8 @@ class PrivateIngredientsApiTests(APITestCase):
 
         res = self.client.get(INGREDIENT_URL)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
+        self.assertWithinQueryBudget(res)
 
     def test_user_only_ingredients(self):
         """Tests that ingredients list retrieves for login user"""
@@ -62,21 +64,23 @@ class PrivateIngredientsApiTests(APITestCase):
 
         res = self.client.get(INGREDIENT_URL)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(res.data), 1)
-        self.assertEqual(res.data[0].get('name'), ingredient.name)
-        self.assertNotEqual(res.data[0].get('name'), other_ing.name)
+        self.assertEqual(len(res.data['results']), 1)
+        self.assertEqual(res.data['results'][0].get('name'), ingredient.name)
+        self.assertNotEqual(res.data['results'][0].get('name'),
+                            other_ing.name)
 
     def test_create_ingredient_successful(self):
         """Test new ingredient creation"""
 
         payload = {'name': 'cabbage'}
-        self.client.post(INGREDIENT_URL, payload)
+        res = self.client.post(INGREDIENT_URL, payload)
 
         exists = Ingredient.objects.filter(
             user=self.user,
             name=payload['name'],
         ).exists()
         self.assertTrue(exists)
+        self.assertWithinQueryBudget(res)
 
     def test_create_ingredient_invalid(self):
         """Test new invalid ingredient creation fails"""
@@ -0,0 +1,118 @@
+import time
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.conf import settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models import Tag
+
+
+TAGS_URL = reverse('recipe:tag-list')
+TAGS_BULK_URL = reverse('recipe:tag-bulk')
+
+
+class ListCacheTests(APITestCase):
+    """List Cache Tests"""
+
+    def setUp(self):
+        """Sets up"""
+
+        self.user = get_user_model().objects.create_user(
+            email='test@sample.com',
+            password='testpass123',
+        )
+        self.client.force_authenticate(user=self.user)
+        Tag.objects.create(user=self.user, name='vegan')
+
+    def test_not_modified(self):
+        """Tests that matching etag is answered without queries"""
+
+        res = self.client.get(TAGS_URL)
+        etag = res['ETag']
+
+        with self.assertNumQueries(0):
+            res = self.client.get(TAGS_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res['ETag'], etag)
+        self.assertFalse(res.content)
+
+    def test_not_modified_weak_etag(self):
+        """Tests that etag weakened on the way still matches"""
+
+        etag = self.client.get(TAGS_URL)['ETag']
+
+        res = self.client.get(TAGS_URL, HTTP_IF_NONE_MATCH=f'W/{etag}')
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_cached_response(self):
+        """Tests that repeated list is served from cache"""
+
+        first = self.client.get(TAGS_URL)
+
+        with self.assertNumQueries(0):
+            second = self.client.get(TAGS_URL)
+
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(second['ETag'], first['ETag'])
+
+    def test_create_invalidates(self):
+        """Tests that creation changes etag and content"""
+
+        etag = self.client.get(TAGS_URL)['ETag']
+        self.client.post(TAGS_URL, {'name': 'keto'})
+
+        res = self.client.get(TAGS_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res['ETag'], etag)
+        self.assertEqual(len(res.data['results']), 2)
+
+    def test_bulk_create_invalidates(self):
+        """Tests that bulk creation changes etag"""
+
+        etag = self.client.get(TAGS_URL)['ETag']
+        self.client.post(TAGS_BULK_URL, [{'name': 'keto'}], format='json')
+
+        res = self.client.get(TAGS_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['results']), 2)
+
+    def test_delete_invalidates(self):
+        """Tests that deletion changes etag"""
+
+        etag = self.client.get(TAGS_URL)['ETag']
+        Tag.objects.filter(user=self.user).get().delete()
+
+        res = self.client.get(TAGS_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['results'], [])
+
+    def test_etag_per_query(self):
+        """Tests that different pages get different etags"""
+
+        first = self.client.get(TAGS_URL)
+        second = self.client.get(TAGS_URL, {'paginate': 'false'})
+
+        self.assertNotEqual(first['ETag'], second['ETag'])
+        self.assertEqual(second.data[0]['name'], 'vegan')
+
+    def test_version_expires(self):
+        """Tests that list versions expire along with cached responses"""
+
+        etag = self.client.get(TAGS_URL)['ETag']
+        expired = time.time() + settings.RECIPE_LIST_CACHE_TIMEOUT + 1
+
+        with patch('time.time', return_value=expired):
+            res = self.client.get(TAGS_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res['ETag'], etag)
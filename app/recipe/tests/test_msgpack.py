@@ -0,0 +1,79 @@
+import msgpack
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models import Tag, Ingredient
+
+
+TAGS_URL = reverse('recipe:tag-list')
+INGREDIENT_URL = reverse('recipe:ingredient-list')
+
+MSGPACK = 'application/msgpack'
+
+
+class MessagePackApiTests(APITestCase):
+    """MessagePack Content Negotiation Tests"""
+
+    def setUp(self):
+        """Sets up"""
+
+        self.user = get_user_model().objects.create_user(
+            email='test@sample.com',
+            password='testpass123',
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def test_list_round_trip(self):
+        """Tests that msgpack list carries the same data as JSON"""
+
+        for i in range(200):
+            Ingredient.objects.create(user=self.user, name=f'ingrédient {i}')
+
+        as_json = self.client.get(INGREDIENT_URL, {'page_size': 200})
+        as_msgpack = self.client.get(INGREDIENT_URL, {'page_size': 200},
+                                     HTTP_ACCEPT=MSGPACK)
+
+        self.assertEqual(as_msgpack.status_code, status.HTTP_200_OK)
+        self.assertEqual(as_msgpack['Content-Type'], MSGPACK)
+        self.assertEqual(msgpack.unpackb(as_msgpack.content), as_json.json())
+        self.assertLess(len(as_msgpack.content), len(as_json.content) * 0.9)
+
+    def test_json_stays_default(self):
+        """Tests that clients without Accept header get JSON"""
+
+        res = self.client.get(TAGS_URL)
+
+        self.assertEqual(res['Content-Type'], 'application/json')
+
+    def test_create_from_msgpack(self):
+        """Tests that tags can be created from msgpack body"""
+
+        res = self.client.post(TAGS_URL, msgpack.packb({'name': 'vegan'}),
+                               content_type=MSGPACK, HTTP_ACCEPT=MSGPACK)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(msgpack.unpackb(res.content)['name'], 'vegan')
+        self.assertTrue(Tag.objects.filter(user=self.user,
+                                           name='vegan').exists())
+
+    def test_bulk_create_from_msgpack(self):
+        """Tests that bulk create accepts msgpack body"""
+
+        payload = [{'name': 'salt'}, {'name': 'pepper'}]
+        res = self.client.post(reverse('recipe:ingredient-bulk'),
+                               msgpack.packb(payload), content_type=MSGPACK)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Ingredient.objects.filter(user=self.user).count(),
+                         2)
+
+    def test_invalid_msgpack(self):
+        """Tests that malformed msgpack body is rejected"""
+
+        res = self.client.post(TAGS_URL, b'\xc1\x00', content_type=MSGPACK)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,119 @@
+import json
+from base64 import urlsafe_b64encode
+
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models import Ingredient
+
+
+INGREDIENT_URL = reverse('recipe:ingredient-list')
+
+
+@override_settings(RECIPE_ATTR_PAGE_SIZE=2)
+class KeysetPaginationTests(APITestCase):
+    """Keyset Pagination Tests"""
+
+    def setUp(self):
+        """Sets up"""
+
+        self.user = get_user_model().objects.create_user(
+            email='test@sample.com',
+            password='testpass123',
+        )
+        self.client.force_authenticate(user=self.user)
+
+        for name in ('kale', 'salt', 'salt', 'basil', 'pepper'):
+            Ingredient.objects.create(user=self.user, name=name)
+
+        self.expected = list(Ingredient.objects.order_by(
+            '-name', 'id').values_list('id', flat=True))
+
+    def collect(self, url, link):
+        """Follows given link until exhausted and returns visited ids"""
+
+        ids = []
+        while url:
+            res = self.client.get(url)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(res.data['results']), 2)
+            ids.extend(item['id'] for item in res.data['results'])
+            url = res.data[link]
+
+        return ids
+
+    def test_pages_walk_forward(self):
+        """Tests that next links visit every row exactly once"""
+
+        self.assertEqual(self.collect(INGREDIENT_URL, 'next'), self.expected)
+
+    def test_pages_walk_backward(self):
+        """Tests that previous links visit every row exactly once"""
+
+        url = INGREDIENT_URL
+        while True:
+            res = self.client.get(url)
+            if not res.data['next']:
+                break
+            url = res.data['next']
+
+        ids = self.collect(res.data['previous'], 'previous')
+        ids = [item['id'] for item in res.data['results']] + ids[::-1]
+        self.assertEqual(sorted(ids), sorted(self.expected))
+        self.assertEqual(len(ids), len(self.expected))
+
+    def test_page_size_param(self):
+        """Tests that page size can be requested by client"""
+
+        res = self.client.get(INGREDIENT_URL, {'page_size': 10})
+
+        ids = [item['id'] for item in res.data['results']]
+        self.assertEqual(ids, self.expected)
+        self.assertIsNone(res.data['next'])
+        self.assertIsNone(res.data['previous'])
+
+    def test_unpaginated_opt_in(self):
+        """Tests that clients may still request the plain list"""
+
+        res = self.client.get(INGREDIENT_URL, {'paginate': 'false'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['id'] for item in res.data], self.expected)
+
+    def test_invalid_cursor(self):
+        """Tests that malformed cursor is rejected"""
+
+        res = self.client.get(INGREDIENT_URL, {'cursor': 'garbage'})
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_tampered_cursor(self):
+        """Tests that cursor of mistyped positions is rejected"""
+
+        for position in ([1, 'a'], ['a', '1'], ['a', True], ['a', 2 ** 70],
+                         ['a\x00', 1], ['\ud800', 1]):
+            with self.subTest(position=position):
+                cursor = urlsafe_b64encode(
+                    json.dumps({'p': position, 'r': 0}).encode()).decode()
+
+                res = self.client.get(INGREDIENT_URL, {'cursor': cursor})
+
+                self.assertEqual(res.status_code,
+                                 status.HTTP_404_NOT_FOUND)
+
+    def test_tampered_cursor_direction(self):
+        """Tests that cursor of unknown direction is rejected"""
+
+        for direction in (2, -1, 'yes', True, None):
+            with self.subTest(direction=direction):
+                cursor = urlsafe_b64encode(json.dumps(
+                    {'p': ['a', 1], 'r': direction}).encode()).decode()
+
+                res = self.client.get(INGREDIENT_URL, {'cursor': cursor})
+
+                self.assertEqual(res.status_code,
+                                 status.HTTP_404_NOT_FOUND)
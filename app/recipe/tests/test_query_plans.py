@@ -0,0 +1,105 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.models import Tag, Ingredient, Tombstone
+from core.tests.utils import QueryPlanAssertionsMixin
+from recipe import sync
+from recipe.views import TagViewSet, IngredientViewSet
+
+
+class QueryPlanTests(QueryPlanAssertionsMixin, TestCase):
+    """Query plan regression tests of recipe attribute viewsets"""
+
+    def setUp(self):
+        """Sets up"""
+
+        self.user = get_user_model().objects.create_user(
+            email='test@sample.com',
+            password='testpass123',
+        )
+        self.factory = APIRequestFactory()
+
+    def get_queryset(self, viewset_class, **params):
+        """Returns list queryset the given viewset would run"""
+
+        request = self.factory.get('/', params)
+        force_authenticate(request, user=self.user)
+        view = viewset_class()
+        view.action_map = {'get': 'list'}
+        view.request = view.initialize_request(request)
+        view.format_kwarg = None
+
+        return view.get_queryset()
+
+    def assertListUsesIndex(self, viewset_class, model, index_name):
+        """
+        Asserts that first and later pages are index scans, later ones
+        seeking to their cursor
+        """
+
+        model.objects.create(user=self.user, name='sample')
+        queryset = self.get_queryset(viewset_class)
+        paginator = viewset_class.pagination_class
+
+        self.assertUsesIndex(queryset[:100], index_name)
+        later = queryset.filter(
+            paginator.after(paginator.ordering, ['sample', 1]))
+        self.assertUsesIndex(later[:100], index_name)
+        self.assertSeeks(later[:100], paginator.ordering[0].lstrip('-'))
+
+    def test_tag_list_uses_index(self):
+        """Tests that tag list is served by its composite index"""
+
+        self.assertListUsesIndex(TagViewSet, Tag,
+                                 'core_tag_user_name_idx')
+
+    def test_ingredient_list_uses_index(self):
+        """Tests that ingredient list is served by its composite index"""
+
+        self.assertListUsesIndex(IngredientViewSet, Ingredient,
+                                 'core_ingredient_user_name_idx')
+
+    def test_deep_page_seeks_cursor(self):
+        """Tests that pages after a cursor seek instead of walking to it"""
+
+        Ingredient.objects.bulk_create(
+            Ingredient(user=self.user, name=f'item {index:03}')
+            for index in range(200))
+        queryset = self.get_queryset(IngredientViewSet)
+        paginator = IngredientViewSet.pagination_class
+
+        for ordering in (paginator.ordering,
+                         tuple(map(paginator.invert, paginator.ordering))):
+            with self.subTest(ordering=ordering):
+                later = queryset.filter(
+                    paginator.after(ordering, ['item 010', 1]))
+                self.assertSeeks(later.order_by(*ordering)[:100], 'name')
+
+    def test_autocomplete_uses_index(self):
+        """Tests that autocomplete is served by the search index"""
+
+        Ingredient.objects.create(user=self.user, name='Sample')
+        queryset = self.get_queryset(IngredientViewSet, q='sa')
+
+        self.assertUsesIndex(queryset.order_by('name_key', 'id')[:10],
+                             'core_ingredient_search_idx')
+
+    def test_sync_pages_seek_watermark(self):
+        """Tests that sync pages are index ranges after their watermark"""
+
+        Ingredient.objects.create(user=self.user, name='sample')
+        position = (timezone.now(), 1)
+        cases = (
+            (Ingredient.objects.filter(user=self.user),
+             sync.CHANGED_ORDERING, 'core_ingredient_updated_idx'),
+            (Tombstone.objects.filter(user=self.user, model='core.ingredient'),
+             sync.DELETED_ORDERING, 'core_tombstone_sync_idx'),
+        )
+
+        for queryset, ordering, index_name in cases:
+            with self.subTest(index_name=index_name):
+                page = sync.order_stream(queryset, ordering, position)[:100]
+                self.assertUsesIndex(page, index_name)
+                self.assertSeeks(page, ordering[0])
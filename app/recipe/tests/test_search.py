@@ -0,0 +1,93 @@
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models import Ingredient
+from core.tests.utils import QueryBudgetAssertionsMixin
+
+
+INGREDIENT_URL = reverse('recipe:ingredient-list')
+AUTOCOMPLETE_URL = reverse('recipe:ingredient-autocomplete')
+
+
+class PrefixSearchTests(QueryBudgetAssertionsMixin, APITestCase):
+    """Prefix Search Tests"""
+
+    def setUp(self):
+        """Sets up"""
+
+        self.user = get_user_model().objects.create_user(
+            email='test@sample.com',
+            password='testpass123',
+        )
+        self.client.force_authenticate(user=self.user)
+
+        for name in ('salt', 'saffron', 'sage', 'basil', 'Sesame'):
+            Ingredient.objects.create(user=self.user, name=name)
+
+    def test_list_prefix_filter(self):
+        """Tests that list is filtered by name prefix"""
+
+        res = self.client.get(INGREDIENT_URL, {'q': 'sa'})
+
+        names = [item['name'] for item in res.data['results']]
+        self.assertEqual(names, ['salt', 'sage', 'saffron'])
+
+    def test_autocomplete(self):
+        """Tests that autocomplete returns ordered prefix matches"""
+
+        res = self.client.get(AUTOCOMPLETE_URL, {'q': 'sa', 'limit': 2})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['name'] for item in res.data],
+                         ['saffron', 'sage'])
+        self.assertEqual(set(res.data[0]), {'id', 'name'})
+        self.assertWithinQueryBudget(res)
+
+    def test_autocomplete_case_insensitive(self):
+        """Tests that autocomplete matches prefix regardless of case"""
+
+        res = self.client.get(AUTOCOMPLETE_URL, {'q': 'SE'})
+
+        self.assertEqual([item['name'] for item in res.data], ['Sesame'])
+
+    def test_autocomplete_limited_to_user(self):
+        """Tests that autocomplete matches only user rows"""
+
+        other_user = get_user_model().objects.create_user(
+            email='other@sample.com',
+            password='testpass123',
+        )
+        Ingredient.objects.create(user=other_user, name='sardine')
+
+        res = self.client.get(AUTOCOMPLETE_URL, {'q': 'sar'})
+
+        self.assertEqual(res.data, [])
+
+    @override_settings(RECIPE_AUTOCOMPLETE_MAX_RESULTS=1)
+    def test_autocomplete_capped(self):
+        """Tests that autocomplete results are capped"""
+
+        res = self.client.get(AUTOCOMPLETE_URL, {'q': 's', 'limit': 100})
+
+        self.assertEqual(len(res.data), 1)
+
+    def test_autocomplete_requires_prefix(self):
+        """Tests that autocomplete without prefix fails"""
+
+        res = self.client.get(AUTOCOMPLETE_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_invalid_prefix(self):
+        """Tests that prefix the database can not store is rejected"""
+
+        for url in (INGREDIENT_URL, AUTOCOMPLETE_URL):
+            with self.subTest(url=url):
+                res = self.client.get(url, {'q': 'sa\x00'})
+
+                self.assertEqual(res.status_code,
+                                 status.HTTP_400_BAD_REQUEST)
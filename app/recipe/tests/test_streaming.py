@@ -0,0 +1,85 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models import Tag, Ingredient
+
+
+TAGS_URL = reverse('recipe:tag-list')
+INGREDIENT_URL = reverse('recipe:ingredient-list')
+
+
+@override_settings(RECIPE_STREAM_CHUNK_SIZE=2)
+class StreamingListTests(APITestCase):
+    """Streaming List Tests"""
+
+    def setUp(self):
+        """Sets up"""
+
+        self.user = get_user_model().objects.create_user(
+            email='test@sample.com',
+            password='testpass123',
+        )
+        self.client.force_authenticate(user=self.user)
+
+        for name in ('kale', 'salt', 'basil', 'pepper', 'thyme'):
+            Ingredient.objects.create(user=self.user, name=name)
+            Tag.objects.create(user=self.user, name=name)
+
+    def test_stream_json_array(self):
+        """Tests that streamed array equals the plain list bytes"""
+
+        plain = self.client.get(INGREDIENT_URL, {'paginate': 'false'})
+        res = self.client.get(INGREDIENT_URL, {'stream': 'json'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res.streaming)
+        self.assertEqual(b''.join(res.streaming_content), plain.content)
+
+    def test_stream_ndjson_accept_header(self):
+        """Tests that ndjson is streamed when accepted by client"""
+
+        plain = self.client.get(TAGS_URL, {'paginate': 'false'})
+        res = self.client.get(TAGS_URL, HTTP_ACCEPT='application/x-ndjson')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res['Content-Type'], 'application/x-ndjson')
+        lines = b''.join(res.streaming_content).decode().splitlines()
+        self.assertEqual([json.loads(line) for line in lines], plain.json())
+
+    def test_stream_ndjson_format_param(self):
+        """Tests that ndjson is selectable by format parameter"""
+
+        res = self.client.get(TAGS_URL, {'format': 'ndjson'})
+
+        lines = b''.join(res.streaming_content).splitlines()
+        self.assertEqual(len(lines), 5)
+
+    def test_stream_empty_list(self):
+        """Tests that empty list streams a valid document"""
+
+        Ingredient.objects.all().delete()
+        res = self.client.get(INGREDIENT_URL, {'stream': 'json'})
+
+        self.assertEqual(json.loads(b''.join(res.streaming_content)), [])
+
+    def test_stream_limited_to_user(self):
+        """Tests that streamed list contains only user rows"""
+
+        other_user = get_user_model().objects.create_user(
+            email='other@sample.com',
+            password='testpass123',
+        )
+        Tag.objects.create(user=other_user, name='other')
+
+        res = self.client.get(TAGS_URL, {'stream': 'json'})
+
+        names = [item['name'] for item in
+                 json.loads(b''.join(res.streaming_content))]
+        self.assertNotIn('other', names)
+        self.assertEqual(len(names), 5)
@@ -0,0 +1,177 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models import Tag, Ingredient, Tombstone
+from core.tests.utils import QueryBudgetAssertionsMixin
+from recipe.sync import encode_watermark
+
+
+TAGS_SYNC_URL = reverse('recipe:tag-sync')
+INGREDIENTS_SYNC_URL = reverse('recipe:ingredient-sync')
+
+
+@override_settings(RECIPE_SYNC_SAFETY_LAG=0)
+class DeltaSyncTests(QueryBudgetAssertionsMixin, APITestCase):
+    """Delta Sync Tests"""
+
+    def setUp(self):
+        """Sets up"""
+
+        self.user = get_user_model().objects.create_user(
+            email='test@sample.com',
+            password='testpass123',
+        )
+        self.client.force_authenticate(user=self.user)
+
+        self.other = get_user_model().objects.create_user(
+            email='other@sample.com',
+            password='testpass123',
+        )
+        Tag.objects.create(user=self.other, name='other')
+
+        self.tags = [Tag.objects.create(user=self.user, name=name)
+                     for name in ('vegan', 'keto', 'paleo')]
+
+    def sync(self, since=None, url=TAGS_SYNC_URL):
+        """Returns sync response data since watermark"""
+
+        res = self.client.get(url, {'since': since} if since else {})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertWithinQueryBudget(res)
+        return res.data
+
+    def test_initial_sync(self):
+        """Tests that first sync lists every object of the user"""
+
+        data = self.sync()
+
+        self.assertTrue(data['reset'])
+        self.assertFalse(data['more'])
+        self.assertEqual(data['changed'], [
+            {'id': tag.id, 'name': tag.name} for tag in self.tags])
+        self.assertEqual(data['deleted'], [])
+
+    def test_no_changes(self):
+        """Tests that nothing is sent when nothing changed"""
+
+        watermark = self.sync()['watermark']
+
+        data = self.sync(watermark)
+
+        self.assertFalse(data['reset'])
+        self.assertEqual(data['changed'], [])
+        self.assertEqual(data['deleted'], [])
+
+    def test_changes_since(self):
+        """Tests that only created, updated and deleted rows are sent"""
+
+        watermark = self.sync()['watermark']
+
+        created = Tag.objects.create(user=self.user, name='quick')
+        self.tags[0].name = 'vegetarian'
+        self.tags[0].save()
+        deleted_id = self.tags[1].id
+        self.tags[1].delete()
+
+        data = self.sync(watermark)
+
+        self.assertEqual(data['changed'], [
+            {'id': created.id, 'name': 'quick'},
+            {'id': self.tags[0].id, 'name': 'vegetarian'},
+        ])
+        self.assertEqual(data['deleted'], [deleted_id])
+
+        data = self.sync(data['watermark'])
+
+        self.assertEqual(data['changed'], [])
+        self.assertEqual(data['deleted'], [])
+
+    def test_models_kept_apart(self):
+        """Tests that tag deletions are not reported as ingredients"""
+
+        watermark = self.sync(url=INGREDIENTS_SYNC_URL)['watermark']
+        self.tags[0].delete()
+        Ingredient.objects.create(user=self.user, name='salt')
+
+        data = self.sync(watermark, INGREDIENTS_SYNC_URL)
+
+        self.assertEqual([item['name'] for item in data['changed']],
+                         ['salt'])
+        self.assertEqual(data['deleted'], [])
+
+    @override_settings(RECIPE_SYNC_PAGE_SIZE=2)
+    def test_paged_sync(self):
+        """Tests that large change sets are sent in pages"""
+
+        data = self.sync()
+        ids = [item['id'] for item in data['changed']]
+        self.assertTrue(data['more'])
+
+        while data['more']:
+            data = self.sync(data['watermark'])
+            ids.extend(item['id'] for item in data['changed'])
+
+        self.assertEqual(ids, [tag.id for tag in self.tags])
+
+    @override_settings(RECIPE_SYNC_SAFETY_LAG=60)
+    def test_safety_lag_resends_recent_changes(self):
+        """Tests that changes within safety lag are sent again"""
+
+        data = self.sync(self.sync()['watermark'])
+
+        self.assertEqual(len(data['changed']), len(self.tags))
+
+    def test_expired_watermark(self):
+        """Tests that clients beyond tombstone retention start over"""
+
+        old = timezone.now() - timedelta(days=365)
+        Tombstone.objects.create(user=self.user, model='core.tag',
+                                 object_id=0)
+
+        data = self.sync(encode_watermark((old, 0), (old, 0)))
+
+        self.assertTrue(data['reset'])
+        self.assertEqual(len(data['changed']), len(self.tags))
+        self.assertEqual(data['deleted'], [])
+
+    def test_invalid_watermark(self):
+        """Tests that malformed watermark is rejected"""
+
+        res = self.client.get(TAGS_SYNC_URL, {'since': 'garbage'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_naive_watermark(self):
+        """Tests that watermark of naive datetimes is rejected"""
+
+        naive = timezone.now().replace(tzinfo=None)
+        since = encode_watermark((naive, 0), (naive, 0))
+
+        res = self.client.get(TAGS_SYNC_URL, {'since': since})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_purge_tombstones(self):
+        """Tests that only tombstones beyond retention are purged"""
+
+        expired_id, kept_id = self.tags[0].id, self.tags[1].id
+        self.tags[0].delete()
+        self.tags[1].delete()
+        Tombstone.objects.filter(object_id=expired_id).update(
+            deleted_at=timezone.now() - timedelta(days=31))
+
+        call_command('purge_tombstones', days=30, batch_size=1,
+                     stdout=StringIO())
+
+        self.assertEqual(
+            list(Tombstone.objects.values_list('object_id', flat=True)),
+            [kept_id])
@@ -5,6 +5,7 @@ from rest_framework.test import APITestCase
 from rest_framework import status
 
 from core.models import Tag
+from core.tests.utils import QueryBudgetAssertionsMixin
 from recipe.serializers import TagSerializer
 
 
@@ -21,7 +22,7 @@ class PublicTagsApiTest(APITestCase):
         self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
 
 
-class PrivateTagsApiTest(APITestCase):
+class PrivateTagsApiTest(QueryBudgetAssertionsMixin, APITestCase):
     """Private Tags Api Test"""
 
     def setUp(self):
@@ -42,7 +43,8 @@ class PrivateTagsApiTest(APITestCase):
         res = self.client.get(TAGS_URL)
         serializer = TagSerializer(Tag.objects.all().order_by('-name'), many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
+        self.assertWithinQueryBudget(res)
 
     def test_tags_limited_to_user(self):
         """Tests that tags limited to their user"""
@@ -60,20 +62,22 @@ class PrivateTagsApiTest(APITestCase):
 
         res = self.client.get(TAGS_URL)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(res.data), 1)
-        self.assertEqual(res.data[0].get('name'), tag.name)
-        self.assertNotEqual(res.data[0].get('name'), other_tag.name)
+        self.assertEqual(len(res.data['results']), 1)
+        self.assertEqual(res.data['results'][0].get('name'), tag.name)
+        self.assertNotEqual(res.data['results'][0].get('name'),
+                            other_tag.name)
 
     def test_create_tag_successful(self):
         """Test creating a new tag"""
         payload = {'name': 'Test tag'}
-        self.client.post(TAGS_URL, payload)
+        res = self.client.post(TAGS_URL, payload)
 
         exists = Tag.objects.filter(
             user=self.user,
             name=payload['name']
         ).exists()
         self.assertTrue(exists)
+        self.assertWithinQueryBudget(res)
 
     def test_create_tag_invalid(self):
         """Test creating a new tag with invalid payload"""
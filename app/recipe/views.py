@@ -1,29 +1,212 @@
-from rest_framework import viewsets, mixins
-from rest_framework.authentication import TokenAuthentication
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Value
+from django.db.models.functions import Concat, Upper
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.translation import gettext_lazy as _
+from rest_framework import viewsets, mixins, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
 
+from core.authentication import (
+    AccessTokenAuthentication, CachedTokenAuthentication,
+)
+from core.functions import MAX_CHAR, search_key
+from core.mixins import ReplicaRoutingMixin
 from core.models import Tag, Ingredient
-from recipe import serializers
+from recipe import cache as list_cache
+from recipe import serializers, sync
+from recipe.pagination import KeysetPagination, is_valid_text
+from recipe.renderers import NDJSONRenderer
+from recipe.streaming import STREAM_FORMATS, iter_chunks, streaming_response
 
 
-class BaseRecipeAttrViewSet(viewsets.GenericViewSet,
+class BaseRecipeAttrViewSet(ReplicaRoutingMixin,
+                            viewsets.GenericViewSet,
                             mixins.ListModelMixin,
                             mixins.CreateModelMixin):
     """Base Recipe Attr ViewSet"""
 
-    authentication_classes = (TokenAuthentication, )
+    authentication_classes = (CachedTokenAuthentication,
+                              AccessTokenAuthentication)
     permission_classes = (IsAuthenticated, )
+    pagination_class = KeysetPagination
+    fast_list_fields = ('id', 'name')
+    renderer_classes = (*api_settings.DEFAULT_RENDERER_CLASSES,
+                        NDJSONRenderer)
+    stream_query_param = 'stream'
+    search_query_param = 'q'
+    query_budgets = {
+        'list': 2,
+        'create': 2,
+        'bulk_create': 4,
+        'autocomplete': 2,
+        'sync': 2,
+    }
 
     def get_queryset(self):
         """Return objects for the current authenticated user"""
 
-        return self.queryset.filter(user=self.request.user).order_by('-name')
+        queryset = self.queryset.filter(user=self.request.user)
+
+        prefix = self.request.query_params.get(self.search_query_param)
+        if prefix:
+            if not is_valid_text(prefix):
+                raise ValidationError(
+                    {self.search_query_param: _('Invalid prefix.')})
+
+            # Case insensitive prefix as a range of the search key, so the
+            # search index seeks matches and returns them in key order.
+            key = Upper(Value(prefix))
+            queryset = queryset.alias(name_key=search_key('name')).filter(
+                name_key__gte=key, name_key__lt=Concat(key, Value(MAX_CHAR)))
+
+        return queryset.order_by(*self.pagination_class.ordering)
+
+    def list(self, request, *args, **kwargs):
+        """Returns cached list or not modified if client already has it"""
+
+        stream_format = self.get_stream_format(request)
+        if stream_format:
+            return self.stream_list(stream_format)
+
+        model = self.queryset.model
+        version = list_cache.get_version(model, request.user.pk)
+        etag = list_cache.get_list_etag(
+            model, request.user.pk, version,
+            f'{request.accepted_media_type}:{request.build_absolute_uri()}')
+
+        if list_cache.is_not_modified(
+                etag, request.headers.get('If-None-Match', '')):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            data = list_cache.get_response_data(etag)
+            if data is None:
+                data = self.get_list_data(request, *args, **kwargs)
+                list_cache.set_response_data(etag, data)
+            response = Response(data)
+
+        response['ETag'] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        patch_vary_headers(response, ('Authorization', ))
+        return response
+
+    def get_list_data(self, request, *args, **kwargs):
+        """Returns list data, skipping serializers for plain fields"""
+
+        if not self.is_fast_list():
+            return super().list(request, *args, **kwargs).data
+
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = queryset.values(*self.fast_list_fields)
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(page).data
+
+        return list(rows)
+
+    def get_stream_format(self, request):
+        """Returns requested streaming format or None"""
+
+        if request.accepted_renderer.format == NDJSONRenderer.format:
+            return NDJSONRenderer.format
+
+        stream_format = request.query_params.get(self.stream_query_param)
+        return stream_format if stream_format in STREAM_FORMATS else None
+
+    def stream_list(self, stream_format):
+        """Streams whole list through a server side cursor"""
+
+        # Bound to the routed database now, rows are read after the view
+        # returns and its read routing is restored.
+        queryset = self.filter_queryset(self.get_queryset())
+        queryset = queryset.using(queryset.db)
+        chunk_size = getattr(settings, 'RECIPE_STREAM_CHUNK_SIZE', 2000)
+
+        if self.is_fast_list():
+            rows = queryset.values(*self.fast_list_fields)
+            chunks = iter_chunks(rows.iterator(chunk_size=chunk_size),
+                                 chunk_size)
+        else:
+            chunks = (
+                self.get_serializer(chunk, many=True).data
+                for chunk in iter_chunks(
+                    queryset.iterator(chunk_size=chunk_size), chunk_size)
+            )
+
+        return streaming_response(chunks, stream_format)
+
+    def is_fast_list(self):
+        """Returns whether serializer emits exactly the fast list fields"""
+
+        meta = self.get_serializer_class().Meta
+        return self.fast_list_fields is not None and \
+            tuple(meta.fields) == tuple(self.fast_list_fields)
+
+    @action(detail=False, methods=['get'])
+    def autocomplete(self, request):
+        """Returns top name prefix matches for type ahead"""
+
+        prefix = request.query_params.get(self.search_query_param)
+        if not prefix:
+            raise ValidationError(
+                {self.search_query_param: _('This parameter is required.')})
+
+        max_results = getattr(settings, 'RECIPE_AUTOCOMPLETE_MAX_RESULTS', 50)
+        try:
+            limit = int(request.query_params.get('limit', 10))
+        except ValueError:
+            raise ValidationError({'limit': _('A valid integer is required.')})
+        limit = min(max(limit, 1), max_results)
+
+        matches = self.get_queryset().order_by('name_key', 'id')[:limit]
+        if self.is_fast_list():
+            return Response(list(matches.values(*self.fast_list_fields)))
+
+        return Response(self.get_serializer(matches, many=True).data)
+
+    @action(detail=False, methods=['get'])
+    def sync(self, request):
+        """Returns objects changed and deleted since client watermark"""
+
+        fields = self.get_serializer_class().Meta.fields
+        return Response(sync.get_changes(
+            self.queryset.filter(user=request.user), request.user, fields,
+            request.query_params.get('since')))
 
     def perform_create(self, serializer):
         """Creates new object"""
 
         return serializer.save(user=self.request.user)
 
+    @action(detail=False, methods=['post'], url_path='bulk', url_name='bulk')
+    def bulk_create(self, request):
+        """Creates a batch of objects in a single insert"""
+
+        serializer = self.get_serializer(
+            data=request.data,
+            many=True,
+            allow_empty=False,
+            max_length=getattr(settings, 'RECIPE_BULK_MAX_BATCH_SIZE', 1000),
+        )
+        serializer.is_valid(raise_exception=True)
+        self.perform_bulk_create(serializer)
+
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    def perform_bulk_create(self, serializer):
+        """Creates new objects within one transaction"""
+
+        with transaction.atomic():
+            instances = serializer.save(user=self.request.user)
+
+        list_cache.bump_version(self.queryset.model, self.request.user.pk)
+        return instances
+
 
 class TagViewSet(BaseRecipeAttrViewSet):
     """Tags ViewSet"""
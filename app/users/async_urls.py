@@ -0,0 +1,11 @@
+from django.urls import path
+
+import users.async_views as async_views
+
+
+app_name = 'users'
+
+
+urlpatterns = [
+    path('me/', async_views.ManageUserView.as_view(), name='me'),
+]
@@ -0,0 +1,20 @@
+from rest_framework.response import Response
+
+from core.async_views import AsyncAPIView
+from users.serializers import UserSerializer
+from users.views import get_current_user
+
+
+class ManageUserView(AsyncAPIView):
+    """Async Manage User View, retrieve only"""
+
+    query_budgets = {'get': 2}
+
+    async def get(self, request):
+        """Returns authenticated user"""
+
+        return await self.run_in_thread(self.retrieve, request)
+
+    @staticmethod
+    def retrieve(request):
+        return Response(UserSerializer(get_current_user(request)).data)
@@ -1,4 +1,5 @@
 from django.contrib.auth import get_user_model, authenticate
+from django.db.models import F
 from django.utils.translation import gettext_lazy as _
 from rest_framework.serializers import Serializer, ModelSerializer, CharField, ValidationError
 
@@ -20,11 +21,16 @@ class UserSerializer(ModelSerializer):
         """Updates user by validated data"""
 
         password = validated_data.pop('password', None)
+        if password:
+            instance.set_password(password)
+            # Revokes access tokens by the same write, incremented in the
+            # database so that concurrent revocations are never lost.
+            instance.token_version = F('token_version') + 1
+
         user = super().update(instance, validated_data)
 
         if password:
-            user.set_password(password)
-            user.save()
+            user.refresh_from_db(fields=['token_version'])
 
         return user
 
@@ -1,3 +1,5 @@
+import msgpack
+
 from django.test import TestCase
 from django.urls import reverse
 from django.contrib.auth import get_user_model
@@ -5,12 +7,14 @@ from django.contrib.auth import get_user_model
 import rest_framework.status as status
 from rest_framework.test import APIClient, APITestCase
 
+from core.tests.utils import QueryBudgetAssertionsMixin
+
 
 CREATE_USERS_URL = reverse('users:create')
 SELF_USER_URL = reverse('users:me')
 
 
-class PublicUserApiTests(TestCase):
+class PublicUserApiTests(QueryBudgetAssertionsMixin, TestCase):
     """Public User Api Tests"""
 
     def setUp(self):
@@ -34,6 +38,24 @@ class PublicUserApiTests(TestCase):
         self.assertTrue(user.check_password(payload['password']))
         self.assertIn('id', res.data)
         self.assertNotIn('password', res.data)
+        self.assertWithinQueryBudget(res)
+
+    def test_create_user_from_msgpack(self):
+        """Tests that user can be created from msgpack body."""
+
+        payload = {
+            "email": "test@tosan.com",
+            "password": "testpass",
+            "name": "test user"
+        }
+        res = self.client.post(CREATE_USERS_URL, msgpack.packb(payload),
+                               content_type='application/msgpack',
+                               HTTP_ACCEPT='application/msgpack')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        data = msgpack.unpackb(res.content)
+        self.assertEqual(data['email'], payload['email'])
+        self.assertNotIn('password', data)
 
     def test_user_creation_duplication_error(self):
         """Tests that user already created"""
@@ -66,7 +88,7 @@ class PublicUserApiTests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
 
 
-class PrivateUserApiTests(APITestCase):
+class PrivateUserApiTests(QueryBudgetAssertionsMixin, APITestCase):
     """Private User Api Tests"""
 
     def setUp(self):
@@ -90,6 +112,7 @@ class PrivateUserApiTests(APITestCase):
             'email': self.user.email,
             'name': self.user.name
         })
+        self.assertWithinQueryBudget(res)
 
     def test_post_self_user_invalid_data(self):
         """Tests than null payload is invalid"""
@@ -107,3 +130,4 @@ class PrivateUserApiTests(APITestCase):
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(res.data['email'], self.user.email)
         self.assertTrue(self.user.check_password(payload['password']))
+        self.assertWithinQueryBudget(res)
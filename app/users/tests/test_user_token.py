@@ -1,19 +1,25 @@
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.db.models import F
+from django.test import TestCase, override_settings
 
 from rest_framework.reverse import reverse
 from rest_framework.test import APIClient
 import rest_framework.status as status
 
+from core.tests.utils import QueryBudgetAssertionsMixin
+from users.serializers import UserSerializer
+
 
 TOKEN_URL = reverse('users:token')
+REFRESH_URL = reverse('users:token-refresh')
+SELF_USER_URL = reverse('users:me')
 
 
 def create_user(**kwargs):
     return get_user_model().objects.create_user(**kwargs)
 
 
-class UserTokenTests(TestCase):
+class UserTokenTests(QueryBudgetAssertionsMixin, TestCase):
     """User Token Tests"""
 
     def setUp(self):
@@ -33,6 +39,23 @@ class UserTokenTests(TestCase):
         res = self.client.post(TOKEN_URL, payload)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertIn('token', res.data)
+        self.assertIn('expires_at', res.data)
+        self.assertWithinQueryBudget(res)
+
+    def test_live_token_reused(self):
+        """Tests that logging in again returns the live token"""
+
+        payload = {
+            'email': 'test@tosan.com',
+            'password': 'testpassword123'
+        }
+        create_user(**payload)
+
+        first = self.client.post(TOKEN_URL, payload)
+        second = self.client.post(TOKEN_URL, payload)
+
+        self.assertEqual(first.data['token'], second.data['token'])
+        self.assertWithinQueryBudget(second)
 
     def test_invalid_user_credentials(self):
         """Tests that invalid user credentials fails"""
@@ -70,3 +93,88 @@ class UserTokenTests(TestCase):
         res = self.client.post(TOKEN_URL, payload)
         self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertNotIn('token', res.data)
+
+
+@override_settings(ACCESS_TOKENS_ENABLED=True)
+class AccessTokenTests(QueryBudgetAssertionsMixin, TestCase):
+    """Access Token Tests"""
+
+    def setUp(self):
+        """Sets up"""
+
+        self.payload = {
+            'email': 'test@tosan.com',
+            'password': 'testpassword123'
+        }
+        create_user(**self.payload)
+        self.client = APIClient()
+        self.tokens = self.client.post(TOKEN_URL, self.payload).data
+
+    def test_access_token_issued(self):
+        """Tests that access token is issued next to the token"""
+
+        self.assertIn('token', self.tokens)
+        self.assertIn('access', self.tokens)
+
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {self.tokens["access"]}')
+        res = self.client.get(SELF_USER_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_refresh(self):
+        """Tests that token refreshes access tokens"""
+
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f'Token {self.tokens["token"]}')
+        res = self.client.post(REFRESH_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn('access', res.data)
+        self.assertWithinQueryBudget(res)
+
+    def test_access_token_can_not_refresh(self):
+        """Tests that access tokens do not refresh themselves"""
+
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {self.tokens["access"]}')
+        res = self.client.post(REFRESH_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_password_change_revokes(self):
+        """Tests that password change revokes access tokens"""
+
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {self.tokens["access"]}')
+        self.client.patch(SELF_USER_URL, {'password': 'newpassword123'})
+
+        res = self.client.get(SELF_USER_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_password_change_keeps_concurrent_revocation(self):
+        """Tests that password change increments the stored version"""
+
+        user = get_user_model().objects.get(email=self.payload['email'])
+        get_user_model().objects.filter(pk=user.pk).update(
+            token_version=F('token_version') + 1)
+
+        serializer = UserSerializer(
+            user, data={'password': 'newpassword123'}, partial=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+        self.assertEqual(user.token_version, 2)
+        user.refresh_from_db()
+        self.assertEqual(user.token_version, 2)
+
+    @override_settings(ACCESS_TOKENS_ENABLED=False)
+    def test_disabled(self):
+        """Tests that access tokens are not issued unless enabled"""
+
+        res = self.client.post(TOKEN_URL, self.payload)
+        self.assertNotIn('access', res.data)
+
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f'Token {self.tokens["token"]}')
+        res = self.client.post(REFRESH_URL)
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
@@ -1,14 +1,55 @@
-from rest_framework import generics, authentication, permissions
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils.translation import gettext_lazy as _
+from rest_framework import generics, permissions
+from rest_framework.exceptions import AuthenticationFailed, NotFound
+from rest_framework.response import Response
 from rest_framework.settings import api_settings
 from rest_framework.authtoken.views import ObtainAuthToken
+from rest_framework.views import APIView
 
+from core.authentication import (
+    AccessTokenAuthentication, CachedTokenAuthentication, issue_access_token,
+)
+from core.mixins import ReplicaRoutingMixin
+from core.models import ExpiringToken
 from users.serializers import UserSerializer, AuthTokenSerializer
 
 
+def get_current_user(request):
+    """
+    Returns authenticated user read fresh, since request user is built
+    from the authentication cache and may be stale.
+    """
+
+    user = get_user_model().objects.filter(
+        pk=request.user.pk, is_active=True).first()
+    if user is None:
+        raise AuthenticationFailed(_('User inactive or deleted.'))
+
+    return user
+
+
+def access_tokens_enabled():
+    """Returns whether signed access tokens are issued."""
+
+    return getattr(settings, 'ACCESS_TOKENS_ENABLED', False)
+
+
+def get_access_token_data(user):
+    """Returns response data of a new access token of user."""
+
+    return {
+        'access': issue_access_token(user),
+        'access_expires_in': getattr(settings, 'ACCESS_TOKEN_TTL', 300),
+    }
+
+
 class CreateUserView(generics.CreateAPIView):
     """Create User View"""
 
     serializer_class = UserSerializer
+    query_budgets = {'post': 2}
 
 
 class CreateTokenView(ObtainAuthToken):
@@ -16,16 +57,49 @@ class CreateTokenView(ObtainAuthToken):
 
     serializer_class = AuthTokenSerializer
     renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES
+    query_budgets = {'post': 3}
+
+    def post(self, request, *args, **kwargs):
+        """Returns live token of authenticated user and its expiry"""
+
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        user = serializer.validated_data['user']
+        token = ExpiringToken.objects.issue(user)
+        data = {'token': token.key, 'expires_at': token.expires_at}
+        if access_tokens_enabled():
+            data.update(get_access_token_data(user))
+
+        return Response(data)
+
+
+class RefreshAccessTokenView(APIView):
+    """Refresh Access Token View, authenticated by the expiring token"""
+
+    authentication_classes = (CachedTokenAuthentication,)
+    permission_classes = (permissions.IsAuthenticated,)
+    query_budgets = {'post': 2}
+
+    def post(self, request):
+        """Returns a new access token of authenticated user"""
+
+        if not access_tokens_enabled():
+            raise NotFound()
+
+        return Response(get_access_token_data(request.user))
 
 
-class ManageUserView(generics.RetrieveUpdateAPIView):
+class ManageUserView(ReplicaRoutingMixin, generics.RetrieveUpdateAPIView):
     """Manage User View"""
 
     serializer_class = UserSerializer
-    authentication_classes = (authentication.TokenAuthentication,)
+    authentication_classes = (CachedTokenAuthentication,
+                              AccessTokenAuthentication)
     permission_classes = (permissions.IsAuthenticated,)
+    query_budgets = {'get': 2, 'put': 5, 'patch': 5}
 
     def get_object(self):
         """Returns authenticated user"""
 
-        return self.request.user
+        return get_current_user(self.request)